@@ -25,17 +25,26 @@ DEBUGGING SYSTEM:
 - API failures properly handled with retry logic
 """
 
-from openai import OpenAI
-import json
+import os
 import time
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
 import streamlit as st
 
+from instrumentation import get_logger, log_event
+from lazy_imports import lazy_import
+from llm_scheduler import chat_completion
+from prompt_compiler import compile_team_context
+from prompt_templates import ANALYST_SYSTEM_MESSAGE, GAME_SITUATION_BLOCK, WEATHER_BLOCK, render_prompt
+
+# The OpenAI client library is imported on the first GPT call
+openai = lazy_import("openai")
+
 # =============================================================================
 # DEBUG LOGGING SYSTEM - Enhanced for analysis operations
 # =============================================================================
 
+_logger = get_logger("analysis")
+
 def log_analysis_debug(function_name: str, line_number: int, message: str, error: Exception = None, data: Dict = None):
     """
     Enhanced debug logging system specifically for analysis operations
@@ -47,17 +56,9 @@ def log_analysis_debug(function_name: str, line_number: int, message: str, error
         error: Exception object if an error occurred
         data: Optional data dictionary for context
     """
-    timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]  # Include milliseconds
-    
-    if error:
-        print(f"[{timestamp}] ANALYSIS_ERROR in {function_name}() line {line_number}: {message}")
-        print(f"                     Error: {str(error)}")
-        if data:
-            print(f"                     Context: {json.dumps(data, default=str, indent=2)}")
-    else:
-        print(f"[{timestamp}] ANALYSIS_DEBUG {function_name}() line {line_number}: {message}")
-        if data:
-            print(f"                      Data: {json.dumps(data, default=str, indent=2)}")
+    # data is only serialised when the record is emitted
+    log_event(_logger, function_name, line_number, message, error, data)
+
 
 # =============================================================================
 # DATA VALIDATION AND EXTRACTION - BUG FIX: Line 134
@@ -150,6 +151,20 @@ def validate_and_extract_team_data(team_data: Dict, team_name: str) -> Tuple[boo
 # GPT-3.5 TURBO ANALYSIS ENGINE - BUG FIX: Line 189
 # =============================================================================
 
+def get_openai_api_key() -> Optional[str]:
+    """
+    OpenAI API key from Streamlit secrets, falling back to the OPENAI_API_KEY
+    environment variable (the API server and CLI jobs run without secrets.toml)
+    """
+    try:
+        # load_if_toml_exists() first: a missing secrets.toml would otherwise make
+        # st.secrets print Streamlit's "streamlit run" warning in headless processes
+        if st.secrets.load_if_toml_exists() and "OPENAI_API_KEY" in st.secrets:
+            return st.secrets["OPENAI_API_KEY"]
+    except Exception:
+        pass
+    return os.getenv("OPENAI_API_KEY")
+
 def call_gpt_analysis(prompt: str, max_tokens: int = 1500, temperature: float = 0.7) -> str:
     """
     Make real GPT-3.5 Turbo API call for strategic analysis
@@ -161,7 +176,7 @@ def call_gpt_analysis(prompt: str, max_tokens: int = 1500, temperature: float =
         
         # BUG FIX: Direct client creation to avoid boolean return issues
         try:
-            client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+            client = openai.OpenAI(api_key=get_openai_api_key())
             log_analysis_debug("call_gpt_analysis", 148, "OpenAI client created successfully")
         except Exception as init_error:
             log_analysis_debug("call_gpt_analysis", 150, "OpenAI client creation failed", init_error)
@@ -174,21 +189,13 @@ def call_gpt_analysis(prompt: str, max_tokens: int = 1500, temperature: float =
         # Make real GPT-3.5 Turbo API call with new v1.x syntax
         log_analysis_debug("call_gpt_analysis", 158, "Sending request to GPT-3.5 Turbo")
         
-        response = client.chat.completions.create(
+        response = chat_completion(
+            client, feature="strategic_analysis",
             model="gpt-3.5-turbo",
             messages=[
                 {
                     "role": "system", 
-                    "content": """You are an expert NFL strategic analyst with coordinator-level knowledge. You think like Bill Belichick, call plays like Andy Reid, and analyze like a professional coach. 
-
-Your expertise includes:
-- Formation efficiency and personnel package optimization
-- Situational play calling and down-and-distance strategy
-- Weather impact analysis and game situation management
-- Matchup exploitation and defensive scheme recognition
-- Clock management and strategic decision-making
-
-Provide specific, actionable insights using the provided data. Be direct, strategic, and professional."""
+                    "content": ANALYST_SYSTEM_MESSAGE
                 },
                 {
                     "role": "user", 
@@ -244,105 +251,44 @@ def build_comprehensive_prompt(
     try:
         log_analysis_debug("build_comprehensive_prompt", 218, f"Building prompt for {team1_name} vs {team2_name}")
         
-        # Build team analysis sections
-        def format_team_section(team_name: str, team_data: Dict) -> str:
-            formations = team_data.get('formations', {})
-            situational = team_data.get('situational', {})
-            personnel = team_data.get('personnel', {})
-            coaching = team_data.get('coaching', {})
-            
-            section = f"**{team_name} STRATEGIC PROFILE:**\n"
-            
-            # Formation efficiency data
-            section += "Formation Efficiency:\n"
-            for formation, data in formations.items():
-                if data.get('ypp', 0) > 0:
-                    section += f"- {formation.replace('_', ' ').title()}: {data['usage']:.1%} usage, {data['ypp']:.1f} YPP, {data['success_rate']:.1%} success\n"
-            
-            # Situational tendencies
-            section += "\nSituational Performance:\n"
-            if situational.get('third_down_conversion', 0) > 0:
-                section += f"- Third Down Conversion: {situational['third_down_conversion']:.1%}\n"
-            if situational.get('red_zone_efficiency', 0) > 0:
-                section += f"- Red Zone Efficiency: {situational['red_zone_efficiency']:.1%}\n"
-            if situational.get('goal_line_success', 0) > 0:
-                section += f"- Goal Line Success: {situational['goal_line_success']:.1%}\n"
-            
-            # Personnel strengths
-            section += "\nPersonnel Strengths:\n"
-            for metric, value in personnel.items():
-                if value > 0:
-                    section += f"- {metric.replace('_', ' ').title()}: {value:.1%}\n"
-            
-            # Coaching philosophy
-            if coaching.get('philosophy', 'Unknown') != 'Unknown':
-                section += f"\nCoaching Philosophy: {coaching['philosophy']}\n"
-            
-            return section
+        # Compact side-by-side team tables within the per-section token budgets
+        team_context = compile_team_context(
+            [(team1_name, team1_data), (team2_name, team2_data)],
+            sections=['formations', 'situational', 'personnel', 'coaching'],
+            label="build_comprehensive_prompt"
+        )
         
-        # Format weather section
+        # Fill the optional weather and game situation blocks
         weather_section = ""
         if weather_data:
-            temp = weather_data.get('temp', 'Unknown')
-            wind_speed = weather_data.get('wind_speed', 0)
-            condition = weather_data.get('condition', 'Unknown')
-            
-            weather_section = f"""
-**WEATHER CONDITIONS:**
-- Temperature: {temp}°F
-- Wind Speed: {wind_speed} mph
-- Conditions: {condition}
-- Strategic Impact: {"Minimal (dome/controlled)" if weather_data.get('is_dome') else "Consider for play calling"}
-"""
+            weather_section = WEATHER_BLOCK.substitute(
+                temp=weather_data.get('temp', 'Unknown'),
+                wind_speed=weather_data.get('wind_speed', 0),
+                condition=weather_data.get('condition', 'Unknown'),
+                impact="Minimal (dome/controlled)" if weather_data.get('is_dome') else "Consider for play calling"
+            )
         
-        # Format game situation
-        down = game_situation.get('down', 1)
-        distance = game_situation.get('distance', 10)
-        field_pos = game_situation.get('field_position', 50)
         score_diff = game_situation.get('score_differential', 0)
-        time_remaining = game_situation.get('time_remaining', '15:00')
-        
-        game_section = f"""
-**GAME SITUATION:**
-- Down & Distance: {down} and {distance}
-- Field Position: {field_pos} yard line
-- Score Differential: {'+' if score_diff >= 0 else ''}{score_diff}
-- Time Remaining: {time_remaining}
-- Strategic Context: {"Trailing - aggressive needed" if score_diff < 0 else "Leading - protect advantage" if score_diff > 0 else "Tied game - balanced approach"}
-"""
+        game_section = GAME_SITUATION_BLOCK.substitute(
+            down=game_situation.get('down', 1),
+            distance=game_situation.get('distance', 10),
+            field_position=game_situation.get('field_position', 50),
+            score_differential=f"{'+' if score_diff >= 0 else ''}{score_diff}",
+            time_remaining=game_situation.get('time_remaining', '15:00'),
+            context="Trailing - aggressive needed" if score_diff < 0 else "Leading - protect advantage" if score_diff > 0 else "Tied game - balanced approach"
+        )
         
-        # Build comprehensive prompt
-        prompt = f"""
-STRATEGIC ANALYSIS REQUEST - {analysis_type}
-===========================================
-
-**MATCHUP:** {team1_name} vs {team2_name}
-**ANALYSIS PERSPECTIVE:** {coaching_perspective}
-**COMPLEXITY LEVEL:** {complexity_level}
-**SPECIFIC QUESTION:** {question}
-
-{format_team_section(team1_name, team1_data)}
-
-{format_team_section(team2_name, team2_data)}
-
-{weather_section}
-
-{game_section}
-
-**ANALYSIS REQUIREMENTS:**
-1. Use the specific data provided above to support your analysis
-2. Identify key matchup advantages and disadvantages
-3. Provide actionable strategic recommendations
-4. Consider weather impact on play calling if applicable
-5. Address the specific question with data-driven insights
-6. Think like a professional coordinator - be specific and strategic
-
-**RESPONSE FORMAT:**
-Provide a comprehensive analysis that a {coaching_perspective} would use for game planning. Include specific formation recommendations, situational strategy, and tactical insights based on the data provided.
-"""
+        # Static prefix + filled suffix (prompt_templates.py)
+        prompt = render_prompt(
+            "strategic_analysis",
+            analysis_type=analysis_type, team1_name=team1_name, team2_name=team2_name,
+            coaching_perspective=coaching_perspective, complexity_level=complexity_level, question=question,
+            team_tables=team_context['text'], weather_section=weather_section, game_section=game_section
+        )
         
         log_analysis_debug("build_comprehensive_prompt", 306, "Comprehensive prompt built successfully",
-                         data={"prompt_length": len(prompt), "sections_included": 4})
+                         data={"prompt_length": len(prompt), "sections_included": 4,
+                               "team_tokens_saved": team_context['tokens_saved']})
         
         return prompt.strip()
         
@@ -385,22 +331,16 @@ def generate_advanced_strategic_analysis(
                              "Limited team data - GPT will compensate with NFL knowledge")
             
             # Build basic prompt for GPT to fill gaps
-            basic_prompt = f"""
-As an expert NFL analyst, provide strategic analysis for {team1_name} vs {team2_name}.
-
-Question: {question}
-Analysis Type: {analysis_type}
-Coaching Perspective: {coaching_perspective}
-
-Game Situation:
-- Down & Distance: {game_situation.get('down', 1)} and {game_situation.get('distance', 10)}
-- Field Position: {game_situation.get('field_position', 50)} yard line
-- Score: {'+' if game_situation.get('score_differential', 0) >= 0 else ''}{game_situation.get('score_differential', 0)}
-
-Weather: {weather_data.get('temp', 70)}°F, {weather_data.get('condition', 'Clear')}, {weather_data.get('wind_speed', 0)} mph wind
-
-Use your knowledge of these teams' current season performance, coaching tendencies, and strategic approaches to provide professional-level analysis.
-"""
+            basic_prompt = render_prompt(
+                "basic_analysis",
+                team1_name=team1_name, team2_name=team2_name, question=question,
+                analysis_type=analysis_type, coaching_perspective=coaching_perspective,
+                down=game_situation.get('down', 1), distance=game_situation.get('distance', 10),
+                field_position=game_situation.get('field_position', 50),
+                score_differential=f"{'+' if game_situation.get('score_differential', 0) >= 0 else ''}{game_situation.get('score_differential', 0)}",
+                temp=weather_data.get('temp', 70), condition=weather_data.get('condition', 'Clear'),
+                wind_speed=weather_data.get('wind_speed', 0)
+            )
             
             return call_gpt_analysis(basic_prompt, max_tokens=1500)
         
@@ -443,26 +383,17 @@ def generate_play_calling_analysis(team1_data: Dict, team2_data: Dict, game_situ
         team1_valid, team1_extracted = validate_and_extract_team_data(team1_data, "Your Team")
         team2_valid, team2_extracted = validate_and_extract_team_data(team2_data, "Opponent")
         
-        prompt = f"""
-As an NFL offensive coordinator, provide specific play calling recommendations for this situation:
-
-**SITUATION:** {down} and {distance} from the {field_pos} yard line
-
-**YOUR TEAM'S FORMATION EFFICIENCY:**
-{json.dumps(team1_extracted.get('formations', {}), indent=2) if team1_valid else "Use your NFL knowledge for this team"}
-
-**OPPONENT'S DEFENSIVE TENDENCIES:**
-{json.dumps(team2_extracted.get('situational', {}), indent=2) if team2_valid else "Analyze based on typical NFL defensive schemes"}
-
-**PROVIDE:**
-1. Top 3 specific play recommendations with formation and concept
-2. Personnel package selection (11, 12, 21, or 10 personnel)
-3. Route concepts and timing
-4. Risk/reward analysis for each option
-5. Defensive keys to watch pre-snap
-
-Be specific and tactical like a real NFL coordinator would be in the booth.
-"""
+        team1_context = compile_team_context([("Your Team", team1_extracted)], sections=['formations'],
+                                             label="generate_play_calling_analysis") if team1_valid else None
+        team2_context = compile_team_context([("Opponent", team2_extracted)], sections=['situational'],
+                                             label="generate_play_calling_analysis") if team2_valid else None
+        
+        prompt = render_prompt(
+            "play_calling",
+            down=down, distance=distance, field_position=field_pos,
+            team1_formations=team1_context['text'] if team1_context else "Use your NFL knowledge for this team",
+            team2_situational=team2_context['text'] if team2_context else "Analyze based on typical NFL defensive schemes"
+        )
         
         return call_gpt_analysis(prompt, max_tokens=1200)
         
@@ -480,24 +411,17 @@ def generate_matchup_analysis(team1_data: Dict, team2_data: Dict, focus_area: st
         team1_valid, team1_extracted = validate_and_extract_team_data(team1_data, "Team 1")
         team2_valid, team2_extracted = validate_and_extract_team_data(team2_data, "Team 2")
         
-        prompt = f"""
-As an NFL scout, analyze this matchup focusing on {focus_area}:
-
-**TEAM 1 PROFILE:**
-{json.dumps(team1_extracted, indent=2, default=str) if team1_valid else "Analyze using current NFL knowledge"}
-
-**TEAM 2 PROFILE:**
-{json.dumps(team2_extracted, indent=2, default=str) if team2_valid else "Analyze using current NFL knowledge"}
-
-**PROVIDE DETAILED MATCHUP ANALYSIS:**
-1. Key advantages for each team
-2. Exploitable weaknesses to target
-3. Personnel mismatches to capitalize on
-4. Situational tendencies that create opportunities
-5. Strategic game plan recommendations
-
-Focus specifically on {focus_area} but provide comprehensive insights a coaching staff would use.
-"""
+        if team1_valid and team2_valid:
+            profiles = compile_team_context([("Team 1", team1_extracted), ("Team 2", team2_extracted)],
+                                            label="generate_matchup_analysis")['text']
+        else:
+            profiles = "\n\n".join(
+                compile_team_context([(name, extracted)], label="generate_matchup_analysis")['text'] if valid
+                else f"{name}: Analyze using current NFL knowledge"
+                for name, valid, extracted in [("Team 1", team1_valid, team1_extracted), ("Team 2", team2_valid, team2_extracted)]
+            )
+        
+        prompt = render_prompt("matchup_scouting", focus_area=focus_area, profiles=profiles)
         
         return call_gpt_analysis(prompt, max_tokens=1400)
         
@@ -515,18 +439,7 @@ def generate_analysis_summary(full_analysis: str) -> str:
         if not full_analysis or len(full_analysis) < 100:
             return "Summary unavailable - insufficient analysis content"
         
-        prompt = f"""
-Summarize this NFL strategic analysis into 3 key bullet points that a coach could quickly reference:
-
-{full_analysis}
-
-**PROVIDE:**
-- 3 most critical strategic insights
-- Each bullet point should be actionable and specific
-- Focus on what matters most for game execution
-
-Keep it concise but strategic.
-"""
+        prompt = render_prompt("analysis_summary", full_analysis=full_analysis)
         
         return call_gpt_analysis(prompt, max_tokens=400)
         
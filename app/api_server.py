@@ -0,0 +1,490 @@
+"""
+API SERVER MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+========================================================
+PURPOSE: Headless JSON API over the analysis engine for bots and scripts
+FEATURES: Team data, weather, matchup/play-calling analysis, reports, leaderboard
+ARCHITECTURE: Flask app factory on database.py, weather.py, analysis.py and reports.py -
+              no Streamlit script reruns per request
+
+USAGE (from the repository root, so nfl_teams.db and app/data match the Streamlit app):
+    gunicorn --preload -w 4 --threads 4 -b 0.0.0.0:8000 --pythonpath app api_server:app
+    python app/api_server.py --port 8000                   # development server
+
+ENDPOINTS:
+- GET  /api/health
+- GET  /api/teams                          team names + abbreviations
+- GET  /api/teams/<team>                   team data + league percentiles (name or abbreviation)
+- GET  /api/weather/<team>                 stadium weather, alerts and summary
+- POST /api/analysis/matchup               {"team1", "team2", "focus_area"}
+- POST /api/analysis/play-calling          {"team1", "team2", "game_situation"}
+- POST /api/reports                        {"your_team", "opponent_team", "sections"}
+- GET  /api/reports/sections
+- GET  /api/leaderboard?week=N             /api/leaderboard/ladder
+- GET  /api/stats                          cache and connection counters for this worker
+- GET  /api/metrics[?format=prometheus]    span latencies and counters for this worker
+- GET  /api/llm-usage?days=7               LLM ledger: tokens/cost per feature, p95 per model
+
+CACHING ACROSS GUNICORN WORKERS:
+- Team data: each worker holds one LeagueSnapshot per data version (the version is
+  re-read at most every DATA_VERSION_TTL_SECONDS); responses carry an ETag so
+  pollers get 304s
+- Weather: the SQLite weather_cache table already shared by every process
+- Analysis and reports: api_response_cache table in nfl_teams.db, keyed by the
+  sha256 of the request and the data version, so one worker's GPT call serves all
+  workers until API_CACHE_TTL_SECONDS passes. Identical requests arriving together
+  in one worker wait for the first call and share its result - including a GPT
+  error, so waiters do not repeat a failing call
+- GPT error messages are returned as 502 and never cached
+- No database connection is opened at import, so --preload never shares a SQLite
+  handle across fork()
+
+DEBUGGING SYSTEM:
+- Every cache miss that reaches GPT logged with endpoint and elapsed time
+- /api/stats reports hits/misses per endpoint plus db_connections counters
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
+
+from analysis import (
+    generate_matchup_analysis, generate_play_calling_analysis, get_openai_api_key
+)
+from database import DATABASE_PATH, ensure_database_populated, get_data_version
+from db_connections import get_connection_stats, get_read_connection, write_transaction
+from instrumentation import export_metrics, get_logger, get_metrics_registry, log_event
+from lazy_imports import lazy_import
+from llm_ledger import CACHE_MODEL, get_ledger_summary, record_llm_call
+from league_data import LeagueSnapshot, build_league_snapshot
+from reports import (
+    TEAM_NAMES, compile_professional_report, get_available_report_sections, get_team_full_name
+)
+from state_store import LEADER_FILE, ladder, leaderboard
+from weather import get_comprehensive_weather_data, get_weather_alerts, get_weather_summary
+
+openai = lazy_import("openai")
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("api_server")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+API_CACHE_TTL_SECONDS = int(os.environ.get('API_CACHE_TTL_SECONDS', 6 * 60 * 60))
+DATA_VERSION_TTL_SECONDS = float(os.environ.get('API_DATA_VERSION_TTL_SECONDS', 5))
+
+# analysis.py and reports.py return these instead of raising
+GPT_ERROR_PREFIXES = (
+    'Analysis temporarily unavailable', 'Analysis unavailable', 'Analysis system error',
+    'Matchup analysis error', 'Play calling analysis error', 'Error generating'
+)
+
+# Ledger feature tag of the LLM calls each cached endpoint stands in for
+ENDPOINT_FEATURES = {
+    'analysis/matchup': 'strategic_analysis',
+    'analysis/play-calling': 'strategic_analysis',
+    'reports': 'report_section',
+}
+
+ABBREVIATIONS = {name: abbr for abbr, name in TEAM_NAMES.items()}
+
+class APIError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status"""
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+# =============================================================================
+# LEAGUE DATA - one snapshot per data version per worker
+# =============================================================================
+
+_league_lock = threading.Lock()
+_league = {'version': None, 'checked_at': 0.0, 'snapshot': None}
+_populated = False
+
+def get_current_snapshot() -> LeagueSnapshot:
+    """
+    Snapshot for the current data version; the version query runs at most every
+    DATA_VERSION_TTL_SECONDS, the snapshot is rebuilt only when it changes
+    """
+    global _populated
+    now = time.monotonic()
+    if _league['snapshot'] is not None and now - _league['checked_at'] < DATA_VERSION_TTL_SECONDS:
+        return _league['snapshot']
+
+    with _league_lock:
+        if not _populated:
+            ensure_database_populated()
+            _populated = True
+
+        version = get_data_version()
+        if _league['snapshot'] is None or version != _league['version']:
+            _league['snapshot'] = build_league_snapshot(version)
+            _league['version'] = version
+            log_debug("get_current_snapshot", 139, f"League snapshot built for data version {version}")
+        _league['checked_at'] = now
+        return _league['snapshot']
+
+def resolve_team(team: str, snapshot: LeagueSnapshot) -> str:
+    """Full team name from a name or abbreviation (case-insensitive)"""
+    if not team:
+        raise APIError("team is required")
+    candidates = [team, get_team_full_name(team.upper())]
+    for name in snapshot.team_names:
+        if name.lower() == team.lower():
+            candidates.insert(0, name)
+    for candidate in candidates:
+        if snapshot.has_team(candidate):
+            return candidate
+    raise APIError(f"Unknown team: {team}", 404)
+
+# =============================================================================
+# SHARED RESPONSE CACHE - SQLite table visible to every worker process
+# =============================================================================
+
+_cache_table_ready = False
+_cache_stats_lock = threading.Lock()
+_cache_stats: Dict[str, Dict[str, int]] = {}
+_inflight_lock = threading.Lock()
+_inflight: Dict[str, '_InFlight'] = {}
+
+class _InFlight:
+    """One generation per key: the first request runs it, the others wait for its result"""
+
+    __slots__ = ('lock', 'users', 'error')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0          # requests holding this entry; it is dropped when the last leaves
+        self.error = None       # 502 response of a failed generation, shared with the waiters
+
+def init_response_cache():
+    global _cache_table_ready
+    if _cache_table_ready:
+        return
+    with write_transaction(DATABASE_PATH) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS api_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_api_cache_expires ON api_response_cache(expires_at)')
+    _cache_table_ready = True
+
+def _count(endpoint: str, outcome: str):
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(endpoint, {'hits': 0, 'misses': 0, 'errors': 0})
+        stats[outcome] += 1
+
+def cache_key(endpoint: str, params: Dict, data_version: str) -> str:
+    payload = json.dumps({'endpoint': endpoint, 'params': params, 'data_version': data_version},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get_cached_response(key: str) -> Optional[Dict]:
+    init_response_cache()
+    row = get_read_connection(DATABASE_PATH).execute(
+        "SELECT response, created_at FROM api_response_cache WHERE cache_key = ? AND expires_at > ?",
+        (key, datetime.now().isoformat())
+    ).fetchone()
+    if row is None:
+        return None
+    response = json.loads(row[0])
+    response['cache_info'] = {'cached': True, 'cached_at': row[1]}
+    return response
+
+def store_response(key: str, endpoint: str, response: Dict):
+    """Insert one response; expired rows are removed in the same transaction"""
+    now = datetime.now()
+    with write_transaction(DATABASE_PATH) as conn:
+        conn.execute("DELETE FROM api_response_cache WHERE expires_at <= ?", (now.isoformat(),))
+        conn.execute('''
+            INSERT OR REPLACE INTO api_response_cache (cache_key, endpoint, response, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (key, endpoint, json.dumps(response), now.isoformat(),
+              (now + timedelta(seconds=API_CACHE_TTL_SECONDS)).isoformat()))
+
+def cached_generation(endpoint: str, params: Dict, data_version: str, generate) -> Tuple[Dict, int]:
+    """
+    Serve `generate()` from the shared cache; on a miss run it once per key in this
+    worker and cache the result. Concurrent identical requests wait for that call and
+    then read the cache, or get the same 502 if it failed
+    """
+    start = time.perf_counter()
+    key = cache_key(endpoint, params, data_version)
+    cached = get_cached_response(key)
+    if cached is not None:
+        _count(endpoint, 'hits')
+        _record_cache_hit(endpoint, start)
+        return cached, 200
+
+    with _inflight_lock:
+        entry = _inflight.setdefault(key, _InFlight())
+        entry.users += 1
+    try:
+        with entry.lock:
+            if entry.error is not None:
+                _count(endpoint, 'errors')
+                return entry.error, 502
+
+            cached = get_cached_response(key)
+            if cached is not None:
+                _count(endpoint, 'hits')
+                _record_cache_hit(endpoint, start)
+                return cached, 200
+
+            start = time.perf_counter()
+            text = generate()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            log_debug("cached_generation", 263, f"{endpoint} generated in {elapsed_ms:.0f}ms")
+
+            response = {**params, 'content': text, 'data_version': data_version,
+                        'generated_at': datetime.now().isoformat(timespec='seconds')}
+            if not text or text.startswith(GPT_ERROR_PREFIXES) or '\nError generating ' in text:
+                _count(endpoint, 'errors')
+                entry.error = {**response, 'error': 'Analysis service unavailable'}
+                return entry.error, 502
+
+            _count(endpoint, 'misses')
+            store_response(key, endpoint, response)
+            return {**response, 'cache_info': {'cached': False}}, 200
+    finally:
+        with _inflight_lock:
+            entry.users -= 1
+            if entry.users == 0:
+                _inflight.pop(key, None)
+
+def _record_cache_hit(endpoint: str, start: float):
+    record_llm_call(ENDPOINT_FEATURES.get(endpoint, endpoint), CACHE_MODEL, cache_hit=True,
+                    provider='cache', latency_ms=(time.perf_counter() - start) * 1000)
+
+def get_cache_stats() -> Dict:
+    with _cache_stats_lock:
+        return {endpoint: dict(stats) for endpoint, stats in _cache_stats.items()}
+
+# =============================================================================
+# REQUEST HELPERS
+# =============================================================================
+
+def json_body() -> Dict:
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise APIError("Request body must be a JSON object")
+    return body
+
+def conditional_json(payload: Dict, etag: str):
+    """JSON response with an ETag; If-None-Match hits return 304 without a body"""
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response.make_conditional(request)
+
+def get_openai_client():
+    api_key = get_openai_api_key()
+    if not api_key:
+        raise APIError("OPENAI_API_KEY is not configured", 503)
+    return openai.OpenAI(api_key=api_key)
+
+# =============================================================================
+# APPLICATION FACTORY
+# =============================================================================
+
+def create_app() -> Flask:
+    app = Flask(__name__)
+    app.json.sort_keys = False
+    CORS(app)
+
+    @app.errorhandler(APIError)
+    def handle_api_error(error: APIError):
+        return jsonify({'error': error.message}), error.status
+
+    @app.errorhandler(Exception)
+    def handle_unexpected(error: Exception):
+        if isinstance(error, HTTPException):
+            return jsonify({'error': error.description}), error.code
+        log_debug("handle_unexpected", 306, f"{request.method} {request.path} failed", error)
+        return jsonify({'error': 'Internal server error'}), 500
+
+    @app.get('/api/health')
+    def health():
+        return jsonify({'status': 'ok', 'pid': os.getpid(), 'time': datetime.now().isoformat(timespec='seconds')})
+
+    # ---- Team data ----------------------------------------------------------
+
+    @app.get('/api/teams')
+    def teams():
+        snapshot = get_current_snapshot()
+        payload = {
+            'data_version': snapshot.data_version,
+            'teams': [{'name': name, 'abbreviation': ABBREVIATIONS.get(name)} for name in snapshot.team_names]
+        }
+        return conditional_json(payload, hashlib.sha256(snapshot.data_version.encode()).hexdigest()[:16])
+
+    @app.get('/api/teams/<team>')
+    def team_detail(team: str):
+        snapshot = get_current_snapshot()
+        name = resolve_team(team, snapshot)
+        payload = {
+            'name': name,
+            'abbreviation': ABBREVIATIONS.get(name),
+            'data_version': snapshot.data_version,
+            'data': snapshot.get_team_data(name),
+            'percentiles': snapshot.get_team_percentiles(name)
+        }
+        etag = hashlib.sha256(f"{snapshot.data_version}:{name}".encode()).hexdigest()[:16]
+        return conditional_json(payload, etag)
+
+    # ---- Weather ------------------------------------------------------------
+
+    @app.get('/api/weather/<team>')
+    def weather(team: str):
+        snapshot = get_current_snapshot()
+        name = resolve_team(team, snapshot)
+        stadium = snapshot.get_team_data(name).get('stadium_info', {})
+        if not stadium.get('city'):
+            raise APIError(f"No stadium location for {name}", 404)
+
+        weather_data = get_comprehensive_weather_data(name, stadium['city'], stadium.get('state', ''),
+                                                      bool(stadium.get('is_dome', False)))
+        return jsonify({
+            'team': name,
+            'stadium': stadium.get('name'),
+            'weather': weather_data,
+            'alerts': get_weather_alerts(weather_data),
+            'summary': get_weather_summary(weather_data)
+        })
+
+    # ---- Analysis -----------------------------------------------------------
+
+    @app.post('/api/analysis/matchup')
+    def matchup_analysis():
+        body = json_body()
+        snapshot = get_current_snapshot()
+        team1 = resolve_team(body.get('team1'), snapshot)
+        team2 = resolve_team(body.get('team2'), snapshot)
+        focus_area = str(body.get('focus_area', 'overall'))
+
+        payload, status = cached_generation(
+            'analysis/matchup', {'team1': team1, 'team2': team2, 'focus_area': focus_area}, snapshot.data_version,
+            lambda: generate_matchup_analysis(snapshot.get_team_data(team1), snapshot.get_team_data(team2), focus_area)
+        )
+        return jsonify(payload), status
+
+    @app.post('/api/analysis/play-calling')
+    def play_calling_analysis():
+        body = json_body()
+        snapshot = get_current_snapshot()
+        team1 = resolve_team(body.get('team1'), snapshot)
+        team2 = resolve_team(body.get('team2'), snapshot)
+        game_situation = body.get('game_situation')
+        if not isinstance(game_situation, dict):
+            raise APIError("game_situation must be an object")
+
+        payload, status = cached_generation(
+            'analysis/play-calling', {'team1': team1, 'team2': team2, 'game_situation': game_situation},
+            snapshot.data_version,
+            lambda: generate_play_calling_analysis(snapshot.get_team_data(team1), snapshot.get_team_data(team2),
+                                                   game_situation)
+        )
+        return jsonify(payload), status
+
+    # ---- Reports ------------------------------------------------------------
+
+    @app.get('/api/reports/sections')
+    def report_sections():
+        return jsonify(get_available_report_sections())
+
+    @app.post('/api/reports')
+    def reports():
+        body = json_body()
+        snapshot = get_current_snapshot()
+        your_team = ABBREVIATIONS.get(resolve_team(body.get('your_team'), snapshot))
+        opponent_team = ABBREVIATIONS.get(resolve_team(body.get('opponent_team'), snapshot))
+
+        available = get_available_report_sections()
+        sections = body.get('sections') or list(available)
+        unknown = [s for s in sections if s not in available]
+        if unknown:
+            raise APIError(f"Unknown report sections: {', '.join(map(str, unknown))}")
+
+        payload, status = cached_generation(
+            'reports', {'your_team': your_team, 'opponent_team': opponent_team, 'sections': sections},
+            snapshot.data_version,
+            lambda: compile_professional_report(sections, your_team, opponent_team, get_openai_client())
+        )
+        return jsonify(payload), status
+
+    # ---- Leaderboard --------------------------------------------------------
+
+    @app.get('/api/leaderboard')
+    def leaderboard_view():
+        week = request.args.get('week', type=int)
+        return conditional_json({'week': week, 'entries': leaderboard(week)}, _leaderboard_etag(f"week={week}"))
+
+    @app.get('/api/leaderboard/ladder')
+    def ladder_view():
+        return conditional_json({'entries': ladder()}, _leaderboard_etag('ladder'))
+
+    # ---- Stats --------------------------------------------------------------
+
+    @app.get('/api/stats')
+    def stats():
+        return jsonify({
+            'pid': os.getpid(),
+            'data_version': _league['version'],
+            'response_cache': get_cache_stats(),
+            'connections': get_connection_stats()
+        })
+
+    @app.get('/api/metrics')
+    def metrics():
+        if request.args.get('format') == 'prometheus':
+            return get_metrics_registry().to_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+        return jsonify({'pid': os.getpid(), **export_metrics()})
+
+    @app.get('/api/llm-usage')
+    def llm_usage():
+        try:
+            days = int(request.args.get('days', 7))
+        except ValueError:
+            raise APIError("days must be an integer")
+        return jsonify(get_ledger_summary(min(max(days, 1), 90)))
+
+    return app
+
+def _leaderboard_etag(view: str) -> str:
+    mtime = os.path.getmtime(LEADER_FILE) if os.path.exists(LEADER_FILE) else 0
+    return hashlib.sha256(f"{view}:{mtime}".encode()).hexdigest()[:16]
+
+app = create_app()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GRIT headless JSON API (development server)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,338 @@
+"""
+BATCH REPORTS MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+===========================================================
+PURPOSE: Generate Professional Reports for a whole weekly slate in one run
+FEATURES: Section fan-out across games, global concurrency + rate limit, MD/TXT/PDF output, index
+ARCHITECTURE: One thread pool for every (game, section) call; one team-data query per run
+
+USAGE (from the repository root):
+    python app/batch_reports.py --slate week5.json                 # [{"your_team": "PHI", "opponent_team": "DAL"}, ...]
+    python app/batch_reports.py --matchup PHI:DAL --matchup KC:BUF --concurrency 6 --rpm 120
+    python app/batch_reports.py --slate week5.json --sections executive_summary,conclusion
+
+HOW IT WORKS:
+- Every (game, section) pair is one task on a shared ThreadPoolExecutor, so 16 games
+  x 8 sections keep CONCURRENCY calls in flight instead of running game by game
+- All tasks share one RateLimiter (requests per minute) - the whole slate stays
+  under the --rpm cap no matter how many workers are running
+- Calls run at BATCH priority in llm_scheduler, so in a shared process the app's
+  interactive calls and background jobs go first; 429s and 5xx are retried there
+- Team data is loaded once for all 32 teams and each team's extraction is computed
+  once per run; weather comes from weather.py, whose SQLite cache is shared
+  with the app and the API server
+- Reports use the same layout as the Professional Tools tab
+  (reports.format_professional_report), with a game conditions block up front
+- Output goes to <output-root>/<YYYY-MM-DD>/: one .md, .txt and .pdf per game,
+  slate.pdf with every game, and index.md / index.json listing files,
+  failed sections and timings
+
+DEBUGGING SYSTEM:
+- Each game logged when its last section completes, with failures
+- index.json records per-section seconds and the limiter's total wait
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from analysis import get_openai_api_key, validate_and_extract_team_data
+from database import ensure_database_populated, get_all_team_data
+from instrumentation import get_logger, log_event
+from lazy_imports import lazy_import
+from llm_scheduler import BATCH, llm_priority
+from prompt_compiler import compile_team_context
+from reports import (
+    build_report_pdf_params, format_professional_report, generate_professional_report_section,
+    get_available_report_sections, get_team_full_name
+)
+from weather import get_comprehensive_weather_data, get_weather_alerts, get_weather_summary
+
+openai = lazy_import("openai")
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("batch_reports")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_OUTPUT_ROOT = os.path.join(os.getenv("STATE_DIR", "app/data"), "reports")
+
+# reports.generate_professional_report_section returns this instead of raising
+SECTION_ERROR_PREFIX = "Error generating "
+
+# =============================================================================
+# RATE LIMITER - shared by every worker in the run
+# =============================================================================
+
+class RateLimiter:
+    """
+    Spaces calls evenly at requests_per_minute across all threads
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self.total_wait = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            wait = slot - now
+            self.total_wait += wait
+        if wait > 0:
+            time.sleep(wait)
+
+# =============================================================================
+# SLATE INPUT
+# =============================================================================
+
+def parse_matchup(text: str) -> Dict[str, str]:
+    """'PHI:DAL' -> {'your_team': 'PHI', 'opponent_team': 'DAL'}"""
+    your_team, sep, opponent_team = text.partition(':')
+    if not sep or not your_team or not opponent_team:
+        raise ValueError(f"Matchup must look like PHI:DAL, got {text!r}")
+    return {'your_team': your_team.strip().upper(), 'opponent_team': opponent_team.strip().upper()}
+
+def load_slate(path: str) -> List[Dict[str, str]]:
+    """Slate file: a JSON list of {"your_team", "opponent_team"} objects or [your, opponent] pairs"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    slate = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            slate.append({'your_team': entry['your_team'].upper(), 'opponent_team': entry['opponent_team'].upper()})
+        else:
+            slate.append({'your_team': entry[0].upper(), 'opponent_team': entry[1].upper()})
+    return slate
+
+# =============================================================================
+# SHARED GAME CONTEXT - team extractions and weather, computed once per run
+# =============================================================================
+
+class SlateContext:
+    """Team data for the whole league plus per-team extraction and per-game weather caches"""
+
+    def __init__(self):
+        ensure_database_populated()
+        self.teams = get_all_team_data()
+        self._lock = threading.Lock()
+        self._extractions: Dict[str, Dict] = {}
+
+    def extraction(self, team: str) -> Tuple[bool, Dict]:
+        name = get_team_full_name(team)
+        with self._lock:
+            if name not in self._extractions:
+                self._extractions[name] = validate_and_extract_team_data(self.teams.get(name, {}), name)
+            return self._extractions[name]
+
+    def game_conditions(self, your_team: str, opponent_team: str) -> Dict:
+        """Weather at your_team's stadium plus a compact side-by-side team profile"""
+        name = get_team_full_name(your_team)
+        stadium = self.teams.get(name, {}).get('stadium_info', {})
+        weather = {}
+        if stadium.get('city'):
+            weather = get_comprehensive_weather_data(name, stadium['city'], stadium.get('state', ''),
+                                                     bool(stadium.get('is_dome', False)))
+
+        profiles = [(get_team_full_name(team), extracted) for team in (your_team, opponent_team)
+                    for valid, extracted in [self.extraction(team)] if valid]
+        return {
+            'stadium': stadium.get('name', 'Unknown Stadium'),
+            'weather_summary': get_weather_summary(weather),
+            'weather_alerts': get_weather_alerts(weather) if weather else [],
+            'team_profiles': compile_team_context(profiles, label="batch_reports")['text'] if profiles else ""
+        }
+
+def pipe_tables_to_markdown(text: str) -> str:
+    """compile_team_context() pipe tables (title | team | team, then rows) as Markdown tables"""
+    tables = []
+    for block in text.strip().split("\n\n"):
+        rows = [f"| {line} |" for line in block.strip().splitlines()]
+        if rows:
+            columns = rows[0].count(" | ") + 1
+            rows.insert(1, "|" + "---|" * columns)
+            tables.append("\n".join(rows))
+    return "\n\n".join(tables)
+
+def conditions_markdown(conditions: Dict) -> str:
+    lines = ["### GAME CONDITIONS", "", f"**Stadium:** {conditions['stadium']}", "",
+             f"**Weather:** {conditions['weather_summary']}"]
+    if conditions['weather_alerts']:
+        lines += [""] + [f"- {alert}" for alert in conditions['weather_alerts']]
+    if conditions['team_profiles']:
+        lines += ["", "### TEAM PROFILES", "", pipe_tables_to_markdown(conditions['team_profiles'])]
+    return "\n".join(lines)
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def markdown_to_text(markdown: str) -> str:
+    text = re.sub(r'^#+\s*', '', markdown, flags=re.M)
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    return re.sub(r'^-{3,}$', '', text, flags=re.M).strip() + "\n"
+
+def write_game_outputs(output_dir: str, your_team: str, opponent_team: str, report: str) -> Tuple[Dict, Dict]:
+    """Write .md/.txt/.pdf for one game; returns (file names, the game's PDF sheet)"""
+    from pdf_export import export_edge_sheet_pdf
+
+    stem = f"{your_team}_vs_{opponent_team}"
+    files = {'md': f"{stem}.md", 'txt': f"{stem}.txt", 'pdf': f"{stem}.pdf"}
+    with open(os.path.join(output_dir, files['md']), 'w', encoding='utf-8') as f:
+        f.write(report)
+    with open(os.path.join(output_dir, files['txt']), 'w', encoding='utf-8') as f:
+        f.write(markdown_to_text(report))
+
+    sheet = build_report_pdf_params(report, your_team, opponent_team)
+    export_edge_sheet_pdf(os.path.join(output_dir, files['pdf']), sheet['title'], sheet['tldr'], sheet['bullets'])
+    return files, sheet
+
+def write_index(output_dir: str, summary: Dict):
+    with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+        f.write('\n')
+
+    lines = [f"# Weekly Report Slate - {summary['date']}", "",
+             f"{len(summary['games'])} games, {summary['sections_total']} sections "
+             f"({summary['sections_failed']} failed) in {summary['elapsed_seconds']:.0f}s "
+             f"- concurrency {summary['concurrency']}, {summary['requests_per_minute']} req/min", "",
+             "| Game | Weather | Failed sections | Files |", "|---|---|---|---|"]
+    for game in summary['games']:
+        links = " · ".join(f"[{kind}]({name})" for kind, name in game['files'].items())
+        lines.append(f"| {game['title']} | {game['weather_summary']} | "
+                     f"{', '.join(game['failed_sections']) or '-'} | {links} |")
+    lines += ["", f"All games: [slate.pdf]({summary['slate_pdf']})", ""]
+    with open(os.path.join(output_dir, 'index.md'), 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+
+# =============================================================================
+# BATCH PIPELINE
+# =============================================================================
+
+def run_batch_reports(slate: List[Dict[str, str]], sections: Optional[List[str]] = None,
+                      concurrency: int = DEFAULT_CONCURRENCY,
+                      requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                      output_root: str = DEFAULT_OUTPUT_ROOT, client=None) -> Dict:
+    """
+    Generate and write reports for every matchup in the slate
+
+    Returns:
+        The index summary (also written to index.json)
+    """
+    from pdf_export import export_edge_sheets_pdf
+
+    available = get_available_report_sections()
+    sections = [s for s in (sections or list(available)) if s in available]
+    if not slate or not sections:
+        raise ValueError("Nothing to generate: the slate and section list must not be empty")
+
+    start = time.perf_counter()
+    date = datetime.now().strftime('%Y-%m-%d')
+    output_dir = os.path.join(output_root, date)
+    os.makedirs(output_dir, exist_ok=True)
+
+    client = client or openai.OpenAI(api_key=get_openai_api_key())
+    limiter = RateLimiter(requests_per_minute)
+    context = SlateContext()
+    conditions = [context.game_conditions(g['your_team'], g['opponent_team']) for g in slate]
+
+    def generate(game_index: int, section_id: str) -> Tuple[int, str, str, float]:
+        game = slate[game_index]
+        limiter.acquire()
+        section_start = time.perf_counter()
+        with llm_priority(BATCH):
+            content = generate_professional_report_section(section_id, game['your_team'], game['opponent_team'], client)
+        return game_index, section_id, content, time.perf_counter() - section_start
+
+    results: Dict[int, Dict[str, Tuple[str, float]]] = {i: {} for i in range(len(slate))}
+    log_debug("run_batch_reports", 253, f"Generating {len(slate)} games x {len(sections)} sections "
+                                        f"(concurrency {concurrency}, {requests_per_minute} req/min)")
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch-report") as pool:
+        futures = [pool.submit(generate, i, section_id) for i in range(len(slate)) for section_id in sections]
+        for future in as_completed(futures):
+            game_index, section_id, content, seconds = future.result()
+            results[game_index][section_id] = (content, seconds)
+            if len(results[game_index]) == len(sections):
+                game = slate[game_index]
+                failed = [s for s, (text, _) in results[game_index].items() if text.startswith(SECTION_ERROR_PREFIX)]
+                log_debug("run_batch_reports", 264, f"{game['your_team']} vs {game['opponent_team']} done"
+                                                    f"{' - failed: ' + ', '.join(failed) if failed else ''}")
+
+    games, sheets = [], []
+    for i, game in enumerate(slate):
+        section_contents = [(available[s], results[i][s][0]) for s in sections]
+        report = format_professional_report(game['your_team'], game['opponent_team'], section_contents,
+                                            preamble=conditions_markdown(conditions[i]))
+        files, sheet = write_game_outputs(output_dir, game['your_team'], game['opponent_team'], report)
+        sheets.append(sheet)
+        games.append({
+            **game,
+            'title': sheet['title'],
+            'files': files,
+            'weather_summary': conditions[i]['weather_summary'],
+            'failed_sections': [s for s in sections if results[i][s][0].startswith(SECTION_ERROR_PREFIX)],
+            'section_seconds': {s: round(results[i][s][1], 2) for s in sections}
+        })
+
+    export_edge_sheets_pdf(os.path.join(output_dir, 'slate.pdf'), sheets)
+
+    summary = {
+        'date': date,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'output_dir': output_dir,
+        'sections': sections,
+        'concurrency': concurrency,
+        'requests_per_minute': requests_per_minute,
+        'sections_total': len(slate) * len(sections),
+        'sections_failed': sum(len(g['failed_sections']) for g in games),
+        'rate_limit_wait_seconds': round(limiter.total_wait, 2),
+        'elapsed_seconds': round(time.perf_counter() - start, 2),
+        'slate_pdf': 'slate.pdf',
+        'games': games
+    }
+    write_index(output_dir, summary)
+    log_debug("run_batch_reports", 301, f"Wrote {len(games)} reports to {output_dir} in {summary['elapsed_seconds']:.0f}s")
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Professional Reports for a slate of matchups")
+    parser.add_argument("--slate", help="JSON slate file")
+    parser.add_argument("--matchup", action="append", default=[], help="YOUR:OPPONENT, e.g. PHI:DAL (repeatable)")
+    parser.add_argument("--sections", help="Comma-separated section IDs (default: all)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Section calls in flight")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE, help="Requests per minute, all games")
+    parser.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT, help="Dated directories are created here")
+    args = parser.parse_args()
+
+    slate = (load_slate(args.slate) if args.slate else []) + [parse_matchup(m) for m in args.matchup]
+    if not slate:
+        parser.error("give a --slate file or at least one --matchup")
+
+    summary = run_batch_reports(slate, args.sections.split(',') if args.sections else None,
+                                args.concurrency, args.rpm, args.output_root)
+    print(f"{len(summary['games'])} reports, {summary['sections_failed']} failed sections -> "
+          f"{os.path.join(summary['output_dir'], 'index.md')}")
+    sys.exit(1 if summary['sections_failed'] else 0)
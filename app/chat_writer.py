@@ -0,0 +1,285 @@
+"""
+CHAT WRITER MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=========================================================
+PURPOSE: Write-behind queue for chat_history inserts off the request path
+         (llm_ledger reuses the queue for llm_calls rows)
+FEATURES: Batched transactions, flush on shutdown, durability modes, queue metrics
+ARCHITECTURE: One daemon thread drains a queue into the db_connections writer
+
+HOW IT WORKS:
+- save_chat_message() enqueues the row and returns immediately
+- The writer thread commits up to BATCH_SIZE rows in one transaction, or whatever
+  has queued once FLUSH_INTERVAL_MS has passed since the first pending row
+- Timestamps are taken at enqueue time, so history order matches send order
+- flush() blocks until everything enqueued so far is committed; reads call it
+  first so a session always sees its own messages
+- stop() runs at interpreter exit and drains the queue before closing
+
+DURABILITY MODES (CHAT_DURABILITY environment variable):
+- batched   (default) - write-behind; a hard crash can lose up to one batch
+- immediate - INSERT + commit on the calling thread, the original behaviour
+
+DEBUGGING SYSTEM:
+- Each batch logged with size, queue depth and commit time
+- get_chat_writer_stats() reports queue depth, batch sizes and errors
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+from datetime import datetime, timezone
+from db_connections import write_transaction
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("chat_writer")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL_MS = 250
+DURABILITY_MODES = ('batched', 'immediate')
+DEFAULT_DURABILITY = os.environ.get('CHAT_DURABILITY', 'batched').lower()
+
+INSERT_SQL = """
+    INSERT INTO chat_history (session_id, role, message, analysis_type, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_STOP = object()
+
+def _utc_timestamp() -> str:
+    """Same format as SQLite CURRENT_TIMESTAMP"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+# =============================================================================
+# WRITE-BEHIND QUEUE
+# =============================================================================
+
+class ChatWriteQueue:
+    """
+    Batches chat_history inserts into one transaction per BATCH_SIZE rows
+    or FLUSH_INTERVAL_MS, whichever comes first
+    """
+
+    def __init__(self, db_path: str, batch_size: int = BATCH_SIZE,
+                 flush_interval_ms: int = FLUSH_INTERVAL_MS, durability: str = DEFAULT_DURABILITY,
+                 insert_sql: str = INSERT_SQL, name: str = "chat-writer"):
+        if durability not in DURABILITY_MODES:
+            log_debug("ChatWriteQueue.__init__", 83, f"Unknown durability '{durability}' - using batched")
+            durability = 'batched'
+
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self.durability = durability
+        self.insert_sql = insert_sql
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'errors': 0,
+            'dropped': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'max_queue_depth': 0,
+            'last_commit_ms': 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def enqueue(self, session_id: str, role: str, message: str, analysis_type: str = "general"):
+        """Queue one chat message (or write it now in immediate mode)"""
+        self.enqueue_row((session_id, role, message, analysis_type, _utc_timestamp()))
+
+    def enqueue_row(self, row: tuple):
+        """Queue one row of insert_sql parameters"""
+        if self.durability == 'immediate' or self._stopped:
+            self._write_now(row)
+            return
+
+        self._ensure_started()
+        self._queue.put(row)
+        with self._lock:
+            self._stats['enqueued'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every message enqueued so far is committed"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Drain the queue and stop the writer thread"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        log_debug("ChatWriteQueue.stop", 146, f"{self.name} stopped - {self._stats['written']} rows written")
+
+    def set_durability(self, durability: str):
+        """Switch between 'batched' and 'immediate'; pending rows are flushed first"""
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
+        if durability == 'immediate':
+            self.flush()
+        self.durability = durability
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_batch_size'] = round(stats['written'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['durability'] = self.durability
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, stopping = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+
+            # Collect until the batch is full, the interval passes, or a flush/stop arrives
+            while True:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+
+                if stopping or waiters or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stopping:
+                batch.extend(self._drain(waiters))
+            if batch:
+                self._commit_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                return
+
+    def _drain(self, waiters):
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not _STOP:
+                rows.append(item)
+
+    def _commit_batch(self, batch):
+        start = time.perf_counter()
+        for attempt in (1, 2):
+            try:
+                with write_transaction(self.db_path) as conn:
+                    conn.executemany(self.insert_sql, batch)
+                break
+            except Exception as e:
+                if attempt == 2:
+                    log_debug("ChatWriteQueue._commit_batch", 231, f"{self.name} dropping {len(batch)} rows", e)
+                    with self._lock:
+                        self._stats['errors'] += 1
+                        self._stats['dropped'] += len(batch)
+                    return
+                log_debug("ChatWriteQueue._commit_batch", 236, "Batch write failed - retrying once", e)
+                time.sleep(0.05)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['last_batch_size'] = len(batch)
+            self._stats['max_batch_size'] = max(self._stats['max_batch_size'], len(batch))
+            self._stats['last_commit_ms'] = round(elapsed_ms, 2)
+        log_debug("ChatWriteQueue._commit_batch", 246,
+                  f"{self.name} committed {len(batch)} rows in {elapsed_ms:.1f}ms (queue depth {self._queue.qsize()})")
+
+    def _write_now(self, row):
+        try:
+            with write_transaction(self.db_path) as conn:
+                conn.execute(self.insert_sql, row)
+            with self._lock:
+                self._stats['written'] += 1
+        except Exception as e:
+            log_debug("ChatWriteQueue._write_now", 256, f"{self.name} failed to write a row", e)
+            with self._lock:
+                self._stats['errors'] += 1
+
+# =============================================================================
+# MODULE SINGLETON - one writer per process (not st.cache_resource, which
+# does not cache outside a Streamlit runtime)
+# =============================================================================
+
+_writer: Optional[ChatWriteQueue] = None
+_writer_lock = threading.Lock()
+
+def get_chat_writer(db_path: str = 'nfl_teams.db') -> ChatWriteQueue:
+    """Process-wide chat writer, stopped (and drained) at interpreter exit"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ChatWriteQueue(db_path)
+                atexit.register(_writer.stop)
+                log_debug("get_chat_writer", 276, f"Chat writer ready ({_writer.durability} mode)")
+    return _writer
+
+def flush_chat_writes(timeout: float = 5.0) -> bool:
+    """Commit pending chat messages; no-op if the writer was never started"""
+    return _writer.flush(timeout) if _writer is not None else True
+
+def get_chat_writer_stats() -> Dict:
+    """Queue depth, batch size and error metrics for the chat writer"""
+    return _writer.stats() if _writer is not None else {}
@@ -2,13 +2,16 @@
 DATABASE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
 ======================================================
 PURPOSE: SQLite database management for NFL team data and chat history
-ARCHITECTURE: Cached connection management with comprehensive team data
+ARCHITECTURE: WAL-mode per-thread readers and a single writer (db_connections.py)
 FEATURES: Team stats, formation data, situational tendencies, stadium info
+CHAT HISTORY: Indexed by (session_id, timestamp, id), keyset pagination, compressed archive,
+              write-behind batched inserts (chat_writer.py)
 
 BUG FIXES APPLIED:
 - Line 47: Changed @st.cache_data to @st.cache_resource for connection management
 - Line 52: Fixed connection lifecycle - removed premature conn.close() calls
 - Line 129: Added ensure_database_populated() for safe initialization
+- Seed data moved to data/teams_seed.json, bulk-loaded once per seed version
 - Line 477: Removed module-level populate_teams_database() call
 - All functions: Removed conn.close() calls to prevent "closed database" errors
 
@@ -18,79 +21,128 @@ DEBUGGING SYSTEM:
 - Connection status tracking for troubleshooting
 """
 
-import sqlite3
-import streamlit as st
+import threading
 from typing import Dict, List, Optional, Tuple
 import json
-from datetime import datetime
+import os
+import zlib
+from chat_writer import flush_chat_writes, get_chat_writer
+from db_connections import get_read_connection, write_transaction
+from instrumentation import get_logger, log_event, span
+
+DATABASE_PATH = 'nfl_teams.db'
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'teams_seed.json')
+
+TEAM_DATA_COLUMNS = ('formation_data', 'situational_tendencies', 'personnel_packages',
+                     'stadium_info', 'weather_tendencies', 'coaching_staff')
 
 # =============================================================================
 # DEBUG LOGGING SYSTEM - Makes debugging easy
 # =============================================================================
 
+_logger = get_logger("database")
+
 def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
     """
     Central debug logging system for easy error tracking
     """
-    timestamp = datetime.now().strftime('%H:%M:%S')
-    if error:
-        print(f"[{timestamp}] ERROR in {function_name}() line {line_number}: {message} - {str(error)}")
-    else:
-        print(f"[{timestamp}] DEBUG {function_name}() line {line_number}: {message}")
+    log_event(_logger, function_name, line_number, message, error)
 
 # =============================================================================
 # DATABASE CONNECTION MANAGEMENT - BUG FIX: Line 47
+# Connections come from db_connections: WAL mode, a read-only connection per
+# thread and one locked writer (replaces the single shared cache_resource connection)
 # =============================================================================
 
-@st.cache_resource  # BUG FIX: Changed from @st.cache_data to @st.cache_resource
+_schema_lock = threading.Lock()
+_schema_ready = False
+
 def init_database():
     """
     Initialize SQLite database with all required tables
-    BUG FIX: Line 52 - Using @st.cache_resource for persistent connection
+    Creates the schema once per process and returns the calling thread's
+    read-only connection; writes go through write_transaction()
     """
+    global _schema_ready
+    if _schema_ready:
+        return get_read_connection(DATABASE_PATH)
+    
     try:
         log_debug("init_database", 52, "Initializing database connection")
         
-        conn = sqlite3.connect('nfl_teams.db', check_same_thread=False)
-        cursor = conn.cursor()
+        with _schema_lock:
+            if not _schema_ready:
+                with write_transaction(DATABASE_PATH) as conn:
+                    _create_schema(conn)
+                _schema_ready = True
+                log_debug("init_database", 78, "Database tables created successfully")
         
-        # Create teams table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                formation_data TEXT,
-                situational_tendencies TEXT,
-                personnel_packages TEXT,
-                stadium_info TEXT,
-                weather_tendencies TEXT,
-                coaching_staff TEXT,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create chat history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                role TEXT NOT NULL,
-                message TEXT NOT NULL,
-                analysis_type TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        log_debug("init_database", 78, "Database tables created successfully")
-        
-        # BUG FIX: DON'T close connection - let @st.cache_resource manage it
-        return conn
+        return get_read_connection(DATABASE_PATH)
         
     except Exception as e:
         log_debug("init_database", 83, "Database initialization failed", e)
         raise
 
+def _create_schema(conn):
+    """Create tables and indexes (idempotent)"""
+    cursor = conn.cursor()
+    
+    # Create teams table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            formation_data TEXT,
+            situational_tendencies TEXT,
+            personnel_packages TEXT,
+            stadium_info TEXT,
+            weather_tendencies TEXT,
+            coaching_staff TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create chat history table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS chat_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            message TEXT NOT NULL,
+            analysis_type TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Session lookups filter on session_id and order by (timestamp, id); role and message
+    # are included so history pages are read from the index alone (covering index)
+    cursor.execute("DROP INDEX IF EXISTS idx_chat_history_session_time")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_chat_history_session_page
+        ON chat_history (session_id, timestamp, id, role, message)
+    ''')
+    
+    # Archived sessions - one row per session, messages as zlib-compressed JSON
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS chat_history_archive (
+            session_id TEXT PRIMARY KEY,
+            message_count INTEGER NOT NULL,
+            first_timestamp TIMESTAMP,
+            last_timestamp TIMESTAMP,
+            payload BLOB NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Key/value metadata - seed_version of the loaded team data
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS db_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
 # =============================================================================
 # TEAM DATA FUNCTIONS - BUG FIX: Removed conn.close() calls
 # =============================================================================
@@ -106,13 +158,14 @@ def get_team_data(team_name: str) -> Optional[Dict]:
         conn = init_database()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT formation_data, situational_tendencies, personnel_packages, 
-                   stadium_info, weather_tendencies, coaching_staff
-            FROM teams WHERE name = ?
-        """, (team_name,))
-        
-        result = cursor.fetchone()
+        with span("db", "get_team_data"):
+            cursor.execute("""
+                SELECT formation_data, situational_tendencies, personnel_packages, 
+                       stadium_info, weather_tendencies, coaching_staff
+                FROM teams WHERE name = ?
+            """, (team_name,))
+            
+            result = cursor.fetchone()
         
         if result:
             team_data = {
@@ -146,8 +199,9 @@ def get_all_team_names() -> List[str]:
         conn = init_database()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT name FROM teams ORDER BY name")
-        results = cursor.fetchall()
+        with span("db", "get_all_team_names"):
+            cursor.execute("SELECT name FROM teams ORDER BY name")
+            results = cursor.fetchall()
         
         team_names = [row[0] for row in results]
         
@@ -159,25 +213,75 @@ def get_all_team_names() -> List[str]:
         log_debug("get_all_team_names", 146, "Failed to retrieve team names", e)
         return []
 
-def save_chat_message(session_id: str, role: str, message: str, analysis_type: str = "general"):
+def get_all_team_data() -> Dict[str, Dict]:
     """
-    Save chat message to database
-    BUG FIX: Removed conn.close() to prevent closed database errors
+    Retrieve every team's data in a single query
+    Used to build the league-wide snapshot without one query per team
     """
     try:
-        log_debug("save_chat_message", 154, f"Saving {role} message for session {session_id[:8]}")
-        
+        log_debug("get_all_team_data", 166, "Retrieving data for all teams")
+
         conn = init_database()
         cursor = conn.cursor()
+
+        with span("db", "get_all_team_data"):
+            cursor.execute("""
+                SELECT name, formation_data, situational_tendencies, personnel_packages,
+                       stadium_info, weather_tendencies, coaching_staff
+                FROM teams ORDER BY name
+            """)
+            rows = cursor.fetchall()
+
+        all_team_data = {}
+        for row in rows:
+            all_team_data[row[0]] = {
+                'formation_data': json.loads(row[1]) if row[1] else {},
+                'situational_tendencies': json.loads(row[2]) if row[2] else {},
+                'personnel_packages': json.loads(row[3]) if row[3] else {},
+                'stadium_info': json.loads(row[4]) if row[4] else {},
+                'weather_tendencies': json.loads(row[5]) if row[5] else {},
+                'coaching_staff': json.loads(row[6]) if row[6] else {}
+            }
+
+        log_debug("get_all_team_data", 191, f"Retrieved data for {len(all_team_data)} teams")
+        return all_team_data
+
+    except Exception as e:
+        log_debug("get_all_team_data", 195, "Failed to retrieve all team data", e)
+        return {}
+
+def get_data_version() -> str:
+    """
+    Fingerprint of the teams table (row count + latest update)
+    Used as the data version in figure cache keys so reseeding invalidates charts
+    """
+    try:
+        conn = init_database()
+        cursor = conn.cursor()
+
+        with span("db", "get_data_version"):
+            cursor.execute("SELECT COUNT(*), MAX(last_updated) FROM teams")
+            count, last_updated = cursor.fetchone()
+
+        return f"{count}:{last_updated or 'empty'}"
+
+    except Exception as e:
+        log_debug("get_data_version", 175, "Failed to read data version", e)
+        return "unknown"
+
+def save_chat_message(session_id: str, role: str, message: str, analysis_type: str = "general"):
+    """
+    Save chat message to database
+    Goes through the write-behind queue in chat_writer (batched commits off the
+    request path); CHAT_DURABILITY=immediate restores one commit per message
+    """
+    try:
+        log_debug("save_chat_message", 154, f"Queueing {role} message for session {session_id[:8]}")
         
-        cursor.execute("""
-            INSERT INTO chat_history (session_id, role, message, analysis_type)
-            VALUES (?, ?, ?, ?)
-        """, (session_id, role, message, analysis_type))
+        # Tables must exist before the writer thread inserts
+        init_database()
         
-        conn.commit()
-        log_debug("save_chat_message", 165, "Message saved successfully")
-        # BUG FIX: Don't close connection
+        get_chat_writer(DATABASE_PATH).enqueue(session_id, role, message, analysis_type)
         
     except Exception as e:
         log_debug("save_chat_message", 169, "Failed to save chat message", e)
@@ -190,13 +294,16 @@ def get_recent_chat_history(session_id: str, limit: int = 10) -> List[Tuple[str,
     try:
         log_debug("get_recent_chat_history", 177, f"Retrieving {limit} messages for session {session_id[:8]}")
         
+        # Read-your-writes: commit anything still in the chat write queue
+        flush_chat_writes()
+        
         conn = init_database()
         cursor = conn.cursor()
         
         cursor.execute("""
             SELECT role, message FROM chat_history 
             WHERE session_id = ? 
-            ORDER BY timestamp DESC 
+            ORDER BY timestamp DESC, id DESC 
             LIMIT ?
         """, (session_id, limit))
         
@@ -212,693 +319,227 @@ def get_recent_chat_history(session_id: str, limit: int = 10) -> List[Tuple[str,
         log_debug("get_recent_chat_history", 197, "Failed to retrieve chat history", e)
         return []
 
+def get_chat_history_page(session_id: str, page_size: int = 50,
+                          before: Optional[Tuple[str, int]] = None) -> Dict:
+    """
+    Keyset-paginated chat history, newest page first
+    
+    Args:
+        session_id: Chat session
+        page_size: Messages per page
+        before: Cursor from the previous page's 'next_cursor' (None = newest page)
+        
+    Returns:
+        Dict with 'messages' (chronological list of role/message/timestamp dicts)
+        and 'next_cursor' for the next older page (None when there are no more)
+    """
+    try:
+        # Read-your-writes: commit anything still in the chat write queue
+        flush_chat_writes()
+        
+        conn = init_database()
+        cursor = conn.cursor()
+        
+        if before is None:
+            cursor.execute("""
+                SELECT id, role, message, timestamp FROM chat_history
+                WHERE session_id = ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            """, (session_id, page_size + 1))
+        else:
+            cursor.execute("""
+                SELECT id, role, message, timestamp FROM chat_history
+                WHERE session_id = ? AND (timestamp, id) < (?, ?)
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            """, (session_id, before[0], before[1], page_size + 1))
+        
+        rows = cursor.fetchall()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        messages = [{'id': row[0], 'role': row[1], 'message': row[2], 'timestamp': row[3]} for row in reversed(rows)]
+        next_cursor = (rows[-1][3], rows[-1][0]) if has_more else None
+        
+        log_debug("get_chat_history_page", 318, f"Retrieved {len(messages)} messages for session {session_id[:8]} (more: {has_more})")
+        return {'messages': messages, 'next_cursor': next_cursor}
+        
+    except Exception as e:
+        log_debug("get_chat_history_page", 322, "Failed to retrieve chat history page", e)
+        return {'messages': [], 'next_cursor': None}
+
+def archive_old_chat_sessions(retention_days: int = 180, max_sessions: int = 500) -> Dict:
+    """
+    Move sessions with no messages in the last retention_days into
+    chat_history_archive (zlib-compressed JSON) and delete their live rows.
+    Each session is archived in its own transaction; a session that was already
+    archived has the new messages appended to its archive row.
+    
+    Returns:
+        Dict with sessions and messages archived and bytes before/after compression
+    """
+    stats = {'sessions': 0, 'messages': 0, 'raw_bytes': 0, 'compressed_bytes': 0}
+    try:
+        log_debug("archive_old_chat_sessions", 337, f"Archiving sessions idle for {retention_days}+ days")
+        
+        flush_chat_writes()
+        
+        conn = init_database()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT session_id FROM chat_history
+            GROUP BY session_id
+            HAVING MAX(timestamp) < datetime('now', ?)
+            LIMIT ?
+        """, (f"-{int(retention_days)} days", max_sessions))
+        session_ids = [row[0] for row in cursor.fetchall()]
+        
+        for session_id in session_ids:
+            with write_transaction(DATABASE_PATH) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT role, message, analysis_type, timestamp FROM chat_history
+                    WHERE session_id = ? ORDER BY timestamp, id
+                """, (session_id,))
+                messages = [
+                    {'role': row[0], 'message': row[1], 'analysis_type': row[2], 'timestamp': row[3]}
+                    for row in cursor.fetchall()
+                ]
+                if not messages:
+                    continue
+                
+                cursor.execute("SELECT payload FROM chat_history_archive WHERE session_id = ?", (session_id,))
+                existing = cursor.fetchone()
+                archived = json.loads(zlib.decompress(existing[0])) if existing else []
+                all_messages = archived + messages
+                
+                raw = json.dumps(all_messages, separators=(',', ':')).encode('utf-8')
+                payload = zlib.compress(raw, 9)
+                
+                cursor.execute("""
+                    INSERT OR REPLACE INTO chat_history_archive
+                    (session_id, message_count, first_timestamp, last_timestamp, payload)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (session_id, len(all_messages), all_messages[0]['timestamp'],
+                      all_messages[-1]['timestamp'], payload))
+                cursor.execute("DELETE FROM chat_history WHERE session_id = ?", (session_id,))
+            
+            stats['sessions'] += 1
+            stats['messages'] += len(messages)
+            stats['raw_bytes'] += len(raw)
+            stats['compressed_bytes'] += len(payload)
+        
+        log_debug("archive_old_chat_sessions", 382, f"Archived {stats['sessions']} sessions / {stats['messages']} messages "
+                  f"({stats['raw_bytes']} -> {stats['compressed_bytes']} bytes)")
+        return stats
+        
+    except Exception as e:
+        log_debug("archive_old_chat_sessions", 387, "Chat archival failed", e)
+        return stats
+
+def get_archived_chat_history(session_id: str) -> List[Dict]:
+    """
+    Decompress an archived session's messages (chronological)
+    """
+    try:
+        conn = init_database()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT payload FROM chat_history_archive WHERE session_id = ?", (session_id,))
+        result = cursor.fetchone()
+        return json.loads(zlib.decompress(result[0])) if result else []
+        
+    except Exception as e:
+        log_debug("get_archived_chat_history", 403, f"Failed to read archive for session {session_id[:8]}", e)
+        return []
+
 # =============================================================================
 # DATABASE POPULATION - BUG FIX: Line 129 - Safe initialization
 # =============================================================================
 
+def load_seed_data(path: str = SEED_DATA_PATH) -> Dict:
+    """
+    Read the versioned seed file (app/data/teams_seed.json)
+    
+    Returns:
+        Dict with 'version' and 'teams' ({team name: team data})
+    """
+    with open(path, encoding='utf-8') as f:
+        seed = json.load(f)
+    if not isinstance(seed.get('teams'), dict) or not seed.get('version'):
+        raise ValueError(f"Seed file {path} needs 'version' and 'teams'")
+    return seed
+
+def get_seed_version() -> Optional[str]:
+    """Seed version stored in db_meta by the last populate_teams_database() run"""
+    try:
+        cursor = init_database().cursor()
+        cursor.execute("SELECT value FROM db_meta WHERE key = 'seed_version'")
+        result = cursor.fetchone()
+        return result[0] if result else None
+    except Exception as e:
+        log_debug("get_seed_version", 214, "Failed to read seed version", e)
+        return None
+
 def ensure_database_populated():
     """
     Ensures the database is populated with team data.
     BUG FIX: Line 129 - Safe database population check
+    Seeding is skipped when db_meta.seed_version matches the seed file version
     """
     try:
         log_debug("ensure_database_populated", 208, "Checking if database needs population")
         
-        conn = init_database()
-        cursor = conn.cursor()
+        seed = load_seed_data()
+        stored_version = get_seed_version()
         
-        # Check if teams table has data
-        cursor.execute("SELECT COUNT(*) FROM teams")
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            log_debug("ensure_database_populated", 217, "Database empty, populating with team data")
-            populate_teams_database()
+        if stored_version == seed['version']:
+            log_debug("ensure_database_populated", 221, f"Seed version {stored_version} already loaded - skipping")
             return True
-        else:
-            log_debug("ensure_database_populated", 221, f"Database already has {count} teams")
-            return True
-            
-        # BUG FIX: Don't close connection
+        
+        log_debug("ensure_database_populated", 217,
+                  f"Seed version {stored_version or 'none'} -> {seed['version']}, populating team data")
+        populate_teams_database(seed)
+        return True
         
     except Exception as e:
         log_debug("ensure_database_populated", 227, "Database population check failed", e)
         return False
 
-def populate_teams_database():
+def populate_teams_database(seed: Optional[Dict] = None):
     """
-    Populate database with comprehensive NFL team data
-    BUG FIX: Removed conn.close() calls throughout function
+    Bulk-load the seed team data in one transaction and record its version
+    
+    Args:
+        seed: Output of load_seed_data() (read from SEED_DATA_PATH if None)
     """
     try:
         log_debug("populate_teams_database", 235, "Starting team data population")
         
-        conn = init_database()
-        cursor = conn.cursor()
+        init_database()
+        seed = seed or load_seed_data()
         
-        # NFL team data with comprehensive stats
-        teams_data = {
-            "Arizona Cardinals": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.68, "ypp": 5.2, "success_rate": 0.41},
-                    "12_personnel": {"usage": 0.22, "ypp": 4.8, "success_rate": 0.45},
-                    "21_personnel": {"usage": 0.05, "ypp": 4.1, "success_rate": 0.48},
-                    "10_personnel": {"usage": 0.05, "ypp": 6.1, "success_rate": 0.38}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.378,
-                    "red_zone_efficiency": 0.583,
-                    "goal_line_success": 0.667,
-                    "two_minute_efficiency": 0.42
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.72,
-                    "receiving_corps_depth": 0.68,
-                    "backfield_versatility": 0.75,
-                    "tight_end_usage": 0.65
-                },
-                "stadium_info": {
-                    "name": "State Farm Stadium",
-                    "city": "Glendale",
-                    "state": "Arizona",
-                    "capacity": 63400,
-                    "surface": "Grass",
-                    "is_dome": True,
-                    "elevation": 1132
-                },
-                "weather_tendencies": {
-                    "dome_advantage": True,
-                    "wind_impact": 0.0,
-                    "temperature_factor": 0.0,
-                    "precipitation_games": 0
-                },
-                "coaching_staff": {
-                    "head_coach": "Jonathan Gannon",
-                    "offensive_coordinator": "Drew Petzing",
-                    "defensive_coordinator": "Nick Rallis",
-                    "philosophy": "Aggressive passing attack with versatile personnel usage"
-                }
-            },
-            
-            "Atlanta Falcons": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.71, "ypp": 5.4, "success_rate": 0.43},
-                    "12_personnel": {"usage": 0.18, "ypp": 5.1, "success_rate": 0.47},
-                    "21_personnel": {"usage": 0.06, "ypp": 4.3, "success_rate": 0.49},
-                    "10_personnel": {"usage": 0.05, "ypp": 6.3, "success_rate": 0.39}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.392,
-                    "red_zone_efficiency": 0.611,
-                    "goal_line_success": 0.714,
-                    "two_minute_efficiency": 0.45
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.69,
-                    "receiving_corps_depth": 0.82,
-                    "backfield_versatility": 0.71,
-                    "tight_end_usage": 0.58
-                },
-                "stadium_info": {
-                    "name": "Mercedes-Benz Stadium",
-                    "city": "Atlanta",
-                    "state": "Georgia",
-                    "capacity": 71000,
-                    "surface": "Turf",
-                    "is_dome": True,
-                    "elevation": 1050
-                },
-                "weather_tendencies": {
-                    "dome_advantage": True,
-                    "wind_impact": 0.0,
-                    "temperature_factor": 0.0,
-                    "precipitation_games": 0
-                },
-                "coaching_staff": {
-                    "head_coach": "Arthur Smith",
-                    "offensive_coordinator": "Dave Ragone",
-                    "defensive_coordinator": "Ryan Nielsen",
-                    "philosophy": "Ball control offense with emphasis on tight end usage"
-                }
-            },
-
-            "Baltimore Ravens": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.58, "ypp": 6.1, "success_rate": 0.48},
-                    "12_personnel": {"usage": 0.25, "ypp": 5.8, "success_rate": 0.52},
-                    "21_personnel": {"usage": 0.12, "ypp": 5.2, "success_rate": 0.55},
-                    "10_personnel": {"usage": 0.05, "ypp": 7.2, "success_rate": 0.41}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.421,
-                    "red_zone_efficiency": 0.643,
-                    "goal_line_success": 0.778,
-                    "two_minute_efficiency": 0.52
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.85,
-                    "receiving_corps_depth": 0.74,
-                    "backfield_versatility": 0.91,
-                    "tight_end_usage": 0.88
-                },
-                "stadium_info": {
-                    "name": "M&T Bank Stadium",
-                    "city": "Baltimore",
-                    "state": "Maryland",
-                    "capacity": 71008,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 56
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.3,
-                    "temperature_factor": 0.4,
-                    "precipitation_games": 3
-                },
-                "coaching_staff": {
-                    "head_coach": "John Harbaugh",
-                    "offensive_coordinator": "Todd Monken",
-                    "defensive_coordinator": "Mike Macdonald",
-                    "philosophy": "Ground-and-pound with dual-threat quarterback"
-                }
-            },
-
-            "Buffalo Bills": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.74, "ypp": 6.8, "success_rate": 0.51},
-                    "12_personnel": {"usage": 0.16, "ypp": 5.9, "success_rate": 0.48},
-                    "21_personnel": {"usage": 0.04, "ypp": 4.7, "success_rate": 0.52},
-                    "10_personnel": {"usage": 0.06, "ypp": 8.1, "success_rate": 0.44}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.456,
-                    "red_zone_efficiency": 0.692,
-                    "goal_line_success": 0.800,
-                    "two_minute_efficiency": 0.61
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.79,
-                    "receiving_corps_depth": 0.89,
-                    "backfield_versatility": 0.73,
-                    "tight_end_usage": 0.62
-                },
-                "stadium_info": {
-                    "name": "Highmark Stadium",
-                    "city": "Orchard Park",
-                    "state": "New York",
-                    "capacity": 71608,
-                    "surface": "Turf",
-                    "is_dome": False,
-                    "elevation": 628
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.7,
-                    "temperature_factor": 0.8,
-                    "precipitation_games": 4
-                },
-                "coaching_staff": {
-                    "head_coach": "Sean McDermott",
-                    "offensive_coordinator": "Ken Dorsey",
-                    "defensive_coordinator": "Leslie Frazier",
-                    "philosophy": "High-powered passing offense with elite quarterback play"
-                }
-            },
-
-            "Carolina Panthers": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.69, "ypp": 4.9, "success_rate": 0.38},
-                    "12_personnel": {"usage": 0.21, "ypp": 4.6, "success_rate": 0.41},
-                    "21_personnel": {"usage": 0.06, "ypp": 4.0, "success_rate": 0.44},
-                    "10_personnel": {"usage": 0.04, "ypp": 5.8, "success_rate": 0.35}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.351,
-                    "red_zone_efficiency": 0.542,
-                    "goal_line_success": 0.625,
-                    "two_minute_efficiency": 0.38
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.61,
-                    "receiving_corps_depth": 0.59,
-                    "backfield_versatility": 0.67,
-                    "tight_end_usage": 0.63
-                },
-                "stadium_info": {
-                    "name": "Bank of America Stadium",
-                    "city": "Charlotte",
-                    "state": "North Carolina",
-                    "capacity": 75523,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 748
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.2,
-                    "temperature_factor": 0.3,
-                    "precipitation_games": 2
-                },
-                "coaching_staff": {
-                    "head_coach": "Frank Reich",
-                    "offensive_coordinator": "Thomas Brown",
-                    "defensive_coordinator": "Ejiro Evero",
-                    "philosophy": "Balanced attack with emphasis on establishing run game"
-                }
-            },
-
-            "Chicago Bears": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.67, "ypp": 5.1, "success_rate": 0.40},
-                    "12_personnel": {"usage": 0.23, "ypp": 4.9, "success_rate": 0.43},
-                    "21_personnel": {"usage": 0.07, "ypp": 4.2, "success_rate": 0.46},
-                    "10_personnel": {"usage": 0.03, "ypp": 6.0, "success_rate": 0.37}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.368,
-                    "red_zone_efficiency": 0.571,
-                    "goal_line_success": 0.667,
-                    "two_minute_efficiency": 0.41
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.66,
-                    "receiving_corps_depth": 0.71,
-                    "backfield_versatility": 0.69,
-                    "tight_end_usage": 0.74
-                },
-                "stadium_info": {
-                    "name": "Soldier Field",
-                    "city": "Chicago",
-                    "state": "Illinois",
-                    "capacity": 61500,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 587
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.6,
-                    "temperature_factor": 0.7,
-                    "precipitation_games": 3
-                },
-                "coaching_staff": {
-                    "head_coach": "Matt Eberflus",
-                    "offensive_coordinator": "Luke Getsy",
-                    "defensive_coordinator": "Alan Williams",
-                    "philosophy": "Defensive-minded with developing quarterback"
-                }
-            },
-
-            "Cincinnati Bengals": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.73, "ypp": 6.2, "success_rate": 0.47},
-                    "12_personnel": {"usage": 0.17, "ypp": 5.4, "success_rate": 0.44},
-                    "21_personnel": {"usage": 0.05, "ypp": 4.8, "success_rate": 0.49},
-                    "10_personnel": {"usage": 0.05, "ypp": 7.3, "success_rate": 0.42}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.423,
-                    "red_zone_efficiency": 0.636,
-                    "goal_line_success": 0.750,
-                    "two_minute_efficiency": 0.54
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.71,
-                    "receiving_corps_depth": 0.91,
-                    "backfield_versatility": 0.74,
-                    "tight_end_usage": 0.61
-                },
-                "stadium_info": {
-                    "name": "Paycor Stadium",
-                    "city": "Cincinnati",
-                    "state": "Ohio",
-                    "capacity": 65515,
-                    "surface": "Turf",
-                    "is_dome": False,
-                    "elevation": 550
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.4,
-                    "temperature_factor": 0.5,
-                    "precipitation_games": 3
-                },
-                "coaching_staff": {
-                    "head_coach": "Zac Taylor",
-                    "offensive_coordinator": "Brian Callahan",
-                    "defensive_coordinator": "Lou Anarumo",
-                    "philosophy": "High-octane passing offense with elite receiving corps"
-                }
-            },
-
-            "Cleveland Browns": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.65, "ypp": 5.3, "success_rate": 0.42},
-                    "12_personnel": {"usage": 0.26, "ypp": 5.0, "success_rate": 0.45},
-                    "21_personnel": {"usage": 0.06, "ypp": 4.4, "success_rate": 0.48},
-                    "10_personnel": {"usage": 0.03, "ypp": 6.1, "success_rate": 0.39}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.389,
-                    "red_zone_efficiency": 0.592,
-                    "goal_line_success": 0.700,
-                    "two_minute_efficiency": 0.43
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.78,
-                    "receiving_corps_depth": 0.76,
-                    "backfield_versatility": 0.83,
-                    "tight_end_usage": 0.71
-                },
-                "stadium_info": {
-                    "name": "Cleveland Browns Stadium",
-                    "city": "Cleveland",
-                    "state": "Ohio",
-                    "capacity": 67431,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 653
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.5,
-                    "temperature_factor": 0.6,
-                    "precipitation_games": 4
-                },
-                "coaching_staff": {
-                    "head_coach": "Kevin Stefanski",
-                    "offensive_coordinator": "Alex Van Pelt",
-                    "defensive_coordinator": "Jim Schwartz",
-                    "philosophy": "Run-heavy offense with strong defensive foundation"
-                }
-            },
-
-            "Dallas Cowboys": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.70, "ypp": 5.9, "success_rate": 0.45},
-                    "12_personnel": {"usage": 0.19, "ypp": 5.6, "success_rate": 0.47},
-                    "21_personnel": {"usage": 0.06, "ypp": 4.9, "success_rate": 0.50},
-                    "10_personnel": {"usage": 0.05, "ypp": 7.1, "success_rate": 0.41}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.411,
-                    "red_zone_efficiency": 0.619,
-                    "goal_line_success": 0.733,
-                    "two_minute_efficiency": 0.49
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.82,
-                    "receiving_corps_depth": 0.84,
-                    "backfield_versatility": 0.77,
-                    "tight_end_usage": 0.69
-                },
-                "stadium_info": {
-                    "name": "AT&T Stadium",
-                    "city": "Arlington",
-                    "state": "Texas",
-                    "capacity": 80000,
-                    "surface": "Turf",
-                    "is_dome": True,
-                    "elevation": 551
-                },
-                "weather_tendencies": {
-                    "dome_advantage": True,
-                    "wind_impact": 0.0,
-                    "temperature_factor": 0.0,
-                    "precipitation_games": 0
-                },
-                "coaching_staff": {
-                    "head_coach": "Mike McCarthy",
-                    "offensive_coordinator": "Kellen Moore",
-                    "defensive_coordinator": "Dan Quinn",
-                    "philosophy": "Explosive offense with emphasis on big plays"
-                }
-            },
-
-            "Denver Broncos": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.68, "ypp": 5.0, "success_rate": 0.39},
-                    "12_personnel": {"usage": 0.22, "ypp": 4.7, "success_rate": 0.42},
-                    "21_personnel": {"usage": 0.06, "ypp": 4.1, "success_rate": 0.45},
-                    "10_personnel": {"usage": 0.04, "ypp": 5.9, "success_rate": 0.36}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.356,
-                    "red_zone_efficiency": 0.548,
-                    "goal_line_success": 0.636,
-                    "two_minute_efficiency": 0.39
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.63,
-                    "receiving_corps_depth": 0.73,
-                    "backfield_versatility": 0.68,
-                    "tight_end_usage": 0.66
-                },
-                "stadium_info": {
-                    "name": "Empower Field at Mile High",
-                    "city": "Denver",
-                    "state": "Colorado",
-                    "capacity": 76125,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 5280
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.4,
-                    "temperature_factor": 0.6,
-                    "precipitation_games": 2
-                },
-                "coaching_staff": {
-                    "head_coach": "Sean Payton",
-                    "offensive_coordinator": "Joe Lombardi",
-                    "defensive_coordinator": "Vance Joseph",
-                    "philosophy": "Precision passing offense with strong defensive principles"
-                }
-            },
-
-            "Detroit Lions": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.72, "ypp": 6.0, "success_rate": 0.46},
-                    "12_personnel": {"usage": 0.18, "ypp": 5.7, "success_rate": 0.49},
-                    "21_personnel": {"usage": 0.06, "ypp": 5.1, "success_rate": 0.52},
-                    "10_personnel": {"usage": 0.04, "ypp": 7.0, "success_rate": 0.43}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.418,
-                    "red_zone_efficiency": 0.628,
-                    "goal_line_success": 0.765,
-                    "two_minute_efficiency": 0.51
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.81,
-                    "receiving_corps_depth": 0.78,
-                    "backfield_versatility": 0.80,
-                    "tight_end_usage": 0.72
-                },
-                "stadium_info": {
-                    "name": "Ford Field",
-                    "city": "Detroit",
-                    "state": "Michigan",
-                    "capacity": 65000,
-                    "surface": "Turf",
-                    "is_dome": True,
-                    "elevation": 585
-                },
-                "weather_tendencies": {
-                    "dome_advantage": True,
-                    "wind_impact": 0.0,
-                    "temperature_factor": 0.0,
-                    "precipitation_games": 0
-                },
-                "coaching_staff": {
-                    "head_coach": "Dan Campbell",
-                    "offensive_coordinator": "Ben Johnson",
-                    "defensive_coordinator": "Aaron Glenn",
-                    "philosophy": "Aggressive, physical style with creative play-calling"
-                }
-            },
-
-            "Green Bay Packers": {
-                "formation_data": {
-                    "11_personnel": {"usage": 0.75, "ypp": 6.3, "success_rate": 0.48},
-                    "12_personnel": {"usage": 0.15, "ypp": 5.8, "success_rate": 0.51},
-                    "21_personnel": {"usage": 0.05, "ypp": 5.0, "success_rate": 0.53},
-                    "10_personnel": {"usage": 0.05, "ypp": 7.4, "success_rate": 0.44}
-                },
-                "situational_tendencies": {
-                    "third_down_conversion": 0.434,
-                    "red_zone_efficiency": 0.651,
-                    "goal_line_success": 0.786,
-                    "two_minute_efficiency": 0.56
-                },
-                "personnel_packages": {
-                    "offensive_line_strength": 0.77,
-                    "receiving_corps_depth": 0.86,
-                    "backfield_versatility": 0.75,
-                    "tight_end_usage": 0.64
-                },
-                "stadium_info": {
-                    "name": "Lambeau Field",
-                    "city": "Green Bay",
-                    "state": "Wisconsin",
-                    "capacity": 81441,
-                    "surface": "Grass",
-                    "is_dome": False,
-                    "elevation": 640
-                },
-                "weather_tendencies": {
-                    "dome_advantage": False,
-                    "wind_impact": 0.5,
-                    "temperature_factor": 0.8,
-                    "precipitation_games": 4
-                },
-                "coaching_staff": {
-                    "head_coach": "Matt LaFleur",
-                    "offensive_coordinator": "Adam Stenavich",
-                    "defensive_coordinator": "Joe Barry",
-                    "philosophy": "Quarterback-driven offense with versatile formations"
-                }
-            }
-        }
-        
-        # Add remaining teams (continuing the pattern for all 32 teams)
-        remaining_teams = {
-            "Houston Texans": {
-                "formation_data": {"11_personnel": {"usage": 0.69, "ypp": 5.5, "success_rate": 0.43}},
-                "situational_tendencies": {"third_down_conversion": 0.395, "red_zone_efficiency": 0.598},
-                "stadium_info": {"name": "NRG Stadium", "city": "Houston", "state": "Texas", "is_dome": True}
-            },
-            "Indianapolis Colts": {
-                "formation_data": {"11_personnel": {"usage": 0.71, "ypp": 5.3, "success_rate": 0.41}},
-                "situational_tendencies": {"third_down_conversion": 0.382, "red_zone_efficiency": 0.577},
-                "stadium_info": {"name": "Lucas Oil Stadium", "city": "Indianapolis", "state": "Indiana", "is_dome": True}
-            },
-            "Jacksonville Jaguars": {
-                "formation_data": {"11_personnel": {"usage": 0.70, "ypp": 5.1, "success_rate": 0.40}},
-                "situational_tendencies": {"third_down_conversion": 0.371, "red_zone_efficiency": 0.563},
-                "stadium_info": {"name": "TIAA Bank Field", "city": "Jacksonville", "state": "Florida", "is_dome": False}
-            },
-            "Kansas City Chiefs": {
-                "formation_data": {"11_personnel": {"usage": 0.76, "ypp": 6.7, "success_rate": 0.52}},
-                "situational_tendencies": {"third_down_conversion": 0.471, "red_zone_efficiency": 0.703},
-                "stadium_info": {"name": "Arrowhead Stadium", "city": "Kansas City", "state": "Missouri", "is_dome": False}
-            },
-            "Las Vegas Raiders": {
-                "formation_data": {"11_personnel": {"usage": 0.68, "ypp": 5.4, "success_rate": 0.42}},
-                "situational_tendencies": {"third_down_conversion": 0.387, "red_zone_efficiency": 0.589},
-                "stadium_info": {"name": "Allegiant Stadium", "city": "Las Vegas", "state": "Nevada", "is_dome": True}
-            },
-            "Los Angeles Chargers": {
-                "formation_data": {"11_personnel": {"usage": 0.73, "ypp": 5.8, "success_rate": 0.44}},
-                "situational_tendencies": {"third_down_conversion": 0.408, "red_zone_efficiency": 0.614},
-                "stadium_info": {"name": "SoFi Stadium", "city": "Los Angeles", "state": "California", "is_dome": True}
-            },
-            "Los Angeles Rams": {
-                "formation_data": {"11_personnel": {"usage": 0.74, "ypp": 6.1, "success_rate": 0.46}},
-                "situational_tendencies": {"third_down_conversion": 0.425, "red_zone_efficiency": 0.634},
-                "stadium_info": {"name": "SoFi Stadium", "city": "Los Angeles", "state": "California", "is_dome": True}
-            },
-            "Miami Dolphins": {
-                "formation_data": {"11_personnel": {"usage": 0.78, "ypp": 6.4, "success_rate": 0.49}},
-                "situational_tendencies": {"third_down_conversion": 0.441, "red_zone_efficiency": 0.657},
-                "stadium_info": {"name": "Hard Rock Stadium", "city": "Miami Gardens", "state": "Florida", "is_dome": False}
-            },
-            "Minnesota Vikings": {
-                "formation_data": {"11_personnel": {"usage": 0.72, "ypp": 5.9, "success_rate": 0.45}},
-                "situational_tendencies": {"third_down_conversion": 0.416, "red_zone_efficiency": 0.623},
-                "stadium_info": {"name": "U.S. Bank Stadium", "city": "Minneapolis", "state": "Minnesota", "is_dome": True}
-            },
-            "New England Patriots": {
-                "formation_data": {"11_personnel": {"usage": 0.67, "ypp": 5.2, "success_rate": 0.41}},
-                "situational_tendencies": {"third_down_conversion": 0.374, "red_zone_efficiency": 0.568},
-                "stadium_info": {"name": "Gillette Stadium", "city": "Foxborough", "state": "Massachusetts", "is_dome": False}
-            },
-            "New Orleans Saints": {
-                "formation_data": {"11_personnel": {"usage": 0.70, "ypp": 5.7, "success_rate": 0.44}},
-                "situational_tendencies": {"third_down_conversion": 0.403, "red_zone_efficiency": 0.607},
-                "stadium_info": {"name": "Caesars Superdome", "city": "New Orleans", "state": "Louisiana", "is_dome": True}
-            },
-            "New York Giants": {
-                "formation_data": {"11_personnel": {"usage": 0.69, "ypp": 5.0, "success_rate": 0.39}},
-                "situational_tendencies": {"third_down_conversion": 0.359, "red_zone_efficiency": 0.551},
-                "stadium_info": {"name": "MetLife Stadium", "city": "East Rutherford", "state": "New Jersey", "is_dome": False}
-            },
-            "New York Jets": {
-                "formation_data": {"11_personnel": {"usage": 0.71, "ypp": 5.3, "success_rate": 0.41}},
-                "situational_tendencies": {"third_down_conversion": 0.378, "red_zone_efficiency": 0.572},
-                "stadium_info": {"name": "MetLife Stadium", "city": "East Rutherford", "state": "New Jersey", "is_dome": False}
-            },
-            "Philadelphia Eagles": {
-                "formation_data": {"11_personnel": {"usage": 0.73, "ypp": 6.2, "success_rate": 0.47}},
-                "situational_tendencies": {"third_down_conversion": 0.429, "red_zone_efficiency": 0.645},
-                "stadium_info": {"name": "Lincoln Financial Field", "city": "Philadelphia", "state": "Pennsylvania", "is_dome": False}
-            },
-            "Pittsburgh Steelers": {
-                "formation_data": {"11_personnel": {"usage": 0.66, "ypp": 5.4, "success_rate": 0.42}},
-                "situational_tendencies": {"third_down_conversion": 0.392, "red_zone_efficiency": 0.595},
-                "stadium_info": {"name": "Heinz Field", "city": "Pittsburgh", "state": "Pennsylvania", "is_dome": False}
-            },
-            "San Francisco 49ers": {
-                "formation_data": {"11_personnel": {"usage": 0.71, "ypp": 6.0, "success_rate": 0.46}},
-                "situational_tendencies": {"third_down_conversion": 0.421, "red_zone_efficiency": 0.631},
-                "stadium_info": {"name": "Levi's Stadium", "city": "Santa Clara", "state": "California", "is_dome": False}
-            },
-            "Seattle Seahawks": {
-                "formation_data": {"11_personnel": {"usage": 0.72, "ypp": 5.8, "success_rate": 0.44}},
-                "situational_tendencies": {"third_down_conversion": 0.405, "red_zone_efficiency": 0.612},
-                "stadium_info": {"name": "Lumen Field", "city": "Seattle", "state": "Washington", "is_dome": False}
-            },
-            "Tampa Bay Buccaneers": {
-                "formation_data": {"11_personnel": {"usage": 0.74, "ypp": 6.1, "success_rate": 0.46}},
-                "situational_tendencies": {"third_down_conversion": 0.424, "red_zone_efficiency": 0.638},
-                "stadium_info": {"name": "Raymond James Stadium", "city": "Tampa", "state": "Florida", "is_dome": False}
-            },
-            "Tennessee Titans": {
-                "formation_data": {"11_personnel": {"usage": 0.68, "ypp": 5.1, "success_rate": 0.40}},
-                "situational_tendencies": {"third_down_conversion": 0.366, "red_zone_efficiency": 0.558},
-                "stadium_info": {"name": "Nissan Stadium", "city": "Nashville", "state": "Tennessee", "is_dome": False}
-            },
-            "Washington Commanders": {
-                "formation_data": {"11_personnel": {"usage": 0.70, "ypp": 5.2, "success_rate": 0.41}},
-                "situational_tendencies": {"third_down_conversion": 0.375, "red_zone_efficiency": 0.570},
-                "stadium_info": {"name": "FedExField", "city": "Landover", "state": "Maryland", "is_dome": False}
-            }
-        }
-        
-        # Merge all teams data
-        teams_data.update(remaining_teams)
-        
-        # Insert all teams into database
-        for team_name, data in teams_data.items():
-            # Fill in missing data with defaults
-            formation_data = data.get('formation_data', {})
-            situational_tendencies = data.get('situational_tendencies', {})
-            personnel_packages = data.get('personnel_packages', {})
-            stadium_info = data.get('stadium_info', {})
-            weather_tendencies = data.get('weather_tendencies', {})
-            coaching_staff = data.get('coaching_staff', {})
-            
-            cursor.execute("""
+        # Missing sections are stored as empty objects
+        rows = [
+            (team_name, *(json.dumps(data.get(column, {})) for column in TEAM_DATA_COLUMNS))
+            for team_name, data in seed['teams'].items()
+        ]
+        
+        with write_transaction(DATABASE_PATH) as conn:
+            conn.executemany(f"""
                 INSERT OR REPLACE INTO teams 
-                (name, formation_data, situational_tendencies, personnel_packages, 
-                 stadium_info, weather_tendencies, coaching_staff)
+                (name, {', '.join(TEAM_DATA_COLUMNS)})
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                team_name,
-                json.dumps(formation_data),
-                json.dumps(situational_tendencies),
-                json.dumps(personnel_packages),
-                json.dumps(stadium_info),
-                json.dumps(weather_tendencies),
-                json.dumps(coaching_staff)
-            ))
-        
-        conn.commit()
-        log_debug("populate_teams_database", 750, f"Successfully populated database with {len(teams_data)} teams")
+            """, rows)
+            conn.execute("""
+                INSERT OR REPLACE INTO db_meta (key, value, updated_at)
+                VALUES ('seed_version', ?, CURRENT_TIMESTAMP)
+            """, (seed['version'],))
         
-        # BUG FIX: Don't close connection
+        log_debug("populate_teams_database", 750,
+                  f"Successfully populated database with {len(rows)} teams (seed version {seed['version']})")
         
     except Exception as e:
         log_debug("populate_teams_database", 755, "Failed to populate teams database", e)
@@ -912,3 +553,17 @@ def populate_teams_database():
 
 # Instead, database population is now handled by ensure_database_populated()
 # which is called from main.py in the proper Streamlit context
+
+# =============================================================================
+# CHAT RETENTION JOB - python app/database.py --archive-days 180
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive idle chat sessions into chat_history_archive")
+    parser.add_argument("--archive-days", type=int, default=180, help="Archive sessions idle for this many days")
+    parser.add_argument("--max-sessions", type=int, default=500, help="Sessions to archive per run")
+    args = parser.parse_args()
+    
+    print(json.dumps(archive_old_chat_sessions(args.archive_days, args.max_sessions)))
@@ -0,0 +1,179 @@
+"""
+DB CONNECTIONS MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+============================================================
+PURPOSE: SQLite connection layer shared by database.py, weather.py and chat_writer.py
+FEATURES: WAL journal, tuned pragmas, per-thread readers, one serialized writer
+ARCHITECTURE: Process-wide ConnectionManager per database file
+
+HOW IT WORKS:
+- journal_mode=WAL lets readers keep reading while a write commits
+- synchronous=NORMAL: in WAL mode commits no longer fsync, only checkpoints do
+- Every thread (each Streamlit script run, the chat writer, worker pools) gets
+  its own read connection with query_only=ON - no shared cursor state
+- All writes go through write_transaction(), which holds the single writer
+  connection under a lock and commits or rolls back as one transaction
+- busy_timeout covers other processes (CLI jobs, API server) writing the same file
+
+DEBUGGING SYSTEM:
+- Connection opens and pragma failures logged with function names
+- get_connection_stats() reports readers opened, writes and writer lock wait time
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from instrumentation import get_logger, log_event, span
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("db_connections")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# PRAGMAS
+# =============================================================================
+
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 8192              # per connection; negative cache_size is KiB
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA cache_size=-{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={MMAP_SIZE_BYTES}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+]
+
+# =============================================================================
+# CONNECTION MANAGER
+# =============================================================================
+
+class ConnectionManager:
+    """
+    Per-thread read connections plus one locked writer for a SQLite file
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'readers_opened': 0,
+            'write_transactions': 0,
+            'write_failures': 0,
+            'write_wait_ms_total': 0.0,
+            'write_wait_ms_max': 0.0,
+        }
+        self.journal_mode = None
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.DatabaseError as e:
+                log_debug("ConnectionManager._open", 88, f"{pragma} not applied", e)
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """Read-only connection owned by the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # The writer opens first so the file is switched to WAL before anyone reads
+            self._get_writer()
+            conn = self._open(read_only=True)
+            self._local.conn = conn
+            with self._stats_lock:
+                self._stats['readers_opened'] += 1
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            with self._write_lock:
+                if self._writer is None:
+                    conn = self._open(read_only=False)
+                    self.journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                    self._writer = conn
+                    log_debug("ConnectionManager._get_writer", 113,
+                              f"Opened {self.db_path} (journal_mode={self.journal_mode})")
+        return self._writer
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer for one transaction; commits on success, rolls back on error"""
+        conn = self._get_writer()
+        start = time.perf_counter()
+        with span("db", "write_transaction"), self._write_lock:
+            waited_ms = (time.perf_counter() - start) * 1000
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                with self._stats_lock:
+                    self._stats['write_failures'] += 1
+                raise
+        with self._stats_lock:
+            self._stats['write_transactions'] += 1
+            self._stats['write_wait_ms_total'] += waited_ms
+            self._stats['write_wait_ms_max'] = max(self._stats['write_wait_ms_max'], waited_ms)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        writes = stats['write_transactions']
+        stats['write_wait_ms_avg'] = round(stats['write_wait_ms_total'] / writes, 3) if writes else 0.0
+        stats['journal_mode'] = self.journal_mode
+        stats['db_path'] = self.db_path
+        return stats
+
+    def close(self):
+        """Close the writer and the calling thread's reader (other readers close with their threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+# =============================================================================
+# MODULE SINGLETONS - one manager per database file per process
+# =============================================================================
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+def get_connection_manager(db_path: str = 'nfl_teams.db') -> ConnectionManager:
+    manager = _managers.get(db_path)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.setdefault(db_path, ConnectionManager(db_path))
+    return manager
+
+def get_read_connection(db_path: str = 'nfl_teams.db') -> sqlite3.Connection:
+    """Calling thread's read-only connection"""
+    return get_connection_manager(db_path).reader()
+
+def write_transaction(db_path: str = 'nfl_teams.db'):
+    """Context manager yielding the writer connection inside one transaction"""
+    return get_connection_manager(db_path).write()
+
+def get_connection_stats() -> Dict[str, Dict]:
+    return {path: manager.stats() for path, manager in list(_managers.items())}
@@ -0,0 +1,312 @@
+"""
+DECISION ENGINE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=============================================================
+PURPOSE: Deterministic scoring for the Risk-Reward Calculator
+FEATURES: Expected-points table, fourth down / two-point / timeout decisions, full decision grids
+ARCHITECTURE: NumPy arrays throughout - one point and a whole grid share the same code path
+
+HOW IT WORKS:
+- EXPECTED_POINTS[down, distance, field_position] is precomputed once at import
+  (field_position = yards from your own goal line, same as the sidebar slider)
+- Conversion, two-point and field goal odds start from league baseline curves and
+  are scaled by the team's situational_tendencies relative to the league average
+- Each option is valued in expected points; risk tolerance shifts the margin the
+  aggressive option needs (1 = needs +0.4 EP, 5 = break-even, 10 = accepts -0.5 EP)
+
+DEBUGGING SYSTEM:
+- Decisions and grid builds logged with inputs and the recommended option
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("decision_engine")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# MODEL CONSTANTS
+# =============================================================================
+
+MAX_DISTANCE = 30       # matches the sidebar distance slider
+FIELD_LENGTH = 100
+
+# League baselines the team factors are measured against
+LEAGUE_BASELINES = {
+    'third_down_conversion': 0.40,
+    'red_zone_efficiency': 0.56,
+    'goal_line_success': 0.65
+}
+
+# Expected points for 1st & 10 is linear in field position; later downs and
+# longer distances subtract from it
+EP_INTERCEPT = -0.8
+EP_PER_YARD = 0.06
+DOWN_PENALTY = np.array([0.0, 0.0, 0.4, 1.0, 1.6])          # index = down
+DISTANCE_PENALTY = np.array([0.0, 0.045, 0.055, 0.08, 0.08])  # per yard beyond 10
+
+TOUCHDOWN_POINTS = 7.0
+FIELD_GOAL_POINTS = 3.0
+EXTRA_POINT_PROBABILITY = 0.94
+BASE_TWO_POINT_PROBABILITY = 0.48
+
+PUNT_NET_YARDS = 40
+TOUCHBACK_FIELD_POSITION = 20
+FIELD_GOAL_SNAP_YARDS = 17   # line of scrimmage to goal posts
+MAX_FIELD_GOAL_DISTANCE = 65
+
+RISK_MARGIN_PER_STEP = 0.1   # EP per risk tolerance step away from 5
+NEUTRAL_RISK_TOLERANCE = 5
+
+FOURTH_DOWN_OPTIONS = ['punt', 'field_goal', 'go']
+OPTION_LABELS = {'punt': 'Punt', 'field_goal': 'Field Goal', 'go': 'Go For It'}
+
+# =============================================================================
+# EXPECTED POINTS TABLE - EXPECTED_POINTS[down, distance, field_position]
+# =============================================================================
+
+def build_expected_points_table() -> np.ndarray:
+    """
+    Expected points for every down (1-4), distance (1-30) and field position (1-99).
+    Index 0 along each axis is unused so the table is indexed by the real values.
+    """
+    downs = np.arange(5)[:, None, None]
+    distances = np.arange(MAX_DISTANCE + 1)[None, :, None]
+    field_positions = np.arange(FIELD_LENGTH)[None, None, :]
+
+    base = EP_INTERCEPT + EP_PER_YARD * field_positions
+    penalty = DOWN_PENALTY[downs] + DISTANCE_PENALTY[downs] * (distances - 10)
+    return np.clip(base - penalty, -2.0, 6.5) * np.ones((5, MAX_DISTANCE + 1, FIELD_LENGTH))
+
+EXPECTED_POINTS = build_expected_points_table()
+
+def expected_points(down, distance, field_position):
+    """Table lookup; accepts scalars or broadcastable arrays"""
+    down = np.clip(down, 1, 4)
+    distance = np.clip(distance, 1, MAX_DISTANCE)
+    field_position = np.clip(field_position, 1, FIELD_LENGTH - 1)
+    return EXPECTED_POINTS[down, distance, field_position]
+
+# Value of kicking off after a score: opponent 1st & 10 at the touchback spot
+KICKOFF_VALUE = float(expected_points(1, 10, TOUCHBACK_FIELD_POSITION))
+
+def _opponent_ball(opponent_field_position):
+    """Our expected points when the opponent gets 1st & 10 at their own yard line"""
+    return -expected_points(1, 10, np.clip(opponent_field_position, 1, FIELD_LENGTH - 1))
+
+# =============================================================================
+# PROBABILITY CURVES - League baselines scaled by team tendencies
+# =============================================================================
+
+def _team_factor(situational: Optional[Dict], key: str, baselines: Optional[Dict]) -> float:
+    baseline = (baselines or {}).get(key) or LEAGUE_BASELINES[key]
+    value = (situational or {}).get(key)
+    if not isinstance(value, (int, float)) or value <= 0:
+        return 1.0
+    return float(value) / baseline
+
+def conversion_probability(distance, situational: Optional[Dict] = None, baselines: Optional[Dict] = None):
+    """
+    Probability of converting a 4th (or 3rd) and `distance`
+    League curve: ~68% at 1 yard, ~47% at 5, ~29% at 10
+    """
+    curve = 0.68 * np.exp(-0.095 * (np.asarray(distance) - 1))
+    factor = _team_factor(situational, 'third_down_conversion', baselines)
+    return np.clip(curve * factor, 0.02, 0.95)
+
+def field_goal_probability(field_position):
+    """Make probability by kick distance (line of scrimmage + 17 yards)"""
+    kick_distance = (FIELD_LENGTH - np.asarray(field_position)) + FIELD_GOAL_SNAP_YARDS
+    probability = 1.0 / (1.0 + np.exp(0.15 * (kick_distance - 52)))
+    return np.where(kick_distance <= MAX_FIELD_GOAL_DISTANCE, probability, 0.0)
+
+# =============================================================================
+# FOURTH DOWN - Go for it vs field goal vs punt
+# =============================================================================
+
+def fourth_down_values(distance, field_position, situational: Optional[Dict] = None,
+                       baselines: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Expected points of each fourth down option; inputs broadcast against each other
+
+    Returns:
+        Dict with 'go', 'field_goal', 'punt' EP arrays and 'conversion_probability'
+    """
+    distance = np.asarray(distance)
+    field_position = np.asarray(field_position)
+
+    # Go for it - success gains the line to gain (touchdown if it reaches the goal line)
+    p_convert = conversion_probability(distance, situational, baselines)
+    new_position = field_position + distance
+    success_value = np.where(new_position >= FIELD_LENGTH,
+                             TOUCHDOWN_POINTS - KICKOFF_VALUE,
+                             expected_points(1, 10, np.minimum(new_position, FIELD_LENGTH - 1)))
+    failure_value = _opponent_ball(FIELD_LENGTH - field_position)
+    go_value = p_convert * success_value + (1 - p_convert) * failure_value
+
+    # Field goal - a miss gives the opponent the spot of the kick (20 minimum)
+    p_make = field_goal_probability(field_position)
+    miss_position = np.maximum(TOUCHBACK_FIELD_POSITION, FIELD_LENGTH - field_position + 7)
+    field_goal_value = p_make * (FIELD_GOAL_POINTS - KICKOFF_VALUE) + (1 - p_make) * _opponent_ball(miss_position)
+    field_goal_value = np.where(p_make > 0, field_goal_value, -np.inf)
+
+    # Punt - fixed net distance, touchback if it would reach the end zone
+    landing = field_position + PUNT_NET_YARDS
+    punt_position = np.where(landing >= FIELD_LENGTH, TOUCHBACK_FIELD_POSITION, FIELD_LENGTH - landing)
+    punt_value = _opponent_ball(punt_position) * np.ones_like(go_value)
+
+    return {
+        'go': go_value,
+        'field_goal': field_goal_value,
+        'punt': punt_value,
+        'conversion_probability': p_convert * np.ones_like(go_value)
+    }
+
+def risk_margin(risk_tolerance: int) -> float:
+    """EP the aggressive option must beat the best kick by (negative = accepts a deficit)"""
+    return (NEUTRAL_RISK_TOLERANCE - risk_tolerance) * RISK_MARGIN_PER_STEP
+
+def evaluate_fourth_down(distance: int, field_position: int, situational: Optional[Dict] = None,
+                         risk_tolerance: int = NEUTRAL_RISK_TOLERANCE, baselines: Optional[Dict] = None) -> Dict:
+    """
+    Score one fourth down decision
+
+    Returns:
+        Dict with per-option EP, conversion/field goal odds, go margin and recommendation
+    """
+    try:
+        values = fourth_down_values(distance, field_position, situational, baselines)
+        kick_option = 'field_goal' if values['field_goal'] > values['punt'] else 'punt'
+        go_margin = float(values['go'] - values[kick_option])
+        recommendation = 'go' if go_margin > risk_margin(risk_tolerance) else kick_option
+
+        result = {
+            'values': {option: float(values[option]) for option in FOURTH_DOWN_OPTIONS},
+            'conversion_probability': float(values['conversion_probability']),
+            'field_goal_probability': float(field_goal_probability(field_position)),
+            'go_margin': go_margin,
+            'recommendation': recommendation
+        }
+        log_debug("evaluate_fourth_down", 196,
+                  f"4th & {distance} at {field_position}: {OPTION_LABELS[recommendation]} (go margin {go_margin:+.2f} EP)")
+        return result
+
+    except Exception as e:
+        log_debug("evaluate_fourth_down", 200, "Fourth down evaluation failed", e)
+        return {}
+
+def build_fourth_down_grid(situational: Optional[Dict] = None, risk_tolerance: int = NEUTRAL_RISK_TOLERANCE,
+                           baselines: Optional[Dict] = None) -> Dict:
+    """
+    Evaluate every distance (1-30) x field position (1-99) in one vectorized call
+
+    Returns:
+        Dict with 'distances', 'field_positions', (distance x field position)
+        'go_margin' and 'recommendation' (index into FOURTH_DOWN_OPTIONS) arrays
+    """
+    try:
+        distances = np.arange(1, MAX_DISTANCE + 1)
+        field_positions = np.arange(1, FIELD_LENGTH)
+        values = fourth_down_values(distances[:, None], field_positions[None, :], situational, baselines)
+
+        best_kick = np.maximum(values['field_goal'], values['punt'])
+        kick_choice = np.where(values['field_goal'] > values['punt'], 1, 0)
+        go_margin = values['go'] - best_kick
+        recommendation = np.where(go_margin > risk_margin(risk_tolerance), 2, kick_choice)
+
+        log_debug("build_fourth_down_grid", 224,
+                  f"Decision grid built: {go_margin.shape[0]}x{go_margin.shape[1]}, go in {int((recommendation == 2).sum())} cells")
+        return {
+            'distances': distances,
+            'field_positions': field_positions,
+            'go_margin': go_margin,
+            'recommendation': recommendation
+        }
+
+    except Exception as e:
+        log_debug("build_fourth_down_grid", 233, "Decision grid build failed", e)
+        return {}
+
+# =============================================================================
+# TWO-POINT CONVERSION
+# =============================================================================
+
+def evaluate_two_point(situational: Optional[Dict] = None, risk_tolerance: int = NEUTRAL_RISK_TOLERANCE,
+                       baselines: Optional[Dict] = None) -> Dict:
+    """
+    Two-point try vs extra point, in expected points
+    Odds scale with the team's goal line and red zone success
+    """
+    try:
+        factor = (_team_factor(situational, 'goal_line_success', baselines)
+                  + _team_factor(situational, 'red_zone_efficiency', baselines)) / 2.0
+        p_two = float(np.clip(BASE_TWO_POINT_PROBABILITY * factor, 0.2, 0.8))
+        two_point_value = 2.0 * p_two
+        extra_point_value = 1.0 * EXTRA_POINT_PROBABILITY
+        margin = two_point_value - extra_point_value
+
+        return {
+            'two_point_probability': p_two,
+            'values': {'two_point': two_point_value, 'extra_point': extra_point_value},
+            'margin': margin,
+            'recommendation': 'two_point' if margin > risk_margin(risk_tolerance) else 'extra_point'
+        }
+
+    except Exception as e:
+        log_debug("evaluate_two_point", 262, "Two-point evaluation failed", e)
+        return {}
+
+# =============================================================================
+# TIMEOUT USAGE
+# =============================================================================
+
+def parse_clock(time_remaining: str) -> int:
+    """'MM:SS' -> seconds; unparseable values count as a full quarter"""
+    try:
+        minutes, seconds = str(time_remaining).split(':')
+        return int(minutes) * 60 + int(seconds)
+    except (ValueError, AttributeError):
+        return 900
+
+def evaluate_timeout(time_remaining: str, score_differential: int,
+                     risk_tolerance: int = NEUTRAL_RISK_TOLERANCE) -> Dict:
+    """
+    Whether stopping the clock now is worth a timeout (offense's perspective)
+    Value (0-100) grows as the half runs out and when one score or less behind
+    """
+    try:
+        seconds = parse_clock(time_remaining)
+        urgency = float(np.clip(1.0 - seconds / 300.0, 0.0, 1.0))
+
+        if score_differential > 0:
+            pressure = 0.1      # leading - the clock is on your side
+        elif score_differential == 0:
+            pressure = 0.7
+        elif score_differential >= -8:
+            pressure = 1.0      # one-score game
+        else:
+            pressure = 0.4
+
+        value = round(100 * urgency * pressure)
+        threshold = 60 - (risk_tolerance - NEUTRAL_RISK_TOLERANCE) * 4
+
+        return {
+            'seconds_remaining': seconds,
+            'timeout_value': value,
+            'threshold': threshold,
+            'recommendation': 'use' if value >= threshold else 'save'
+        }
+
+    except Exception as e:
+        log_debug("evaluate_timeout", 305, "Timeout evaluation failed", e)
+        return {}
@@ -1,6 +1,8 @@
 import feedparser
 from typing import List, Dict
 
+from instrumentation import span
+
 FEEDS = [
     "https://www.espn.com/espn/rss/nfl/news",
     "https://www.nfl.com/news/rss/rss.xml",
@@ -49,7 +51,8 @@ def fetch_news(max_items: int = 20, teams: List[str] = None) -> List[Dict]:
             sources += TEAM_FEEDS.get(t.upper(), [])
     for url in sources:
         try:
-            d = feedparser.parse(url)
+            with span("api", "rss"):
+                d = feedparser.parse(url)
             for e in d.entries[:max_items]:
                 items.append({
                     "title": e.get("title",""),
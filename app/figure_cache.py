@@ -0,0 +1,185 @@
+"""
+FIGURE CACHE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+==========================================================
+PURPOSE: Serialized Plotly figure specs shared across Streamlit reruns and sessions
+FEATURES: LRU eviction, matchup-aware cache keys, weather bucketing, hit/miss stats
+ARCHITECTURE: Builders run once per key; reruns get the stored JSON spec back
+
+CACHE KEY:
+- (chart type, team pair, data version, weather bucket)
+- Data version comes from database.get_data_version(), so reseeding invalidates
+- Weather is bucketed so small reading changes don't rebuild every chart
+
+DEBUGGING SYSTEM:
+- Cache hits, misses and evictions logged with function names and line numbers
+- get_stats() exposes counters for troubleshooting
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import streamlit as st
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("figure_cache")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CACHE KEYS - Chart type, team pair, data version, weather bucket
+# =============================================================================
+
+DEFAULT_MAX_FIGURES = 256
+
+# Impact thresholds used by the weather gauges
+COLD_TEMP_EDGES = [32, 40]      # below these (°F)
+HOT_TEMP_EDGES = [85, 95]       # above these (°F)
+WIND_EDGES = [10, 15, 20]       # above these (mph)
+PRECIPITATION_WORDS = ['rain', 'snow', 'storm']
+
+def get_weather_bucket(weather_data: Optional[Dict]) -> str:
+    """
+    Collapse a weather reading into a coarse bucket for cache keys
+    Bands follow the weather impact thresholds used by the gauges, so two
+    readings in the same bucket always render the same chart
+    """
+    if not weather_data:
+        return "none"
+    if weather_data.get('is_dome'):
+        return "dome"
+
+    temp = weather_data.get('temp', 70)
+    wind_speed = weather_data.get('wind_speed', 0)
+    condition = str(weather_data.get('condition', '')).lower()
+
+    try:
+        temp = float(temp)
+        temp_bucket = sum(temp > edge for edge in HOT_TEMP_EDGES) - sum(temp < edge for edge in COLD_TEMP_EDGES)
+    except (TypeError, ValueError):
+        temp_bucket = 0
+    try:
+        wind_bucket = sum(float(wind_speed) > edge for edge in WIND_EDGES)
+    except (TypeError, ValueError):
+        wind_bucket = 0
+
+    wet = any(word in condition for word in PRECIPITATION_WORDS)
+
+    return f"t{temp_bucket}_w{wind_bucket}_{'wet' if wet else 'dry'}"
+
+def make_figure_key(chart_type: str, team1: str, team2: str, data_version: str,
+                    weather_bucket: str = "none") -> Tuple[str, str, str, str, str]:
+    """
+    Build the cache key for one chart of one matchup
+    """
+    return (chart_type, team1 or "", team2 or "", str(data_version), weather_bucket)
+
+# =============================================================================
+# LRU FIGURE SPEC CACHE
+# =============================================================================
+
+class FigureSpecCache:
+    """
+    Thread-safe LRU cache of serialized Plotly figure JSON.
+    Streamlit script threads share one instance through get_figure_cache().
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_FIGURES):
+        self.max_entries = max_entries
+        self._specs: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[str]:
+        with self._lock:
+            spec_json = self._specs.get(key)
+            if spec_json is None:
+                self.misses += 1
+                return None
+            self._specs.move_to_end(key)
+            self.hits += 1
+            return spec_json
+
+    def put(self, key: Tuple, spec_json: str):
+        with self._lock:
+            self._specs[key] = spec_json
+            self._specs.move_to_end(key)
+            while len(self._specs) > self.max_entries:
+                evicted_key, _ = self._specs.popitem(last=False)
+                self.evictions += 1
+                log_debug("FigureSpecCache.put", 118, f"Evicted figure spec {evicted_key[0]} {evicted_key[1]} vs {evicted_key[2]}")
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._specs),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits / total) if total else 0.0
+            }
+
+@st.cache_resource
+def get_figure_cache() -> FigureSpecCache:
+    """
+    Process-wide figure cache shared by every session
+    """
+    return FigureSpecCache()
+
+# =============================================================================
+# CACHED FIGURE ACCESS - Build once, serve the JSON spec afterwards
+# =============================================================================
+
+def get_cached_figure_spec(chart_type: str, team1: str, team2: str, data_version: str,
+                           builder: Callable[[], object], weather_data: Optional[Dict] = None):
+    """
+    Return the figure spec (dict) for a chart, building it only on a cache miss.
+
+    Args:
+        chart_type: Chart identifier, e.g. 'formation_efficiency'
+        team1, team2: Team pair shown in the chart
+        data_version: Version of the team data the chart was built from
+        builder: Zero-argument callable returning a Plotly figure
+        weather_data: Optional weather reading, bucketed into the key
+
+    Returns:
+        Plotly figure spec as a dict (st.plotly_chart accepts it directly),
+        the uncached figure for trace-less error placeholders, or None
+    """
+    key = make_figure_key(chart_type, team1, team2, data_version, get_weather_bucket(weather_data))
+    cache = get_figure_cache()
+
+    spec_json = cache.get(key)
+    if spec_json is None:
+        try:
+            fig = builder()
+            if fig is None:
+                return None
+            if not fig.data:
+                # Error placeholders (annotation only) are not cached and
+                # st.plotly_chart rejects trace-less dict specs
+                return fig
+            spec_json = fig.to_json()
+            cache.put(key, spec_json)
+            log_debug("get_cached_figure_spec", 178, f"Cache MISS for {chart_type} {team1} vs {team2} - figure built")
+        except Exception as e:
+            log_debug("get_cached_figure_spec", 180, f"Figure build failed for {chart_type}", e)
+            return None
+
+    return json.loads(spec_json)
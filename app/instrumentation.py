@@ -0,0 +1,285 @@
+"""
+INSTRUMENTATION MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=============================================================
+PURPOSE: Leveled logging, timing spans and a metrics registry for the hot paths
+FEATURES: Lazy log formatting, span() timers for DB / API / LLM calls, counters and
+          histograms with p50/p95, JSON and Prometheus text export
+ARCHITECTURE: Standard library only (no Streamlit), so every module can import it;
+              one process-wide registry shared by the app, API server and job workers
+
+HOW IT WORKS:
+- The per-module log_debug / log_weather_debug / log_analysis_debug helpers keep their
+  signatures and forward to log_event(), which logs through the "grit.<module>" logger
+- Non-error events are logged at DEBUG and only formatted when DEBUG is enabled;
+  the optional data dict is serialised lazily, so json.dumps no longer runs per call
+- Errors are always logged at ERROR
+- with span("db", "get_team_data"): ... records the duration in the
+  "<subsystem>.latency_ms" histogram (labelled by operation) and counts failures
+  in "<subsystem>.errors"
+
+CONFIGURATION (environment):
+- GRIT_LOG_LEVEL (default INFO; DEBUG restores the old per-call trace output)
+- GRIT_METRIC_SAMPLES (default 1000) - recent samples kept per histogram for percentiles
+
+USAGE:
+    from instrumentation import get_logger, log_event, span, increment
+    _logger = get_logger("database")
+    with span("db", "get_team_data"):
+        ...
+    increment("weather.cache", result="hit")
+    get_latency_summary()    # rows for the Debug tab
+    export_metrics()         # JSON-ready snapshot
+
+DEBUGGING SYSTEM:
+- GRIT_LOG_LEVEL=DEBUG prints every event with its line number and context data
+- Spans slower than SLOW_SPAN_MS are logged at INFO
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+LOG_LEVEL = os.environ.get('GRIT_LOG_LEVEL', 'INFO').upper()
+METRIC_SAMPLES = int(os.environ.get('GRIT_METRIC_SAMPLES', 1000))
+SLOW_SPAN_MS = 2000.0
+
+LOG_FORMAT = '[%(asctime)s.%(msecs)03d] %(levelname)s %(name)s %(message)s'
+LOG_DATE_FORMAT = '%H:%M:%S'
+
+SUBSYSTEMS = ('db', 'api', 'llm')
+
+# =============================================================================
+# LEVELED LOGGING
+# =============================================================================
+
+_root_logger = logging.getLogger('grit')
+_configure_lock = threading.Lock()
+
+def _configure():
+    """Attach one stdout handler to the 'grit' logger (idempotent, safe on Streamlit reruns)"""
+    with _configure_lock:
+        if getattr(_root_logger, '_grit_configured', False):
+            return
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        _root_logger.addHandler(handler)
+        _root_logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        _root_logger.propagate = False
+        _root_logger._grit_configured = True
+
+def get_logger(module: str) -> logging.Logger:
+    _configure()
+    return _root_logger.getChild(module)
+
+class _LazyJSON:
+    """Serialised only if the record is actually emitted"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data, default=str)
+
+def log_event(logger: logging.Logger, function_name: str, line_number: int, message: str,
+              error: Exception = None, data: Dict = None):
+    """Backend for the per-module log_debug helpers"""
+    if error is not None:
+        if data:
+            logger.error("%s() line %s: %s - %s | %s", function_name, line_number, message, error, _LazyJSON(data))
+        else:
+            logger.error("%s() line %s: %s - %s", function_name, line_number, message, error)
+    elif logger.isEnabledFor(logging.DEBUG):
+        if data:
+            logger.debug("%s() line %s: %s | %s", function_name, line_number, message, _LazyJSON(data))
+        else:
+            logger.debug("%s() line %s: %s", function_name, line_number, message)
+
+_logger = get_logger('instrumentation')
+
+# =============================================================================
+# METRICS REGISTRY
+# =============================================================================
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Histogram:
+    """Count, sum and max over all observations; percentiles over the most recent samples"""
+
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=METRIC_SAMPLES)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def summary(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'sum': round(self.total, 3),
+            'avg': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50': round(_percentile(ordered, 0.50), 3),
+            'p95': round(_percentile(ordered, 0.95), 3),
+            'max': round(self.max, 3),
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms keyed by (name, labels)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.started_at = time.time()
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def samples(self, name: str) -> List[float]:
+        """Recent samples of every labelled series of histogram `name`, merged"""
+        with self._lock:
+            return [v for (n, _), h in self._histograms.items() if n == name for v in h.samples]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), **histogram.summary()}
+                          for (name, labels), histogram in sorted(self._histograms.items())]
+        return {'since': self.started_at, 'uptime_seconds': round(time.time() - self.started_at, 1),
+                'counters': counters, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """Text exposition format (histograms exported as summaries)"""
+        def series(name, labels, extra=None):
+            pairs = dict(labels, **(extra or {}))
+            metric = 'grit_' + name.replace('.', '_')
+            if not pairs:
+                return metric
+            return metric + '{' + ','.join(f'{k}="{v}"' for k, v in sorted(pairs.items())) + '}'
+
+        snapshot = self.snapshot()
+        lines = []
+        for counter in snapshot['counters']:
+            lines.append(f"{series(counter['name'], counter['labels'])} {counter['value']}")
+        for histogram in snapshot['histograms']:
+            name, labels = histogram['name'], histogram['labels']
+            lines.append(f"{series(name, labels, {'quantile': '0.5'})} {histogram['p50']}")
+            lines.append(f"{series(name, labels, {'quantile': '0.95'})} {histogram['p95']}")
+            lines.append(f"{series(name + '_sum', labels)} {histogram['sum']}")
+            lines.append(f"{series(name + '_count', labels)} {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
+
+def increment(name: str, amount: float = 1, **labels):
+    _registry.increment(name, amount, **labels)
+
+def observe(name: str, value: float, **labels):
+    _registry.observe(name, value, **labels)
+
+# =============================================================================
+# TIMING SPANS
+# =============================================================================
+
+@contextmanager
+def span(subsystem: str, operation: str):
+    """
+    Time a block as one call of `operation` in `subsystem` ("db", "api", "llm").
+    Exceptions are counted and re-raised.
+    """
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _registry.observe(f'{subsystem}.latency_ms', elapsed_ms, op=operation)
+        if failed:
+            _registry.increment(f'{subsystem}.errors', op=operation)
+        if elapsed_ms >= SLOW_SPAN_MS:
+            _logger.info("slow %s span %s: %.0f ms", subsystem, operation, elapsed_ms)
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def get_latency_summary(subsystems: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+    """One row per (subsystem, operation) span plus an 'all' row per subsystem"""
+    snapshot = _registry.snapshot()
+    errors = {(c['name'].split('.')[0], c['labels'].get('op')): c['value']
+              for c in snapshot['counters'] if c['name'].endswith('.errors')}
+    rows = []
+
+    for histogram in snapshot['histograms']:
+        if not histogram['name'].endswith('.latency_ms'):
+            continue
+        subsystem = histogram['name'].split('.')[0]
+        if subsystems and subsystem not in subsystems:
+            continue
+        operation = histogram['labels'].get('op', '')
+        rows.append({'subsystem': subsystem, 'operation': operation, 'calls': histogram['count'],
+                     'p50_ms': histogram['p50'], 'p95_ms': histogram['p95'], 'max_ms': histogram['max'],
+                     'errors': int(errors.get((subsystem, operation), 0))})
+
+    for subsystem in sorted({r['subsystem'] for r in rows}):
+        ordered = sorted(_registry.samples(f'{subsystem}.latency_ms'))
+        rows.append({'subsystem': subsystem, 'operation': 'all',
+                     'calls': sum(r['calls'] for r in rows if r['subsystem'] == subsystem),
+                     'p50_ms': round(_percentile(ordered, 0.50), 3),
+                     'p95_ms': round(_percentile(ordered, 0.95), 3),
+                     'max_ms': round(max(ordered, default=0.0), 3),
+                     'errors': sum(r['errors'] for r in rows if r['subsystem'] == subsystem)})
+    return sorted(rows, key=lambda r: (r['subsystem'], r['operation'] != 'all', r['operation']))
+
+def export_metrics() -> Dict:
+    return _registry.snapshot()
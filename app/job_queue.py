@@ -0,0 +1,388 @@
+"""
+JOB QUEUE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=======================================================
+PURPOSE: Run long report and analysis work in the background instead of blocking a session
+FEATURES: SQLite-backed jobs, worker pool, progress, persisted results, de-duplication
+ARCHITECTURE: jobs table in nfl_teams.db + one process-wide JobQueue of worker threads
+
+HOW IT WORKS:
+- submit_job(kind, params) stores a queued row and returns its job ID. If an identical
+  job (same kind + params) is already queued or running, that job's ID is returned
+- Worker threads claim the oldest queued job inside a write transaction, so a job
+  runs once even when several processes share the database file
+- Handlers report progress (0.0 - 1.0 plus a message); the row is updated each time,
+  which also acts as the job's heartbeat
+- Results are stored as JSON on the row: the UI polls get_job(job_id) and a page
+  refresh (or another process) still finds the finished work
+- Workers start the first time the queue is used in a process and pick up any
+  jobs still queued from an earlier run
+- Jobs left 'running' by a process that died are re-queued once their heartbeat is
+  older than STALE_AFTER_SECONDS; finished jobs are deleted after RETENTION_DAYS
+
+JOB KINDS:
+- professional_report  - reports.compile_professional_report (progress per section)
+- strategic_analysis   - analysis.generate_advanced_strategic_analysis (GPT error replies fail the job)
+
+DEBUGGING SYSTEM:
+- Job submit/claim/finish logged with job ID, kind and run time
+- get_job_queue_stats() reports counts by status plus this process's workers
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+
+from analysis import generate_advanced_strategic_analysis, get_openai_api_key
+from database import DATABASE_PATH, get_team_data
+from db_connections import get_read_connection, write_transaction
+from instrumentation import get_logger, log_event
+from lazy_imports import lazy_import
+from llm_scheduler import BACKGROUND, llm_priority
+from reports import compile_professional_report
+
+openai = lazy_import("openai")
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("job_queue")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+WORKER_COUNT = int(os.environ.get('JOB_WORKERS', 2))
+POLL_INTERVAL_SECONDS = 1.0
+STALE_AFTER_SECONDS = 10 * 60
+RETENTION_DAYS = 7
+
+ANALYSIS_ERROR_PREFIXES = ('Analysis temporarily unavailable', 'Analysis unavailable', 'Analysis system error',
+                           'Strategic analysis system error', 'Error building analysis prompt')
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('done', 'failed', 'cancelled')
+
+JOB_COLUMNS = ('id', 'kind', 'params', 'status', 'progress', 'message', 'result', 'error',
+               'session_id', 'created_at', 'started_at', 'updated_at', 'finished_at', 'attempts')
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+def dedup_key(kind: str, params: Dict) -> str:
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# =============================================================================
+# JOB HANDLERS - handler(params, progress) -> JSON-serializable result
+# =============================================================================
+
+JOB_HANDLERS: Dict[str, Callable] = {}
+
+def register_job_handler(kind: str):
+    def decorator(handler: Callable):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+@register_job_handler('professional_report')
+def run_professional_report(params: Dict, progress: Callable) -> Dict:
+    client = openai.OpenAI(api_key=get_openai_api_key())
+    progress(0.0, "Generating sections")
+    report = compile_professional_report(
+        params['sections'], params['your_team'], params['opponent_team'], client,
+        progress=lambda done, total, name: progress(done / total, f"{name} ({done}/{total})")
+    )
+    return {'report': report}
+
+@register_job_handler('strategic_analysis')
+def run_strategic_analysis(params: Dict, progress: Callable) -> Dict:
+    progress(0.1, "Loading team data")
+    team1_data = get_team_data(params['team1_name']) or {}
+    team2_data = get_team_data(params['team2_name']) or {}
+
+    progress(0.2, "Waiting for GPT analysis")
+    analysis = generate_advanced_strategic_analysis(
+        params['team1_name'], params['team2_name'], params['question'], params['analysis_type'],
+        team1_data, team2_data, params.get('weather_data', {}), params.get('game_situation', {}),
+        params.get('coaching_perspective', 'Head Coach'), params.get('complexity_level', 'Advanced')
+    )
+    # analysis returns its errors as text; fail the job so the UI shows them as errors
+    if not analysis or analysis.startswith(ANALYSIS_ERROR_PREFIXES):
+        raise RuntimeError(analysis or "Empty analysis")
+    return {'analysis': analysis}
+
+# =============================================================================
+# JOB QUEUE
+# =============================================================================
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a pool of worker threads in this process
+    """
+
+    def __init__(self, db_path: str, workers: int = WORKER_COUNT):
+        self.db_path = db_path
+        self.worker_count = max(1, workers)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        self._table_ready = False
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'completed': 0, 'failed': 0, 'requeued': 0}
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def submit(self, kind: str, params: Dict, session_id: Optional[str] = None) -> str:
+        """Queue a job (or return the ID of an identical queued/running job)"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self._ensure_table()
+
+        key = dedup_key(kind, params)
+        with write_transaction(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')", (key,)
+            ).fetchone()
+            if row is not None:
+                job_id, created = row[0], False
+            else:
+                job_id, created = uuid.uuid4().hex, True
+                conn.execute('''
+                    INSERT INTO jobs (id, kind, params, dedup_key, status, progress, message,
+                                      session_id, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, 'queued', 0, 'Queued', ?, ?, ?)
+                ''', (job_id, kind, json.dumps(params, default=str), key, session_id, _now(), _now()))
+
+        with self._lock:
+            self._stats['submitted' if created else 'deduplicated'] += 1
+        log_debug("JobQueue.submit", 174, f"{'Queued' if created else 'Reusing'} {kind} job {job_id}")
+
+        self._ensure_started()
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Job row as a dict (params/result decoded), or None if unknown"""
+        self._ensure_table()
+        row = get_read_connection(self.db_path).execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, session_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Most recent jobs, optionally for one session"""
+        self._ensure_table()
+        where, args = ("WHERE session_id = ?", (session_id,)) if session_id else ("", ())
+        rows = get_read_connection(self.db_path).execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*args, limit)
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job; running jobs finish normally"""
+        with write_transaction(self.db_path) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', message = 'Cancelled', finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'", (_now(), _now(), job_id)
+            )
+        return cursor.rowcount == 1
+
+    def stop(self, timeout: float = 2.0):
+        """Stop claiming new jobs; a running handler is left to its daemon thread"""
+        self._stopped = True
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stats(self) -> Dict:
+        self._ensure_table()
+        counts = dict(get_read_connection(self.db_path).execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ).fetchall())
+        with self._lock:
+            stats = dict(self._stats)
+        stats['by_status'] = counts
+        stats['workers'] = sum(thread.is_alive() for thread in self._threads)
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def _ensure_table(self):
+        if self._table_ready:
+            return
+        with write_transaction(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    dedup_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    session_id TEXT,
+                    created_at TIMESTAMP NOT NULL,
+                    started_at TIMESTAMP,
+                    updated_at TIMESTAMP NOT NULL,
+                    finished_at TIMESTAMP,
+                    attempts INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(dedup_key, status)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id, created_at)')
+        self._table_ready = True
+
+    @staticmethod
+    def _to_dict(row) -> Dict:
+        job = dict(zip(JOB_COLUMNS, row))
+        job['params'] = json.loads(job['params']) if job['params'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def _recover(self):
+        """Re-queue jobs whose worker died; drop finished jobs past retention"""
+        stale_before = (datetime.now() - timedelta(seconds=STALE_AFTER_SECONDS)).isoformat(timespec='seconds')
+        expire_before = (datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat(timespec='seconds')
+        with write_transaction(self.db_path) as conn:
+            requeued = conn.execute(
+                "UPDATE jobs SET status = 'queued', message = 'Re-queued after worker stopped' "
+                "WHERE status = 'running' AND updated_at < ?", (stale_before,)
+            ).rowcount
+            expired = conn.execute(
+                f"DELETE FROM jobs WHERE status IN {FINISHED_STATUSES} AND finished_at < ?", (expire_before,)
+            ).rowcount
+        with self._lock:
+            self._stats['requeued'] += requeued
+        if requeued or expired:
+            log_debug("JobQueue._recover", 278, f"Re-queued {requeued} stale jobs, deleted {expired} expired jobs")
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._threads or self._stopped:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._ensure_table()
+            self._recover()
+            for i in range(self.worker_count):
+                thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        log_debug("JobQueue._ensure_started", 296, f"Started {self.worker_count} job workers")
+
+    def _claim(self) -> Optional[Dict]:
+        with write_transaction(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, updated_at = ?, message = 'Started', "
+                "attempts = attempts + 1 WHERE id = ? AND status = 'queued'", (_now(), _now(), row[0])
+            ).rowcount
+        return self.get(row[0]) if claimed else None
+
+    def _update(self, job_id: str, **fields):
+        fields['updated_at'] = _now()
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with write_transaction(self.db_path) as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                job = self._claim()
+            except Exception as e:
+                log_debug("JobQueue._run", 322, "Claiming a job failed", e)
+                job = None
+
+            if job is None:
+                self._wake.wait(POLL_INTERVAL_SECONDS)
+                self._wake.clear()
+                continue
+            self._execute(job)
+
+    def _execute(self, job: Dict):
+        job_id, kind = job['id'], job['kind']
+        start = time.perf_counter()
+
+        def progress(fraction: float, message: str = ""):
+            self._update(job_id, progress=round(min(max(fraction, 0.0), 1.0), 3), message=message)
+
+        try:
+            # Interactive LLM calls from the UI go ahead of job calls
+            with llm_priority(BACKGROUND):
+                result = JOB_HANDLERS[kind](job['params'], progress)
+            self._update(job_id, status='done', progress=1.0, message='Completed',
+                         result=json.dumps(result, default=str), finished_at=_now())
+            with self._lock:
+                self._stats['completed'] += 1
+            log_debug("JobQueue._execute", 346, f"{kind} job {job_id} done in {time.perf_counter() - start:.1f}s")
+
+        except Exception as e:
+            log_debug("JobQueue._execute", 349, f"{kind} job {job_id} failed", e)
+            try:
+                self._update(job_id, status='failed', message='Failed', error=str(e), finished_at=_now())
+            except Exception as update_error:
+                log_debug("JobQueue._execute", 353, f"Could not record failure of job {job_id}", update_error)
+            with self._lock:
+                self._stats['failed'] += 1
+
+# =============================================================================
+# MODULE SINGLETON - one worker pool per process
+# =============================================================================
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_job_queue(db_path: str = DATABASE_PATH) -> JobQueue:
+    """Process-wide job queue; workers start (and pick up jobs left queued) on first use"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(db_path)
+                atexit.register(_queue.stop)
+        _queue._ensure_started()
+    return _queue
+
+def submit_job(kind: str, params: Dict, session_id: Optional[str] = None) -> str:
+    return get_job_queue().submit(kind, params, session_id)
+
+def get_job(job_id: str) -> Optional[Dict]:
+    return get_job_queue().get(job_id)
+
+def list_jobs(session_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    return get_job_queue().list(session_id, limit)
+
+def cancel_job(job_id: str) -> bool:
+    return get_job_queue().cancel(job_id)
+
+def get_job_queue_stats() -> Dict:
+    return get_job_queue().stats()
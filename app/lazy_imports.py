@@ -0,0 +1,104 @@
+"""
+LAZY IMPORTS MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+==========================================================
+PURPOSE: Defer heavy third-party imports until the code that needs them runs
+FEATURES: Module proxies, per-module load timing, loaded/pending report
+ARCHITECTURE: lazy_import() returns a stand-in that imports on first attribute access
+
+USAGE:
+    pd = lazy_import("pandas")           # nothing imported yet
+    df = pd.DataFrame(rows)              # pandas imported here, once
+
+HEAVY MODULES (measured with python -X importtime):
+- openai            ~0.7s (pydantic type tree)
+- pandas            ~0.6s
+- plotly.express    ~0.2s
+- requests          ~0.1s
+
+DEBUGGING SYSTEM:
+- Each deferred import logged with the time it took
+- get_lazy_import_stats() lists which lazy modules have loaded and their cost
+"""
+
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Dict
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("lazy_imports")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# LAZY MODULE PROXY
+# =============================================================================
+
+_load_lock = threading.RLock()
+_load_times: Dict[str, float] = {}
+_registered: Dict[str, "LazyModule"] = {}
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported the first time one of its
+    attributes is used. Import errors surface at that point, not at startup.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self) -> ModuleType:
+        target = self.__dict__['_lazy_target']
+        if target is not None:
+            return target
+        with _load_lock:
+            target = self.__dict__['_lazy_target']
+            if target is None:
+                start = time.perf_counter()
+                target = importlib.import_module(self.__name__)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                _load_times[self.__name__] = round(elapsed_ms, 1)
+                self.__dict__['_lazy_target'] = target
+                log_debug("LazyModule._load", 73, f"Imported {self.__name__} on first use in {elapsed_ms:.0f}ms")
+        return target
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_target'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Module proxy for `name`; the real import happens on first attribute access.
+    Modules already imported elsewhere cost nothing extra.
+    """
+    with _load_lock:
+        module = _registered.get(name)
+        if module is None:
+            module = LazyModule(name)
+            _registered[name] = module
+        return module
+
+def get_lazy_import_stats() -> Dict[str, Dict]:
+    """{module: {'loaded': bool, 'load_ms': float or None}} for every lazy module"""
+    with _load_lock:
+        return {
+            name: {'loaded': module.__dict__['_lazy_target'] is not None, 'load_ms': _load_times.get(name)}
+            for name, module in _registered.items()
+        }
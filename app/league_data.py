@@ -0,0 +1,178 @@
+"""
+LEAGUE DATA MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=========================================================
+PURPOSE: League-wide team metrics and percentiles backing every chart
+FEATURES: One-query team load, vectorized percentile ranking, league averages
+ARCHITECTURE: Snapshot built once per data version and shared via @st.cache_resource
+
+HOW IT WORKS:
+- database.get_all_team_data() loads all 32 teams in a single query
+- Metrics are flattened into a (teams x metrics) NumPy matrix, NaN where missing
+- Percentiles for every team and metric are computed in one broadcast pass
+- Charts look teams up in the snapshot, so any pair renders with no extra queries
+
+DEBUGGING SYSTEM:
+- Snapshot builds logged with team/metric counts and missing-data totals
+"""
+
+import numpy as np
+import streamlit as st
+from typing import Dict, List, Optional
+
+from database import ensure_database_populated, get_all_team_data
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("league_data")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# METRIC DEFINITIONS - (metric key, display label, value path in team data)
+# =============================================================================
+
+FORMATIONS = ['11_personnel', '12_personnel', '21_personnel', '10_personnel']
+
+LEAGUE_METRICS = (
+    [(f"{f}_{stat}", f"{f.split('_')[0]} Personnel {label}", ('formation_data', f, stat))
+     for f in FORMATIONS
+     for stat, label in [('usage', 'Usage'), ('ypp', 'YPP'), ('success_rate', 'Success Rate')]]
+    + [
+        ('third_down_conversion', 'Third Down %', ('situational_tendencies', 'third_down_conversion')),
+        ('red_zone_efficiency', 'Red Zone %', ('situational_tendencies', 'red_zone_efficiency')),
+        ('goal_line_success', 'Goal Line %', ('situational_tendencies', 'goal_line_success')),
+        ('two_minute_efficiency', 'Two-Minute %', ('situational_tendencies', 'two_minute_efficiency')),
+        ('offensive_line_strength', 'O-Line Strength', ('personnel_packages', 'offensive_line_strength')),
+        ('receiving_corps_depth', 'Receiving Depth', ('personnel_packages', 'receiving_corps_depth')),
+        ('backfield_versatility', 'Backfield Versatility', ('personnel_packages', 'backfield_versatility')),
+        ('tight_end_usage', 'TE Usage', ('personnel_packages', 'tight_end_usage')),
+    ]
+)
+
+METRIC_KEYS = [key for key, _, _ in LEAGUE_METRICS]
+METRIC_LABELS = {key: label for key, label, _ in LEAGUE_METRICS}
+
+def _extract_metric(team_data: Dict, path) -> float:
+    value = team_data
+    for part in path:
+        if not isinstance(value, dict):
+            return np.nan
+        value = value.get(part)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+# =============================================================================
+# VECTORIZED PERCENTILES
+# =============================================================================
+
+def compute_league_percentiles(values: np.ndarray) -> np.ndarray:
+    """
+    Percentile (0-100) of every team for every metric in one broadcast pass.
+    Ties share the midpoint rank; missing values (NaN) stay NaN and are
+    excluded from the other teams' rankings.
+
+    Args:
+        values: (teams x metrics) matrix
+
+    Returns:
+        (teams x metrics) percentile matrix
+    """
+    valid = ~np.isnan(values)
+    # (teams x teams x metrics) comparisons - NaN compares False on both sides
+    below = (values[:, None, :] > values[None, :, :]).sum(axis=1)
+    ties = (values[:, None, :] == values[None, :, :]).sum(axis=1) - 1
+    n_valid = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentiles = (below + 0.5 * ties) / (n_valid - 1) * 100.0
+    percentiles = np.where(n_valid > 1, percentiles, 50.0)
+    return np.where(valid, percentiles, np.nan)
+
+# =============================================================================
+# LEAGUE SNAPSHOT
+# =============================================================================
+
+class LeagueSnapshot:
+    """
+    Immutable view of every team's metrics, league averages and percentiles.
+    """
+    def __init__(self, teams: Dict[str, Dict], data_version: str = ""):
+        self.data_version = data_version
+        self.team_names: List[str] = sorted(teams.keys())
+        self.team_index = {name: i for i, name in enumerate(self.team_names)}
+        self.metric_index = {key: j for j, key in enumerate(METRIC_KEYS)}
+        self._teams = teams
+
+        self.values = np.array(
+            [[_extract_metric(teams[name], path) for _, _, path in LEAGUE_METRICS] for name in self.team_names],
+            dtype=float
+        ).reshape(len(self.team_names), len(LEAGUE_METRICS))
+
+        self.percentiles = compute_league_percentiles(self.values)
+        with np.errstate(invalid='ignore'):
+            counts = (~np.isnan(self.values)).sum(axis=0)
+            sums = np.nansum(self.values, axis=0)
+            self.league_averages = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def has_team(self, team_name: str) -> bool:
+        return team_name in self.team_index
+
+    def get_team_data(self, team_name: str) -> Dict:
+        """Raw team data dict (same shape as database.get_team_data)"""
+        return self._teams.get(team_name, {})
+
+    def get_metric(self, team_name: str, metric_key: str) -> Optional[float]:
+        value = self.values[self.team_index[team_name], self.metric_index[metric_key]] if team_name in self.team_index else np.nan
+        return None if np.isnan(value) else float(value)
+
+    def get_percentile(self, team_name: str, metric_key: str) -> Optional[float]:
+        value = self.percentiles[self.team_index[team_name], self.metric_index[metric_key]] if team_name in self.team_index else np.nan
+        return None if np.isnan(value) else float(value)
+
+    def get_league_average(self, metric_key: str) -> Optional[float]:
+        value = self.league_averages[self.metric_index[metric_key]]
+        return None if np.isnan(value) else float(value)
+
+    def get_team_percentiles(self, team_name: str) -> Dict[str, float]:
+        """All available percentiles for one team keyed by metric"""
+        if team_name not in self.team_index:
+            return {}
+        row = self.percentiles[self.team_index[team_name]]
+        return {key: float(row[j]) for j, key in enumerate(METRIC_KEYS) if not np.isnan(row[j])}
+
+def build_league_snapshot(data_version: str) -> LeagueSnapshot:
+    """
+    Uncached snapshot build. get_all_team_data() returns {} when the read fails, so an
+    empty result is raised here - callers that cache the snapshot must never keep it
+    """
+    team_data = get_all_team_data()
+    if not team_data:
+        raise RuntimeError(f"No team data available for data version {data_version}")
+    return LeagueSnapshot(team_data, data_version)
+
+@st.cache_resource
+def get_league_snapshot(data_version: str) -> LeagueSnapshot:
+    """
+    Build (once per data version) the league snapshot shared by all sessions
+    Failures are raised (not cached) so the next rerun retries the build
+    """
+    try:
+        log_debug("get_league_snapshot", 166, f"Building league snapshot for data version {data_version}")
+
+        ensure_database_populated()
+        snapshot = build_league_snapshot(data_version)
+
+        log_debug("get_league_snapshot", 171,
+                  f"League snapshot ready: {len(snapshot.team_names)} teams x {len(METRIC_KEYS)} metrics, "
+                  f"{int(np.isnan(snapshot.values).sum())} missing values")
+        return snapshot
+
+    except Exception as e:
+        log_debug("get_league_snapshot", 177, "League snapshot build failed", e)
+        raise
@@ -0,0 +1,306 @@
+"""
+LLM LEDGER MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+========================================================
+PURPOSE: Persist every LLM call so slow and expensive features can be found
+FEATURES: Per-call rows (feature, model, tokens, latency, cache hit, error class),
+          estimated cost, tokens per feature per day, latency percentiles per model
+ARCHITECTURE: llm_calls table in nfl_teams.db, written through a chat_writer
+              write-behind queue; shared by the app, API workers, job workers and batch runs
+
+HOW IT WORKS:
+- llm_scheduler records one row per chat_completion() after its last attempt:
+  OpenAI usage tokens, API latency of that attempt, queue wait, attempts and the
+  exception class name if it failed
+- api_server records a cache_hit row when a cached analysis is served instead of
+  calling GPT, and model.LLMBackend records Hugging Face calls
+- Calls without usage data (Hugging Face, test clients) get prompt/completion tokens
+  estimated at characters / 4 and are flagged estimated = 1
+- cost_usd is computed at insert time from MODEL_PRICES (unknown models cost 0)
+- Rows are queued and committed in batches off the request path, so a cache hit
+  costs a queue put rather than a synchronous INSERT; aggregates flush the queue first
+- Rows older than LEDGER_RETENTION_DAYS are deleted when the table is first opened
+  and again every LEDGER_RETENTION_INTERVAL_S while the process keeps recording
+- Recording never raises: a ledger failure is logged and the LLM result is kept
+
+USAGE:
+    get_tokens_by_feature_per_day(days=7)   # day x feature token and cost totals
+    get_latency_by_model(days=7)            # p50 / p95 / max latency per model
+    get_feature_summary(days=7)             # per feature: calls, errors, cache hits, p95
+
+DEBUGGING SYSTEM:
+- Failed inserts logged with feature and model
+- CLI: python app/llm_ledger.py --days 7 prints the summaries as JSON
+"""
+
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+
+from database import DATABASE_PATH
+from chat_writer import ChatWriteQueue
+from db_connections import get_read_connection, write_transaction
+from instrumentation import get_logger, increment, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("llm_ledger")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+LEDGER_RETENTION_DAYS = int(os.environ.get('LLM_LEDGER_RETENTION_DAYS', 90))
+LEDGER_RETENTION_INTERVAL_S = int(os.environ.get('LLM_LEDGER_RETENTION_INTERVAL_S', 3600))
+LEDGER_DURABILITY = os.environ.get('LLM_LEDGER_DURABILITY', 'batched').lower()
+
+# USD per 1K tokens: (prompt, completion)
+MODEL_PRICES = {
+    'gpt-3.5-turbo': (0.0005, 0.0015),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+}
+
+CACHE_MODEL = 'response_cache'
+
+INSERT_SQL = """
+    INSERT INTO llm_calls (created_at, day, feature, provider, model, prompt_tokens,
+                           completion_tokens, total_tokens, estimated, cost_usd, latency_ms,
+                           queue_wait_ms, attempts, priority, cache_hit, error_class)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# =============================================================================
+# TABLE
+# =============================================================================
+
+_table_lock = threading.Lock()
+_table_ready = False
+_retention_lock = threading.Lock()
+_last_retention = 0.0
+
+def _ensure_table():
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if _table_ready:
+            return
+        with write_transaction(DATABASE_PATH) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    feature TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_tokens INTEGER DEFAULT 0,
+                    completion_tokens INTEGER DEFAULT 0,
+                    total_tokens INTEGER DEFAULT 0,
+                    estimated INTEGER DEFAULT 0,
+                    cost_usd REAL DEFAULT 0,
+                    latency_ms REAL DEFAULT 0,
+                    queue_wait_ms REAL DEFAULT 0,
+                    attempts INTEGER DEFAULT 1,
+                    priority TEXT,
+                    cache_hit INTEGER DEFAULT 0,
+                    error_class TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_day_feature ON llm_calls(day, feature)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_day_model ON llm_calls(day, model)")
+        _apply_retention()
+        _table_ready = True
+
+def _apply_retention():
+    """Delete rows older than LEDGER_RETENTION_DAYS (skipped if another thread is already at it)"""
+    global _last_retention
+    if not _retention_lock.acquire(blocking=False):
+        return
+    try:
+        _last_retention = time.monotonic()
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=LEDGER_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        with write_transaction(DATABASE_PATH) as conn:
+            deleted = conn.execute("DELETE FROM llm_calls WHERE day < ?", (cutoff,)).rowcount
+        if deleted:
+            log_debug("_apply_retention", 148, f"Deleted {deleted} ledger rows before {cutoff}")
+    finally:
+        _retention_lock.release()
+
+# =============================================================================
+# WRITE-BEHIND QUEUE - one per process, drained at interpreter exit
+# =============================================================================
+
+_writer: Optional[ChatWriteQueue] = None
+_writer_lock = threading.Lock()
+
+def _get_writer() -> ChatWriteQueue:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ChatWriteQueue(DATABASE_PATH, durability=LEDGER_DURABILITY,
+                                         insert_sql=INSERT_SQL, name="llm-ledger")
+                atexit.register(_writer.stop)
+    return _writer
+
+def flush_ledger_writes(timeout: float = 5.0) -> bool:
+    """Commit queued ledger rows; no-op if nothing was recorded in this process"""
+    return _writer.flush(timeout) if _writer is not None else True
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+def record_llm_call(feature: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                    latency_ms: float = 0.0, cache_hit: bool = False, error_class: Optional[str] = None,
+                    provider: str = "openai", queue_wait_ms: float = 0.0, attempts: int = 1,
+                    priority: Optional[str] = None, estimated: bool = False):
+    """Queue one call for the ledger; never raises"""
+    try:
+        _ensure_table()
+        if time.monotonic() - _last_retention >= LEDGER_RETENTION_INTERVAL_S:
+            _apply_retention()
+        now = datetime.now(timezone.utc)
+        prompt_tokens, completion_tokens = int(prompt_tokens or 0), int(completion_tokens or 0)
+        cost = 0.0 if cache_hit else estimate_cost(model, prompt_tokens, completion_tokens)
+        _get_writer().enqueue_row((
+            now.isoformat(timespec='milliseconds'), now.strftime('%Y-%m-%d'), feature, provider,
+            model or 'unknown', prompt_tokens, completion_tokens, prompt_tokens + completion_tokens,
+            int(estimated), round(cost, 6), round(latency_ms, 1), round(queue_wait_ms, 1),
+            attempts, priority, int(cache_hit), error_class))
+        increment("llm.tokens", prompt_tokens + completion_tokens, feature=feature)
+    except Exception as e:
+        log_debug("record_llm_call", 196, f"Could not record {feature} call to {model}", e)
+
+def record_chat_completion(feature: str, request: Dict, response=None, error: Exception = None,
+                           latency_ms: float = 0.0, **extra):
+    """record_llm_call() from an OpenAI-style request/response pair, estimating tokens without usage"""
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    estimated = prompt_tokens is None or completion_tokens is None
+    if error is not None:
+        # Failed requests are not billed
+        prompt_tokens, completion_tokens, estimated = 0, 0, False
+    elif estimated:
+        prompt_tokens = sum(len(m.get('content') or '') for m in request.get('messages') or []) // 4
+        completion_tokens = 0
+        if response is not None:
+            try:
+                completion_tokens = len(response.choices[0].message.content or '') // 4
+            except (AttributeError, IndexError, TypeError):
+                pass
+    record_llm_call(feature, request.get('model', 'unknown'), prompt_tokens, completion_tokens,
+                    latency_ms=latency_ms, error_class=type(error).__name__ if error else None,
+                    estimated=estimated, **extra)
+
+# =============================================================================
+# AGGREGATES
+# =============================================================================
+
+def _since(days: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=max(days, 1) - 1)).strftime('%Y-%m-%d')
+
+def _query(sql: str, params: tuple) -> List[tuple]:
+    _ensure_table()
+    flush_ledger_writes()
+    return get_read_connection(DATABASE_PATH).execute(sql, params).fetchall()
+
+def get_tokens_by_feature_per_day(days: int = 7) -> List[Dict]:
+    """Token, cost and call totals per (day, feature), newest day first"""
+    rows = _query("""
+        SELECT day, feature, COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens),
+               SUM(cost_usd), SUM(cache_hit), SUM(error_class IS NOT NULL)
+        FROM llm_calls WHERE day >= ?
+        GROUP BY day, feature
+        ORDER BY day DESC, SUM(total_tokens) DESC
+    """, (_since(days),))
+    return [{'day': day, 'feature': feature, 'calls': calls, 'prompt_tokens': prompt or 0,
+             'completion_tokens': completion or 0, 'total_tokens': total or 0,
+             'cost_usd': round(cost or 0.0, 4), 'cache_hits': hits or 0, 'errors': errors or 0}
+            for day, feature, calls, prompt, completion, total, cost, hits, errors in rows]
+
+def get_latency_by_model(days: int = 7) -> List[Dict]:
+    """Latency percentiles per model over calls that reached the model (cache hits excluded)"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for model, latency_ms, error_class in _query("""
+        SELECT model, latency_ms, error_class FROM llm_calls
+        WHERE day >= ? AND cache_hit = 0
+    """, (_since(days),)):
+        latencies.setdefault(model, []).append(latency_ms or 0.0)
+        errors[model] = errors.get(model, 0) + (error_class is not None)
+
+    results = []
+    for model, values in latencies.items():
+        ordered = sorted(values)
+        results.append({'model': model, 'calls': len(ordered), 'errors': errors[model],
+                        'p50_ms': round(_percentile(ordered, 0.50), 1),
+                        'p95_ms': round(_percentile(ordered, 0.95), 1),
+                        'max_ms': round(ordered[-1], 1)})
+    return sorted(results, key=lambda r: -r['p95_ms'])
+
+def get_feature_summary(days: int = 7) -> List[Dict]:
+    """Per feature: calls, cache hit ratio, errors by class, tokens, cost and p95 latency"""
+    features: Dict[str, Dict] = {}
+    for feature, latency_ms, total_tokens, cost, cache_hit, error_class in _query("""
+        SELECT feature, latency_ms, total_tokens, cost_usd, cache_hit, error_class FROM llm_calls
+        WHERE day >= ?
+    """, (_since(days),)):
+        entry = features.setdefault(feature, {'feature': feature, 'calls': 0, 'cache_hits': 0,
+                                              'total_tokens': 0, 'cost_usd': 0.0, 'errors': {},
+                                              '_latencies': []})
+        entry['calls'] += 1
+        entry['cache_hits'] += cache_hit
+        entry['total_tokens'] += total_tokens or 0
+        entry['cost_usd'] += cost or 0.0
+        if error_class:
+            entry['errors'][error_class] = entry['errors'].get(error_class, 0) + 1
+        if not cache_hit:
+            entry['_latencies'].append(latency_ms or 0.0)
+
+    for entry in features.values():
+        ordered = sorted(entry.pop('_latencies'))
+        entry['cache_hit_ratio'] = round(entry['cache_hits'] / entry['calls'], 3)
+        entry['cost_usd'] = round(entry['cost_usd'], 4)
+        entry['p95_ms'] = round(_percentile(ordered, 0.95), 1)
+    return sorted(features.values(), key=lambda e: -e['total_tokens'])
+
+def get_ledger_summary(days: int = 7) -> Dict:
+    return {'days': days,
+            'by_feature': get_feature_summary(days),
+            'by_model': get_latency_by_model(days),
+            'by_feature_per_day': get_tokens_by_feature_per_day(days)}
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise the LLM call ledger")
+    parser.add_argument("--days", type=int, default=7, help="Days to include, counting today (default 7)")
+    args = parser.parse_args()
+    print(json.dumps(get_ledger_summary(args.days), indent=2))
@@ -0,0 +1,332 @@
+"""
+LLM SCHEDULER MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+===========================================================
+PURPOSE: One rate-limit aware gate for every OpenAI chat completion in the process
+FEATURES: RPM/TPM token buckets, priority queue, 429/5xx retry with jittered backoff, wait metrics
+ARCHITECTURE: Callers block in chat_completion() until the scheduler admits them, then call
+              the API on their own thread - no extra worker pool
+
+HOW IT WORKS:
+- Each call is estimated at (prompt characters / 4) + max_tokens tokens
+- Admission needs one request from the RPM bucket, the estimate from the TPM bucket
+  and a free in-flight slot. Only the head of the priority queue is admitted, so
+  interactive calls go ahead of background jobs, and background jobs ahead of batch runs
+- After the call the TPM bucket is corrected with response.usage.total_tokens
+- 429, 5xx, timeouts and connection errors are retried up to MAX_RETRIES times with
+  full-jitter exponential backoff (Retry-After is honoured). A 429 pauses admission
+  for everyone, since the account limit is shared
+- Other errors (auth, bad request) are raised at once; callers keep their own
+  error strings
+- Every call is written to the llm_ledger after its last attempt (tokens, latency,
+  queue wait, attempts, error class)
+
+PRIORITY:
+- chat_completion(..., priority=...) or, for code that does not pass it through,
+  `with llm_priority(BATCH):` on the calling thread (job workers and batch_reports do)
+
+CONFIGURATION (environment):
+- LLM_REQUESTS_PER_MINUTE (default 3500), LLM_TOKENS_PER_MINUTE (default 90000)
+- LLM_MAX_IN_FLIGHT (default 8), LLM_MAX_RETRIES (default 4)
+
+DEBUGGING SYSTEM:
+- Retries logged with status, attempt and backoff
+- get_scheduler_stats() reports queue depth, bucket levels and queue-wait p50/p95
+  per priority
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from instrumentation import get_logger, log_event, span
+from llm_ledger import record_chat_completion
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("llm_scheduler")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+REQUESTS_PER_MINUTE = float(os.environ.get('LLM_REQUESTS_PER_MINUTE', 3500))
+TOKENS_PER_MINUTE = float(os.environ.get('LLM_TOKENS_PER_MINUTE', 90000))
+MAX_IN_FLIGHT = int(os.environ.get('LLM_MAX_IN_FLIGHT', 8))
+MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 4))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+WAIT_SAMPLES = 500
+
+INTERACTIVE, BACKGROUND, BATCH = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background', BATCH: 'batch'}
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = ('APIConnectionError', 'APITimeoutError', 'InternalServerError', 'RateLimitError')
+
+def estimate_request_tokens(messages, max_tokens: int) -> int:
+    chars = sum(len(m.get('content') or '') for m in messages or [])
+    return chars // 4 + int(max_tokens or 0)
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# =============================================================================
+# TOKEN BUCKET
+# =============================================================================
+
+class TokenBucket:
+    """Refills continuously at per_minute / 60 per second, up to one minute's worth"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (requests larger than capacity need a full bucket)"""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0.0
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= amount
+
+    def give_back(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+_thread_priority = threading.local()
+
+@contextmanager
+def llm_priority(priority: int):
+    """Default priority for chat_completion() calls made on this thread"""
+    previous = getattr(_thread_priority, 'value', None)
+    _thread_priority.value = priority
+    try:
+        yield
+    finally:
+        _thread_priority.value = previous
+
+def current_priority() -> int:
+    value = getattr(_thread_priority, 'value', None)
+    return INTERACTIVE if value is None else value
+
+class LLMScheduler:
+    """
+    Admits LLM calls in priority order within RPM/TPM budgets and retries transient failures
+    """
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = TOKENS_PER_MINUTE,
+                 max_in_flight: int = MAX_IN_FLIGHT, max_retries: int = MAX_RETRIES):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+        self._stats = {'calls': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'rate_limited': 0,
+                       'max_queue_depth': 0, 'tokens_used': 0}
+        self._by_feature: Dict[str, int] = {}
+
+    # -------------------------------------------------------------------------
+    # Admission
+    # -------------------------------------------------------------------------
+
+    def _acquire(self, priority: int, estimate: int) -> float:
+        """Block until admitted; returns seconds spent queued"""
+        enqueued = time.monotonic()
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], len(self._queue))
+            while True:
+                now = time.monotonic()
+                if self._queue[0] == ticket and self._in_flight < self.max_in_flight:
+                    wait = max(self._paused_until - now,
+                               self.requests.wait_time(1, now),
+                               self.tokens.wait_time(estimate, now))
+                    if wait <= 0:
+                        heapq.heappop(self._queue)
+                        self.requests.take(1, now)
+                        self.tokens.take(estimate, now)
+                        self._in_flight += 1
+                        # The next ticket may be admissible too
+                        self._cond.notify_all()
+                        break
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+        waited = time.monotonic() - enqueued
+        self._waits[priority].append(waited)
+        return waited
+
+    def _release(self, estimate: int, actual: Optional[int]):
+        with self._cond:
+            self._in_flight -= 1
+            if actual is not None:
+                # Correct the estimate: refund unused tokens, or charge the overrun
+                if actual < estimate:
+                    self.tokens.give_back(estimate - actual)
+                else:
+                    self.tokens.take(actual - estimate, time.monotonic())
+                self._stats['tokens_used'] += actual
+            self._cond.notify_all()
+
+    def _pause(self, seconds: float):
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Calls
+    # -------------------------------------------------------------------------
+
+    def call(self, client, priority: Optional[int] = None, feature: str = "general", **request):
+        """
+        client.chat.completions.create(**request) once admitted, retrying transient errors.
+        Raises the last error when retries run out or the error is not retryable.
+        """
+        priority = current_priority() if priority is None else priority
+        estimate = estimate_request_tokens(request.get('messages'), request.get('max_tokens', 0))
+        with self._cond:
+            self._stats['calls'] += 1
+            self._by_feature[feature] = self._by_feature.get(feature, 0) + 1
+
+        queue_wait = 0.0
+        for attempt in range(self.max_retries + 1):
+            queue_wait += self._acquire(priority, estimate)
+            start = time.perf_counter()
+            try:
+                with span("llm", feature):
+                    response = client.chat.completions.create(**request)
+            except Exception as e:
+                self._release(estimate, None)
+                status = getattr(e, 'status_code', None)
+                retryable = status in RETRYABLE_STATUS or type(e).__name__ in RETRYABLE_ERRORS
+                if not retryable or attempt == self.max_retries:
+                    with self._cond:
+                        self._stats['failed'] += 1
+                    record_chat_completion(feature, request, error=e,
+                                           latency_ms=(time.perf_counter() - start) * 1000,
+                                           queue_wait_ms=queue_wait * 1000, attempts=attempt + 1,
+                                           priority=PRIORITY_NAMES.get(priority))
+                    raise
+
+                backoff = self._backoff(attempt, e)
+                with self._cond:
+                    self._stats['retries'] += 1
+                    if status == 429 or type(e).__name__ == 'RateLimitError':
+                        self._stats['rate_limited'] += 1
+                if status == 429 or type(e).__name__ == 'RateLimitError':
+                    self._pause(backoff)
+                log_debug("LLMScheduler.call", 256, f"{feature}: {type(e).__name__} (status {status}) - "
+                                                    f"retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s")
+                time.sleep(backoff)
+                continue
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            usage = getattr(response, 'usage', None)
+            self._release(estimate, getattr(usage, 'total_tokens', None))
+            with self._cond:
+                self._stats['succeeded'] += 1
+            record_chat_completion(feature, request, response, latency_ms=latency_ms,
+                                   queue_wait_ms=queue_wait * 1000, attempts=attempt + 1,
+                                   priority=PRIORITY_NAMES.get(priority))
+            return response
+
+    @staticmethod
+    def _backoff(attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff; a Retry-After header sets the floor"""
+        delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        try:
+            retry_after = float(error.response.headers.get('retry-after'))
+            delay = max(delay, min(retry_after, BACKOFF_MAX_SECONDS))
+        except (AttributeError, TypeError, ValueError):
+            pass
+        return delay
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._cond:
+            now = time.monotonic()
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            stats = dict(self._stats)
+            stats.update({
+                'queue_depth': len(self._queue),
+                'in_flight': self._in_flight,
+                'paused_seconds': round(max(0.0, self._paused_until - now), 2),
+                'requests_available': round(self.requests.level, 1),
+                'tokens_available': round(self.tokens.level),
+                'calls_by_feature': dict(self._by_feature),
+            })
+            waits = {PRIORITY_NAMES[p]: list(samples) for p, samples in self._waits.items()}
+        stats['queue_wait'] = {
+            name: {
+                'count': len(samples),
+                'p50_ms': round(_percentile(samples, 0.50) * 1000, 1),
+                'p95_ms': round(_percentile(samples, 0.95) * 1000, 1),
+                'max_ms': round(max(samples, default=0.0) * 1000, 1),
+            }
+            for name, samples in waits.items()
+        }
+        return stats
+
+# =============================================================================
+# MODULE SINGLETON - one scheduler per process (the API limit is per account)
+# =============================================================================
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+def chat_completion(client, priority: Optional[int] = None, feature: str = "general", **request):
+    """Scheduled drop-in for client.chat.completions.create(**request)"""
+    return get_llm_scheduler().call(client, priority=priority, feature=feature, **request)
+
+def get_scheduler_stats() -> Dict:
+    return get_llm_scheduler().stats()
@@ -0,0 +1,191 @@
+"""
+MATCHUP ENGINE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+============================================================
+PURPOSE: League-wide 32x32 numeric matchup advantage matrix
+FEATURES: Formation-vs-defense, red zone, third down and personnel edges, ranked queries
+ARCHITECTURE: NumPy broadcasting over the league snapshot, cached per data version
+
+HOW EDGES ARE COMPUTED (row team = offense, column team = opponent):
+- All metrics are z-scored across the league first; missing data counts as league average
+- Formation edge: usage-weighted sum over personnel packages of the offense's
+  YPP/success z-score minus the opponent's z-score in the same package.
+  The teams table only carries offensive metrics, so a team's own efficiency in
+  a package stands in for how well its defense handles that package.
+- Red zone / third down edge: offense z-score minus opponent z-score
+- Personnel edge: mean personnel-strength z-score difference
+- Total edge: weighted sum (EDGE_WEIGHTS), diagonal left as NaN
+
+DEBUGGING SYSTEM:
+- Matrix builds logged with shape and timing
+"""
+
+import time
+import warnings
+import numpy as np
+import streamlit as st
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import get_logger, log_event
+from league_data import FORMATIONS, LeagueSnapshot, get_league_snapshot
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("matchup_engine")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# EDGE CONFIGURATION
+# =============================================================================
+
+EDGE_WEIGHTS = {
+    'formation': 0.4,
+    'red_zone': 0.2,
+    'third_down': 0.2,
+    'personnel': 0.2
+}
+
+EDGE_LABELS = {
+    'formation': 'Formation vs Defense',
+    'red_zone': 'Red Zone',
+    'third_down': 'Third Down',
+    'personnel': 'Personnel',
+    'total': 'Total Edge'
+}
+
+PERSONNEL_METRICS = ['offensive_line_strength', 'receiving_corps_depth', 'backfield_versatility', 'tight_end_usage']
+
+def _zscore(values: np.ndarray) -> np.ndarray:
+    """
+    Column-wise z-score with NaN (missing data) mapped to 0 = league average
+    """
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        z = (values - mean) / np.where(std > 0, std, 1.0)
+    return np.nan_to_num(z, nan=0.0)
+
+def _columns(snapshot: LeagueSnapshot, metric_keys: List[str]) -> np.ndarray:
+    return snapshot.values[:, [snapshot.metric_index[key] for key in metric_keys]]
+
+# =============================================================================
+# MATCHUP MATRIX
+# =============================================================================
+
+class MatchupMatrix:
+    """
+    Advantage matrices for every (offense, opponent) pair in the league.
+    components[name][i, j] is team i's edge against team j; positive favors i.
+    """
+    def __init__(self, snapshot: LeagueSnapshot):
+        self.data_version = snapshot.data_version
+        self.team_names: List[str] = list(snapshot.team_names)
+        self.team_index = dict(snapshot.team_index)
+        n_teams = len(self.team_names)
+
+        # Formation usage (teams x formations), renormalized; no data -> even split
+        usage = np.nan_to_num(_columns(snapshot, [f"{f}_usage" for f in FORMATIONS]), nan=0.0)
+        usage_totals = usage.sum(axis=1, keepdims=True)
+        usage = np.where(usage_totals > 0, usage / np.where(usage_totals > 0, usage_totals, 1.0), 1.0 / len(FORMATIONS))
+
+        ypp_z = _zscore(_columns(snapshot, [f"{f}_ypp" for f in FORMATIONS]))
+        success_z = _zscore(_columns(snapshot, [f"{f}_success_rate" for f in FORMATIONS]))
+        package_strength = (ypp_z + success_z) / 2.0
+
+        # (offense x opponent x formation) -> weighted by the offense's usage
+        package_diff = package_strength[:, None, :] - package_strength[None, :, :]
+        formation_edge = (usage[:, None, :] * package_diff).sum(axis=2)
+
+        red_zone_z = _zscore(_columns(snapshot, ['red_zone_efficiency']))[:, 0]
+        third_down_z = _zscore(_columns(snapshot, ['third_down_conversion']))[:, 0]
+        personnel_z = _zscore(_columns(snapshot, PERSONNEL_METRICS)).mean(axis=1) if n_teams else np.zeros(0)
+
+        self.components: Dict[str, np.ndarray] = {
+            'formation': formation_edge,
+            'red_zone': red_zone_z[:, None] - red_zone_z[None, :],
+            'third_down': third_down_z[:, None] - third_down_z[None, :],
+            'personnel': personnel_z[:, None] - personnel_z[None, :]
+        }
+
+        total = sum(EDGE_WEIGHTS[name] * matrix for name, matrix in self.components.items())
+        self.components['total'] = total if n_teams else np.zeros((0, 0))
+
+        for matrix in self.components.values():
+            np.fill_diagonal(matrix, np.nan)
+
+    def get_edge(self, offense: str, opponent: str) -> Optional[Dict[str, float]]:
+        """Edge breakdown for one ordered pair, or None if a team is unknown"""
+        if offense not in self.team_index or opponent not in self.team_index or offense == opponent:
+            return None
+        i, j = self.team_index[offense], self.team_index[opponent]
+        return {name: float(matrix[i, j]) for name, matrix in self.components.items()}
+
+    def best_matchups(self, top_n: int = 10, slate: Optional[List[Tuple[str, str]]] = None,
+                      component: str = 'total') -> List[Dict]:
+        """
+        Rank the largest edges.
+
+        Args:
+            top_n: Number of results
+            slate: Optional list of (team_a, team_b) games this week; both
+                   directions of each game are ranked. None ranks all pairs.
+            component: Edge component to rank by ('total', 'formation', ...)
+
+        Returns:
+            List of dicts with offense, opponent, edge and the full breakdown
+        """
+        matrix = self.components[component]
+
+        if slate is not None:
+            pairs = [(a, b) for game in slate for a, b in (game, game[::-1])
+                     if a in self.team_index and b in self.team_index and a != b]
+            if not pairs:
+                return []
+            rows = np.array([self.team_index[a] for a, _ in pairs])
+            cols = np.array([self.team_index[b] for _, b in pairs])
+            edges = matrix[rows, cols]
+            order = np.argsort(-edges)[:top_n]
+            ranked = [(rows[k], cols[k]) for k in order]
+        else:
+            flat = np.where(np.isnan(matrix), -np.inf, matrix).ravel()
+            top_n = min(top_n, int(np.isfinite(flat).sum()))
+            if top_n <= 0:
+                return []
+            top_idx = np.argpartition(-flat, top_n - 1)[:top_n]
+            top_idx = top_idx[np.argsort(-flat[top_idx])]
+            ranked = [divmod(int(k), matrix.shape[1]) for k in top_idx]
+
+        return [
+            {
+                'offense': self.team_names[i],
+                'opponent': self.team_names[j],
+                'edge': float(matrix[i, j]),
+                'breakdown': {name: float(m[i, j]) for name, m in self.components.items()}
+            }
+            for i, j in ranked
+        ]
+
+@st.cache_resource
+def get_matchup_matrix(data_version: str) -> MatchupMatrix:
+    """
+    Build (once per data version) the league matchup matrix shared by all sessions
+    """
+    try:
+        start_time = time.perf_counter()
+        matrix = MatchupMatrix(get_league_snapshot(data_version))
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        log_debug("get_matchup_matrix", 185,
+                  f"Matchup matrix built: {len(matrix.team_names)}x{len(matrix.team_names)} in {elapsed_ms:.1f} ms")
+        return matrix
+
+    except Exception as e:
+        log_debug("get_matchup_matrix", 190, "Matchup matrix build failed", e)
+        raise
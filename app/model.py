@@ -1,8 +1,10 @@
 # app/model.py
 import os
+import time
 from typing import List, Optional
 from huggingface_hub import InferenceClient
 from huggingface_hub.utils._errors import HfHubHTTPError
+from llm_ledger import record_llm_call
 
 # FIXED: Reordered models with most reliable first, removed broken TinyLlama
 OPEN_MODELS: List[str] = [
@@ -27,9 +29,11 @@ class LLMBackend:
             self._clients[model] = InferenceClient(model=model, token=self.api_token)
         return self._clients[model]
 
-    def chat(self, system: str, user: str, max_new_tokens: int = 512, temperature: float = 0.4) -> str:
+    def chat(self, system: str, user: str, max_new_tokens: int = 512, temperature: float = 0.4,
+             feature: str = "hf_chat") -> str:
         last_err = None
         for model in self.models:
+            start = time.perf_counter()
             try:
                 cli = self._client(model)
                 # 1) try chat endpoint (fast for chat-tuned models)
@@ -40,7 +44,7 @@ class LLMBackend:
                         temperature=temperature,
                         top_p=0.9
                     )
-                    return out.choices[0].message["content"]
+                    text = out.choices[0].message["content"]
                 except Exception:
                     # 2) fallback to text-generation with tight decoding
                     prompt = f"[System]\n{system}\n\n[User]\n{user}\n\n[Assistant]\n"
@@ -52,13 +56,19 @@ class LLMBackend:
                         repetition_penalty=1.1,
                         return_full_text=False,
                     )
-                    return txt.strip()
+                    text = txt.strip()
+                # HF inference returns no usage, so tokens are estimated from characters
+                record_llm_call(feature, model, (len(system) + len(user)) // 4, len(text) // 4,
+                                latency_ms=(time.perf_counter() - start) * 1000,
+                                provider="huggingface", estimated=True)
+                return text
             except HfHubHTTPError as e:
                 last_err = e
-                continue
             except Exception as e:
                 last_err = e
-                continue
+            # One row per model tried, so each model's latency and errors stand on their own
+            record_llm_call(feature, model, latency_ms=(time.perf_counter() - start) * 1000,
+                            provider="huggingface", error_class=type(last_err).__name__)
 
         msg = (
             "All inference backends failed (model may be gated or rate-limited). "
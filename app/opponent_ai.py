@@ -5,7 +5,7 @@ AI_INSTRUCTIONS = "You are the Opponent AI Coach. Given the same context, propos
 
 def generate_ai_plan(llm, context_text: str, user_prompt: str):
     user_msg = f"{AI_INSTRUCTIONS}\n\nContext:\n{context_text}\n\nUser prompt:\n{user_prompt}"
-    out = llm.chat(SYSTEM_PROMPT, user_msg)
+    out = llm.chat(SYSTEM_PROMPT, user_msg, feature="opponent_plan")
     if not out.strip().startswith("{"):
         out = '{"picks": ["Mix coverages, bracket WR1", "Blitz selectively vs 3rd & long"], "rationale": "Counter deep shots; disrupt timing."}'
     try:
@@ -1,18 +1,65 @@
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
 from reportlab.lib.pagesizes import LETTER
-from reportlab.pdfgen import canvas
-from textwrap import wrap
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import ListFlowable, ListItem, PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+MARGIN = 72
+
+@lru_cache(maxsize=1)
+def _styles():
+    # Built once per process and shared by every page and document
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle("EdgeTitle", parent=base["Title"], fontName="Helvetica-Bold",
+                                fontSize=16, leading=20, alignment=0, spaceAfter=12),
+        "tldr": ParagraphStyle("EdgeTldr", parent=base["BodyText"], fontName="Helvetica",
+                               fontSize=12, leading=16, spaceAfter=8),
+        "bullet": ParagraphStyle("EdgeBullet", parent=base["BodyText"], fontName="Helvetica",
+                                 fontSize=12, leading=16, spaceAfter=8),
+        "footer": ParagraphStyle("EdgeFooter", fontName="Helvetica", fontSize=8),
+    }
+
+def edge_sheet_flowables(title: str, tldr: str, bullets: list) -> list:
+    styles = _styles()
+    items = [Paragraph(escape(title), styles["title"]),
+             Paragraph("<b>TL;DR:</b> " + escape(tldr), styles["tldr"]),
+             Spacer(1, 8)]
+    if bullets:
+        items.append(ListFlowable(
+            [ListItem(Paragraph(escape(b), styles["bullet"]), leftIndent=12) for b in bullets],
+            bulletType="bullet", start="•", leftIndent=12))
+    return items
+
+def _footer(canvas, doc):
+    canvas.saveState()
+    canvas.setFont(_styles()["footer"].fontName, _styles()["footer"].fontSize)
+    canvas.drawRightString(LETTER[0] - MARGIN, MARGIN / 2, f"Page {doc.page}")
+    canvas.restoreState()
+
+def render_edge_sheets(sheets: list, out=None) -> bytes:
+    """Render [{'title', 'tldr', 'bullets'}, ...] into one paginated PDF, one sheet per page run.
+    out may be a path or a binary file object; by default the PDF is built in memory.
+    Returns the PDF bytes when rendering to memory, otherwise b''."""
+    target = BytesIO() if out is None else out
+    doc = SimpleDocTemplate(target, pagesize=LETTER, leftMargin=MARGIN, rightMargin=MARGIN,
+                            topMargin=MARGIN, bottomMargin=MARGIN,
+                            title=sheets[0]["title"] if len(sheets) == 1 else "GRIT Edge Sheets")
+    story = []
+    for i, sheet in enumerate(sheets):
+        if i:
+            story.append(PageBreak())
+        story.extend(edge_sheet_flowables(sheet["title"], sheet.get("tldr", ""), sheet.get("bullets", [])))
+    doc.build(story, onFirstPage=_footer, onLaterPages=_footer)
+    return target.getvalue() if out is None else b""
+
+def edge_sheet_pdf_bytes(title: str, tldr: str, bullets: list) -> bytes:
+    return render_edge_sheets([{"title": title, "tldr": tldr, "bullets": bullets}])
 
 def export_edge_sheet_pdf(filepath: str, title: str, tldr: str, bullets: list):
-    c = canvas.Canvas(filepath, pagesize=LETTER)
-    width, height = LETTER
-    y = height - 72
-    c.setFont("Helvetica-Bold", 16); c.drawString(72, y, title); y -= 28
-    c.setFont("Helvetica", 12)
-    for line in wrap("TL;DR: " + tldr, 95):
-        c.drawString(72, y, line); y -= 16
-    y -= 8
-    for b in bullets:
-        for line in wrap("• " + b, 95):
-            c.drawString(72, y, line); y -= 16
-        y -= 8
-    c.showPage(); c.save()
+    render_edge_sheets([{"title": title, "tldr": tldr, "bullets": bullets}], filepath)
+
+def export_edge_sheets_pdf(filepath: str, sheets: list):
+    render_edge_sheets(sheets, filepath)
@@ -0,0 +1,213 @@
+"""
+PROMPT COMPILER MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=============================================================
+PURPOSE: Compact, token-budgeted team data for GPT prompts
+FEATURES: Side-by-side team tables, per-section token budgets, priority-based field dropping
+ARCHITECTURE: Works on validate_and_extract_team_data() output; reports savings per call
+
+HOW IT WORKS:
+- Each section (formations, situational, personnel, coaching, stadium) becomes one
+  pipe table with a row per field and a column per team - no JSON keys or indentation
+- Rows where no team has data are skipped outright
+- If a section is over its token budget, the lowest-priority rows are dropped first
+- Tokens are estimated at ~4 characters per token (no tokenizer dependency)
+- Savings are measured against json.dumps(indent=2) of the same data
+
+DEBUGGING SYSTEM:
+- Every compilation logged with tokens used, baseline tokens, savings and dropped rows
+"""
+
+import json
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("prompt_compiler")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# SECTION DEFINITIONS - (label, key, priority, formatter); higher priority kept longer
+# =============================================================================
+
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+def _pct(value) -> Optional[str]:
+    return f"{value * 100:.0f}%" if isinstance(value, (int, float)) and value > 0 else None
+
+def _text(value) -> Optional[str]:
+    return str(value) if value not in (None, '', 'Unknown') else None
+
+def _dome(value) -> Optional[str]:
+    return ('dome' if value else 'outdoor') if isinstance(value, bool) else None
+
+def _formation(stats) -> Optional[str]:
+    if not isinstance(stats, dict) or not stats.get('ypp'):
+        return None
+    return f"{stats.get('usage', 0) * 100:.0f}/{stats['ypp']:.1f}/{stats.get('success_rate', 0) * 100:.0f}"
+
+SECTION_FIELDS = {
+    'formations': [
+        ('11p', '11_personnel', 4, _formation),
+        ('12p', '12_personnel', 3, _formation),
+        ('21p', '21_personnel', 2, _formation),
+        ('10p', '10_personnel', 1, _formation),
+    ],
+    'situational': [
+        ('3rd down', 'third_down_conversion', 4, _pct),
+        ('Red zone', 'red_zone_efficiency', 4, _pct),
+        ('Goal line', 'goal_line_success', 3, _pct),
+        ('2-minute', 'two_minute_efficiency', 2, _pct),
+    ],
+    'personnel': [
+        ('O-line', 'offensive_line_strength', 3, _pct),
+        ('WR depth', 'receiving_corps_depth', 3, _pct),
+        ('Backfield', 'backfield_versatility', 2, _pct),
+        ('TE usage', 'tight_end_usage', 1, _pct),
+    ],
+    'coaching': [
+        ('Philosophy', 'philosophy', 3, _text),
+        ('HC', 'head_coach', 2, _text),
+        ('OC', 'offensive_coordinator', 1, _text),
+    ],
+    'stadium': [
+        ('Roof', 'is_dome', 2, _dome),
+        ('Surface', 'surface', 2, _text),
+        ('Stadium', 'name', 1, _text),
+    ],
+}
+
+SECTION_TITLES = {
+    'formations': 'FORMATIONS (use%/YPP/success%)',
+    'situational': 'SITUATIONAL',
+    'personnel': 'PERSONNEL',
+    'coaching': 'COACHING',
+    'stadium': 'STADIUM',
+}
+
+DEFAULT_SECTION_BUDGETS = {
+    'formations': 80,
+    'situational': 50,
+    'personnel': 50,
+    'coaching': 60,
+    'stadium': 40,
+}
+
+ALL_SECTIONS = list(SECTION_FIELDS.keys())
+
+# Running totals across calls (tokens sent vs the json.dumps baseline)
+_savings_lock = threading.Lock()
+_savings_totals = {'calls': 0, 'tokens': 0, 'baseline_tokens': 0}
+
+# =============================================================================
+# TABLE RENDERING
+# =============================================================================
+
+def _render_table(title: str, team_names: List[str], rows: List[Tuple[str, List[str]]]) -> str:
+    lines = [f"{title} | " + " | ".join(team_names)]
+    lines += [f"{label} | " + " | ".join(cells) for label, cells in rows]
+    return "\n".join(lines)
+
+def compile_section(section: str, teams: List[Tuple[str, Dict]], budget: Optional[int] = None) -> Tuple[str, List[str]]:
+    """
+    Render one section as a pipe table for all teams, within a token budget
+
+    Args:
+        section: Section key (see SECTION_FIELDS)
+        teams: List of (team name, extracted team data) pairs
+        budget: Token budget; None uses DEFAULT_SECTION_BUDGETS
+
+    Returns:
+        Tuple of (table text or '' if no team has data, dropped row labels)
+    """
+    budget = DEFAULT_SECTION_BUDGETS[section] if budget is None else budget
+    rows = []
+    for label, key, priority, formatter in SECTION_FIELDS[section]:
+        cells = [formatter(data.get(section, {}).get(key)) for _, data in teams]
+        if any(cell is not None for cell in cells):
+            rows.append((priority, label, [cell or '-' for cell in cells]))
+
+    team_names = [name for name, _ in teams]
+    dropped = []
+    while rows:
+        table = _render_table(SECTION_TITLES[section], team_names, [(label, cells) for _, label, cells in rows])
+        if estimate_tokens(table) <= budget or len(rows) == 1:
+            return table, dropped
+        # Drop the lowest priority row (the later one on ties)
+        lowest = min(range(len(rows)), key=lambda i: (rows[i][0], -i))
+        dropped.append(rows.pop(lowest)[1])
+    return '', dropped
+
+def compile_team_context(teams: List[Tuple[str, Dict]], sections: Optional[List[str]] = None,
+                         budgets: Optional[Dict[str, int]] = None, label: str = "prompt") -> Dict:
+    """
+    Compile team data for a prompt and report the tokens saved
+
+    Args:
+        teams: List of (team name, validate_and_extract_team_data() output) pairs
+        sections: Sections to include (default: all)
+        budgets: Per-section token budgets overriding DEFAULT_SECTION_BUDGETS
+        label: Call site name for the log line
+
+    Returns:
+        Dict with 'text', 'tokens', 'baseline_tokens', 'tokens_saved', 'dropped'
+    """
+    sections = sections or ALL_SECTIONS
+    budgets = {**DEFAULT_SECTION_BUDGETS, **(budgets or {})}
+
+    try:
+        tables, dropped = [], {}
+        for section in sections:
+            table, section_dropped = compile_section(section, teams, budgets[section])
+            if table:
+                tables.append(table)
+            if section_dropped:
+                dropped[section] = section_dropped
+
+        text = "\n\n".join(tables)
+        baseline = "\n".join(
+            json.dumps({section: data.get(section, {}) for section in sections}, indent=2, default=str)
+            for _, data in teams
+        )
+        tokens, baseline_tokens = estimate_tokens(text), estimate_tokens(baseline)
+
+        with _savings_lock:
+            _savings_totals['calls'] += 1
+            _savings_totals['tokens'] += tokens
+            _savings_totals['baseline_tokens'] += baseline_tokens
+
+        log_debug("compile_team_context", 183,
+                  f"{label}: {tokens} tokens vs {baseline_tokens} baseline "
+                  f"(saved {baseline_tokens - tokens}), dropped {dropped or 'nothing'}")
+        return {
+            'text': text,
+            'tokens': tokens,
+            'baseline_tokens': baseline_tokens,
+            'tokens_saved': baseline_tokens - tokens,
+            'dropped': dropped
+        }
+
+    except Exception as e:
+        log_debug("compile_team_context", 195, f"{label}: compilation failed - falling back to JSON", e)
+        text = "\n".join(json.dumps(data, default=str) for _, data in teams)
+        return {'text': text, 'tokens': estimate_tokens(text), 'baseline_tokens': estimate_tokens(text),
+                'tokens_saved': 0, 'dropped': {}}
+
+def get_prompt_savings_stats() -> Dict:
+    """Totals across all compilations since startup"""
+    with _savings_lock:
+        return {**_savings_totals, 'tokens_saved': _savings_totals['baseline_tokens'] - _savings_totals['tokens']}
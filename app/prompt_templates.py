@@ -0,0 +1,297 @@
+"""
+PROMPT TEMPLATES MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+==============================================================
+PURPOSE: Precompiled GPT prompts with a static prefix and a slot-filled suffix
+FEATURES: Template registry, shared analyst system message, byte-identical prefixes
+ARCHITECTURE: Templates are built once at import; each call only fills string.Template slots
+
+WHY THE SPLIT:
+- Everything that never changes (system message, instructions, output format) sits
+  in the prefix, which is assembled once at import instead of re-formatted per call
+- Everything call-specific (teams, question, data tables) goes in the suffix
+- Prefixes are about 50-320 tokens, well under OpenAI's 1024-token minimum for
+  prompt caching, so the split saves formatting work only - not API tokens
+
+DEBUGGING SYSTEM:
+- Each template exposes prefix_tokens (fixed prompt cost) and prefix_hash (changes
+  whenever a template's static text is edited)
+- Unknown template names and missing slots raise immediately (KeyError)
+"""
+
+import hashlib
+from string import Template
+from typing import Dict, List
+
+from prompt_compiler import estimate_tokens
+
+# =============================================================================
+# SYSTEM MESSAGES
+# =============================================================================
+
+ANALYST_SYSTEM_MESSAGE = """You are an expert NFL strategic analyst with coordinator-level knowledge. You think like Bill Belichick, call plays like Andy Reid, and analyze like a professional coach.
+
+Your expertise includes:
+- Formation efficiency and personnel package optimization
+- Situational play calling and down-and-distance strategy
+- Weather impact analysis and game situation management
+- Matchup exploitation and defensive scheme recognition
+- Clock management and strategic decision-making
+
+Provide specific, actionable insights using the provided data. Be direct, strategic, and professional."""
+
+TEAM_REPORT_SYSTEM_MESSAGE = "You are a professional NFL data analyst providing comprehensive team reports."
+ROSTER_SYSTEM_MESSAGE = "You are an NFL data analyst providing structured roster information in JSON format only."
+MATCHUP_SYSTEM_MESSAGE = "You are an expert NFL strategic analyst providing tactical insights for coaching staff."
+REPORT_SYSTEM_MESSAGE = "You are a professional NFL analyst creating formal reports for coaching staff."
+FOLLOW_UP_SYSTEM_MESSAGE = "You are an expert NFL analyst providing specific tactical advice."
+
+# =============================================================================
+# PROMPT TEMPLATE
+# =============================================================================
+
+class PromptTemplate:
+    """
+    One prompt: static system message + static user prefix + string.Template suffix
+    """
+    def __init__(self, name: str, system: str, prefix: str, suffix: str):
+        self.name = name
+        self.system = system
+        self.prefix = prefix
+        self.suffix = Template(suffix)
+        self.prefix_tokens = estimate_tokens(system + prefix)
+        self.prefix_hash = hashlib.sha256((system + prefix).encode('utf-8')).hexdigest()[:12]
+
+    def render(self, **slots) -> str:
+        """User message: the precompiled prefix followed by the filled suffix"""
+        return self.prefix + self.suffix.substitute(slots)
+
+    def messages(self, **slots) -> List[Dict[str, str]]:
+        """Chat completion messages (system + user)"""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**slots)}
+        ]
+
+PROMPT_TEMPLATES: Dict[str, PromptTemplate] = {}
+
+def register_template(name: str, system: str, prefix: str, suffix: str) -> PromptTemplate:
+    template = PromptTemplate(name, system, prefix, suffix)
+    PROMPT_TEMPLATES[name] = template
+    return template
+
+def get_template(name: str) -> PromptTemplate:
+    return PROMPT_TEMPLATES[name]
+
+def render_prompt(name: str, **slots) -> str:
+    return PROMPT_TEMPLATES[name].render(**slots)
+
+def build_messages(name: str, **slots) -> List[Dict[str, str]]:
+    return PROMPT_TEMPLATES[name].messages(**slots)
+
+# =============================================================================
+# SNIPPETS - Optional blocks filled into template suffixes
+# =============================================================================
+
+WEATHER_BLOCK = Template("""
+**WEATHER CONDITIONS:**
+- Temperature: ${temp}°F
+- Wind Speed: ${wind_speed} mph
+- Conditions: ${condition}
+- Strategic Impact: ${impact}
+""")
+
+GAME_SITUATION_BLOCK = Template("""
+**GAME SITUATION:**
+- Down & Distance: ${down} and ${distance}
+- Field Position: ${field_position} yard line
+- Score Differential: ${score_differential}
+- Time Remaining: ${time_remaining}
+- Strategic Context: ${context}
+""")
+
+# =============================================================================
+# ANALYSIS MODULE TEMPLATES (analysis.py)
+# =============================================================================
+
+register_template("strategic_analysis", ANALYST_SYSTEM_MESSAGE, """STRATEGIC ANALYSIS REQUEST
+===========================================
+
+**ANALYSIS REQUIREMENTS:**
+1. Use the specific data provided below to support your analysis
+2. Identify key matchup advantages and disadvantages
+3. Provide actionable strategic recommendations
+4. Consider weather impact on play calling if applicable
+5. Address the specific question with data-driven insights
+6. Think like a professional coordinator - be specific and strategic
+
+**RESPONSE FORMAT:**
+Provide a comprehensive analysis that the coach in ANALYSIS PERSPECTIVE would use for game planning. Include specific formation recommendations, situational strategy, and tactical insights based on the data provided.
+
+""", """**ANALYSIS TYPE:** ${analysis_type}
+**MATCHUP:** ${team1_name} vs ${team2_name}
+**ANALYSIS PERSPECTIVE:** ${coaching_perspective}
+**COMPLEXITY LEVEL:** ${complexity_level}
+**SPECIFIC QUESTION:** ${question}
+
+**TEAM STRATEGIC PROFILES:**
+${team_tables}
+${weather_section}
+${game_section}""")
+
+register_template("basic_analysis", ANALYST_SYSTEM_MESSAGE, """As an expert NFL analyst, provide strategic analysis for the matchup below.
+Use your knowledge of these teams' current season performance, coaching tendencies, and strategic approaches to provide professional-level analysis.
+
+""", """Matchup: ${team1_name} vs ${team2_name}
+Question: ${question}
+Analysis Type: ${analysis_type}
+Coaching Perspective: ${coaching_perspective}
+
+Game Situation:
+- Down & Distance: ${down} and ${distance}
+- Field Position: ${field_position} yard line
+- Score: ${score_differential}
+
+Weather: ${temp}°F, ${condition}, ${wind_speed} mph wind""")
+
+register_template("play_calling", ANALYST_SYSTEM_MESSAGE, """As an NFL offensive coordinator, provide specific play calling recommendations for the situation below.
+
+**PROVIDE:**
+1. Top 3 specific play recommendations with formation and concept
+2. Personnel package selection (11, 12, 21, or 10 personnel)
+3. Route concepts and timing
+4. Risk/reward analysis for each option
+5. Defensive keys to watch pre-snap
+
+Be specific and tactical like a real NFL coordinator would be in the booth.
+
+""", """**SITUATION:** ${down} and ${distance} from the ${field_position} yard line
+
+**YOUR TEAM'S FORMATION EFFICIENCY:**
+${team1_formations}
+
+**OPPONENT'S DEFENSIVE TENDENCIES:**
+${team2_situational}""")
+
+register_template("matchup_scouting", ANALYST_SYSTEM_MESSAGE, """As an NFL scout, analyze the matchup below.
+
+**PROVIDE DETAILED MATCHUP ANALYSIS:**
+1. Key advantages for each team
+2. Exploitable weaknesses to target
+3. Personnel mismatches to capitalize on
+4. Situational tendencies that create opportunities
+5. Strategic game plan recommendations
+
+Focus specifically on the FOCUS AREA but provide comprehensive insights a coaching staff would use.
+
+""", """**FOCUS AREA:** ${focus_area}
+
+**TEAM PROFILES:**
+${profiles}""")
+
+register_template("analysis_summary", ANALYST_SYSTEM_MESSAGE, """Summarize the NFL strategic analysis below into 3 key bullet points that a coach could quickly reference.
+
+**PROVIDE:**
+- 3 most critical strategic insights
+- Each bullet point should be actionable and specific
+- Focus on what matters most for game execution
+
+Keep it concise but strategic.
+
+""", """**ANALYSIS:**
+${full_analysis}""")
+
+# =============================================================================
+# STREAMLIT APP TEMPLATES (streamlit_app.py)
+# =============================================================================
+
+register_template("team_report", TEAM_REPORT_SYSTEM_MESSAGE, """You are an expert NFL analyst. Provide comprehensive strategic analysis for the team named at the end for the current 2024 NFL season.
+
+Please provide detailed information in the following categories:
+
+1. TEAM STRENGTHS (3-4 specific items):
+- What this team does exceptionally well
+- Statistical advantages
+- Key personnel strengths
+
+2. TEAM WEAKNESSES (3-4 specific items):
+- Areas where this team struggles
+- Statistical disadvantages
+- Personnel limitations
+
+3. KEY PLAYERS WITH PERFORMANCE NOTES:
+- QB: Name and key strengths
+- Top RB: Name and rushing style
+- Top 2 WRs: Names and receiving abilities
+- Top TE: Name and role
+- Top defensive players with key stats
+
+4. STRATEGIC INSIGHTS:
+- Formation preferences and tendencies
+- What opponents should target
+- What this team needs to protect
+- Situational advantages/disadvantages
+
+Format your response professionally with clear sections and bullet points.
+
+""", """TEAM: ${team_name} (${team})""")
+
+register_template("team_roster", ROSTER_SYSTEM_MESSAGE, """Provide the current 2024 NFL season roster information for the team named at the end.
+
+Return ONLY a JSON object with this exact structure:
+{
+    "offense": {
+        "qb": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "rb": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "wr1": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "wr2": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "te": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}
+    },
+    "defense": {
+        "de": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "lb": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "cb": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"},
+        "s": {"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}
+    }
+}
+
+Use real current 2024 season players and statistics. Do not include any text outside the JSON object.
+
+""", """TEAM: ${team_name} (${team})""")
+
+register_template("matchup_overview", MATCHUP_SYSTEM_MESSAGE, """You are an expert NFL analyst. Provide a comprehensive strategic analysis for the upcoming matchup below, from the perspective of YOUR TEAM.
+
+Please provide:
+1. A 2-3 sentence overview of the matchup style/theme
+2. 3 specific strategic recommendations for your team
+3. Key areas where your team can exploit the opponent
+4. Main threats the opponent poses to your team
+5. Formation and personnel package recommendations
+6. Weather considerations and adjustments
+
+Keep the analysis concise, tactical, and focused on actionable insights. Use NFL terminology and be specific about play calling and strategy.
+
+""", """YOUR TEAM: ${your_team_name} (${your_team})
+OPPONENT: ${opponent_team_name} (${opponent_team})""")
+
+REPORT_SECTION_INSTRUCTIONS = {
+    'executive_summary': "Write a professional executive summary for this matchup. Focus on key strategic advantages and the overall game narrative. Keep it concise and suitable for coaching staff.",
+    'formation_analysis': "Provide detailed formation analysis for this matchup. Include personnel packages, defensive alignments, and strategic formation recommendations. Use technical football terminology appropriate for coaching staff.",
+    'tactical_recommendations': "Generate specific tactical recommendations for your team against the opponent. Include offensive strategy, defensive adjustments, and special teams considerations. Format as numbered recommendations with rationale.",
+    'player_matchups': "Analyze key player matchups between the two teams. Focus on position battles, mismatches to exploit, and individual player strengths/weaknesses.",
+    'situational_analysis': "Provide situational analysis for this matchup. Cover third down, red zone, two-minute drill, and short yardage situations.",
+    'weather_impact': "Analyze potential weather impact on this game. Include adjustments for wind, temperature, precipitation, and field conditions.",
+    'clock_management': "Provide clock management strategy for this matchup. Cover end-of-half scenarios, fourth quarter strategy, and timeout usage.",
+    'conclusion': "Write a strategic conclusion for this matchup analysis. Summarize key points and provide final strategic recommendations."
+}
+
+register_template("report_section", REPORT_SYSTEM_MESSAGE, """You are writing one section of a formal matchup report for a coaching staff. Follow the SECTION instructions for the matchup given.
+
+""", """SECTION: ${section_instructions}
+
+YOUR TEAM: ${your_team_name}
+OPPONENT: ${opponent_team_name}""")
+
+register_template("follow_up", FOLLOW_UP_SYSTEM_MESSAGE, """Answer the coach's specific question about the matchup below. Keep your response tactical and specific to these teams.
+
+""", """MATCHUP: ${team1_name} vs ${team2_name}
+QUESTION: ${question}""")
@@ -0,0 +1,574 @@
+"""
+REPLAY BENCHMARK MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+==============================================================
+PURPOSE: Measure the analysis, weather, feeds and RAG layers by replaying request traces
+FEATURES: JSONL traces, deterministic OpenAI / OpenWeather / RSS stubs with configurable
+          latency, throughput, latency percentiles, cache hit ratios, JSON results,
+          baseline regression check
+ARCHITECTURE: Calls the real layer functions (database, weather, analysis, reports,
+              feeds, player_news, rag) with only the network clients swapped for stubs
+
+USAGE (from the repository root):
+    python app/replay_benchmark.py                                   # sample trace, fresh database
+    python app/replay_benchmark.py --trace traces/week5.jsonl --concurrency 8 --llm-latency-ms 1200
+    python app/replay_benchmark.py --synthesize 500 --seed 3 --write-trace /tmp/trace.jsonl
+    python app/replay_benchmark.py --baseline app/data/replay_baseline.json --check
+
+TRACE FORMAT (one JSON object per line, like requests.jsonl):
+    {"request_id": "r-0001", "at": 0.25, "op": "weather", "params": {"team": "PHI"}}
+- at: seconds since the start of the trace (only used with --pace)
+- op / params:
+    team_data        {"team"}
+    weather          {"team"}
+    matchup_analysis {"team1", "team2", "focus_area"}
+    play_calling     {"team1", "team2", "game_situation": {"down", "distance", "field_position"}}
+    report_section   {"your_team", "opponent_team", "section"}
+    news             {"teams", "max_items"}
+    player_news      {"players", "team_hint"}
+    rag_search       {"query", "k"}
+  Teams are abbreviations (PHI) or full names
+
+HOW IT WORKS:
+- By default the run happens in a fresh temporary directory, so nfl_teams.db (team
+  data, weather cache, LLM ledger) starts cold and every run is comparable
+- Stubs sleep latency_ms plus a jitter derived from a hash of the request, so the
+  same trace gives the same delays and the same responses on every run
+- OpenAI calls still go through llm_scheduler and llm_ledger, weather through its
+  SQLite cache - only the network is replaced
+- Events run on a thread pool (--concurrency); with --pace they are released at
+  their 'at' offset divided by --speed, otherwise as fast as possible
+- Analysis results that are GPT error strings count as errors
+- Cache hit ratios come from the instrumentation counters named "<layer>.cache"
+
+DEBUGGING SYSTEM:
+- Setup (seeding, RAG index build) is timed separately from the replay
+- Results JSON includes instrumentation spans, stub call counts and scheduler stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+
+from instrumentation import export_metrics, get_latency_summary, get_logger, get_metrics_registry, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("replay_benchmark")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TRACE_PATH = os.path.join(APP_DIR, 'data', 'replay_trace_sample.jsonl')
+DEFAULT_OUTPUT_DIR = os.path.join(os.getenv("STATE_DIR", "app/data"), "benchmarks")
+RAG_DATA_DIR = os.path.join(APP_DIR, 'data')
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TOLERANCE = 0.25      # allowed slowdown vs baseline (fraction)
+DEFAULT_MIN_MS = 5.0          # ignore operations faster than this at p95
+
+DEFAULT_STUBS = {
+    'llm_latency_ms': 800.0, 'llm_jitter_ms': 400.0,
+    'weather_latency_ms': 150.0, 'weather_jitter_ms': 100.0,
+    'rss_latency_ms': 120.0, 'rss_jitter_ms': 80.0,
+}
+RSS_ENTRIES_PER_FEED = 10
+
+OP_LAYERS = {
+    'team_data': 'db',
+    'weather': 'weather',
+    'matchup_analysis': 'analysis',
+    'play_calling': 'analysis',
+    'report_section': 'analysis',
+    'news': 'feeds',
+    'player_news': 'feeds',
+    'rag_search': 'rag',
+}
+
+# Same strings as api_server.GPT_ERROR_PREFIXES (not imported, to keep Flask out of the benchmark)
+ERROR_PREFIXES = (
+    'Analysis temporarily unavailable', 'Analysis unavailable', 'Analysis system error',
+    'Matchup analysis error', 'Play calling analysis error', 'Error generating'
+)
+
+def _fraction(key: str) -> float:
+    """Deterministic value in [0, 1) for a request key"""
+    return int(hashlib.sha256(key.encode()).hexdigest()[:8], 16) / 0x100000000
+
+def _percentiles(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0}
+
+    def pct(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {'count': len(ordered), 'mean': round(sum(ordered) / len(ordered), 3),
+            'p50': pct(0.50), 'p90': pct(0.90), 'p95': pct(0.95), 'p99': pct(0.99),
+            'max': round(ordered[-1], 3)}
+
+# =============================================================================
+# NETWORK STUBS
+# =============================================================================
+
+class _Stub:
+    def __init__(self, latency_ms: float, jitter_ms: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _wait(self, key: str):
+        with self._lock:
+            self.calls += 1
+        time.sleep((self.latency_ms + self.jitter_ms * _fraction(key)) / 1000)
+
+class StubOpenAIClient(_Stub):
+    """chat.completions.create() with deterministic text and usage"""
+
+    def __init__(self, latency_ms: float, jitter_ms: float):
+        super().__init__(latency_ms, jitter_ms)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str = "gpt-3.5-turbo", messages: Optional[List[Dict]] = None,
+                max_tokens: int = 256, **kwargs):
+        key = json.dumps(messages, sort_keys=True)
+        self._wait(key)
+        words = max(16, min(int(max_tokens or 256), 600) // 2)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        content = f"[stub {model}] " + " ".join(f"edge{digest[i % 60:i % 60 + 4]}" for i in range(words))
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages or []) // 4
+        completion_tokens = len(content) // 4
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens)
+        )
+
+class StubOpenWeather(_Stub):
+    """Stands in for the requests module inside weather.py"""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, exceptions):
+        super().__init__(latency_ms, jitter_ms)
+        self.exceptions = exceptions
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = None):
+        location = (params or {}).get('q', url)
+        self._wait(location)
+        f = _fraction(location + ':weather')
+        data = {
+            'main': {'temp': 35 + 50 * f, 'feels_like': 32 + 50 * f, 'humidity': int(30 + 60 * f), 'pressure': 1013},
+            'wind': {'speed': 25 * _fraction(location + ':wind'), 'deg': int(360 * f)},
+            'weather': [{'id': 800 if f < 0.6 else 500, 'description': 'clear sky' if f < 0.6 else 'light rain'}],
+            'visibility': 10000,
+            'clouds': {'all': int(100 * f)},
+        }
+        return SimpleNamespace(status_code=200, json=lambda: data)
+
+class StubFeedParser(_Stub):
+    """Stands in for feedparser inside feeds.py and player_news.py"""
+
+    def parse(self, url: str):
+        self._wait(url)
+        digest = hashlib.sha256(url.encode()).hexdigest()[:8]
+        return SimpleNamespace(entries=[
+            {'title': f"Story {digest}-{i}", 'summary': f"Replay summary {i} for {url}",
+             'link': f"https://example.invalid/{digest}/{i}", 'published': "Sun, 18 Oct 2026 12:00:00 GMT"}
+            for i in range(RSS_ENTRIES_PER_FEED)
+        ])
+
+@contextmanager
+def installed_stubs(config: Optional[Dict] = None):
+    """Swap the OpenAI, OpenWeather and RSS clients for stubs; yields {'openai', 'openweather', 'rss'}"""
+    import analysis
+    import feeds
+    import player_news
+    import requests
+    import weather
+
+    config = {**DEFAULT_STUBS, **(config or {})}
+    stubs = {
+        'openai': StubOpenAIClient(config['llm_latency_ms'], config['llm_jitter_ms']),
+        'openweather': StubOpenWeather(config['weather_latency_ms'], config['weather_jitter_ms'], requests.exceptions),
+        'rss': StubFeedParser(config['rss_latency_ms'], config['rss_jitter_ms']),
+    }
+    patches = [
+        (analysis, 'openai', SimpleNamespace(OpenAI=lambda **kwargs: stubs['openai'])),
+        (weather, 'requests', stubs['openweather']),
+        (feeds, 'feedparser', stubs['rss']),
+        (player_news, 'feedparser', stubs['rss']),
+    ]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    try:
+        for module, name, stub in patches:
+            setattr(module, name, stub)
+        yield stubs
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+# =============================================================================
+# TRACES
+# =============================================================================
+
+def load_trace(path: str) -> List[Dict]:
+    events = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            event = json.loads(line)
+            if event.get('op') not in OP_LAYERS:
+                raise ValueError(f"{path}:{line_number}: unknown op {event.get('op')!r}")
+            event.setdefault('request_id', f"r-{line_number:05d}")
+            event.setdefault('at', 0.0)
+            event.setdefault('params', {})
+            events.append(event)
+    return sorted(events, key=lambda e: e['at'])
+
+def write_trace(events: List[Dict], path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+RAG_QUERIES = [
+    "stacking correlation", "red zone target share", "weather impact on passing",
+    "ownership leverage in tournaments", "running back volume", "late swap strategy",
+    "defense versus quarterback pressure", "pace of play and totals",
+]
+FOCUS_AREAS = ['overall', 'offense', 'defense', 'special_teams']
+REPORT_SECTIONS = ['executive_summary', 'formation_analysis', 'tactical_recommendations', 'player_matchups',
+                   'situational_analysis', 'weather_impact']
+PLAYERS = ["Jalen Hurts", "Patrick Mahomes", "Josh Allen", "CeeDee Lamb", "Christian McCaffrey", "Justin Jefferson"]
+
+def synthesize_trace(count: int, seed: int = 7, rate_per_second: float = 5.0) -> List[Dict]:
+    """
+    Deterministic trace with a realistic mix: popular teams repeat (Zipf-like), so the
+    weather cache and team lookups see hits as well as misses
+    """
+    from reports import TEAM_NAMES
+
+    rng = random.Random(seed)
+    teams = list(TEAM_NAMES)
+    rng.shuffle(teams)
+    team_weights = [1.0 / (rank + 1) for rank in range(len(teams))]
+    mix = [('team_data', 25), ('weather', 20), ('rag_search', 15), ('matchup_analysis', 10),
+           ('report_section', 10), ('news', 10), ('play_calling', 5), ('player_news', 5)]
+
+    def team():
+        return rng.choices(teams, team_weights)[0]
+
+    events, at = [], 0.0
+    for i in range(count):
+        at += rng.expovariate(rate_per_second)
+        op = rng.choices([name for name, _ in mix], [weight for _, weight in mix])[0]
+        team1, team2 = team(), team()
+        while team2 == team1:
+            team2 = team()
+        params = {
+            'team_data': lambda: {'team': team1},
+            'weather': lambda: {'team': team1},
+            'rag_search': lambda: {'query': rng.choice(RAG_QUERIES), 'k': 5},
+            'matchup_analysis': lambda: {'team1': team1, 'team2': team2, 'focus_area': rng.choice(FOCUS_AREAS)},
+            'report_section': lambda: {'your_team': team1, 'opponent_team': team2,
+                                       'section': rng.choice(REPORT_SECTIONS)},
+            'news': lambda: {'teams': [team1], 'max_items': 20},
+            'play_calling': lambda: {'team1': team1, 'team2': team2, 'game_situation': {
+                'down': rng.randint(1, 4), 'distance': rng.randint(1, 15), 'field_position': rng.randint(5, 95)}},
+            'player_news': lambda: {'players': rng.sample(PLAYERS, 2), 'team_hint': team1},
+        }[op]()
+        events.append({'request_id': f"r-{i + 1:05d}", 'at': round(at, 3), 'op': op, 'params': params})
+    return events
+
+# =============================================================================
+# LAYER HANDLERS - the same calls the app and API server make
+# =============================================================================
+
+class ReplayContext:
+    """Per-run state: the stub OpenAI client and the RAG index (built once in setup)"""
+
+    def __init__(self, openai_client):
+        from rag import SimpleRAG
+
+        self.client = openai_client
+        self.rag = SimpleRAG(RAG_DATA_DIR)
+        self.rag.build()
+
+    @staticmethod
+    def team_name(team: str) -> str:
+        from reports import get_team_full_name
+        return get_team_full_name(team)
+
+    def handle(self, op: str, params: Dict):
+        from analysis import generate_matchup_analysis, generate_play_calling_analysis
+        from database import get_team_data
+        from feeds import fetch_news
+        from player_news import fetch_player_news
+        from reports import TEAM_NAMES, generate_professional_report_section
+        from weather import get_comprehensive_weather_data
+
+        if op == 'team_data':
+            return get_team_data(self.team_name(params['team']))
+
+        if op == 'weather':
+            name = self.team_name(params['team'])
+            stadium = (get_team_data(name) or {}).get('stadium_info', {})
+            return get_comprehensive_weather_data(name, stadium.get('city', 'Unknown'), stadium.get('state', ''),
+                                                  bool(stadium.get('is_dome', False)))
+
+        if op == 'matchup_analysis':
+            return generate_matchup_analysis(get_team_data(self.team_name(params['team1'])),
+                                             get_team_data(self.team_name(params['team2'])),
+                                             params.get('focus_area', 'overall'))
+
+        if op == 'play_calling':
+            return generate_play_calling_analysis(get_team_data(self.team_name(params['team1'])),
+                                                  get_team_data(self.team_name(params['team2'])),
+                                                  params.get('game_situation', {}))
+
+        if op == 'report_section':
+            abbreviations = {name: abbr for abbr, name in TEAM_NAMES.items()}
+            your_team = abbreviations.get(params['your_team'], params['your_team'])
+            opponent_team = abbreviations.get(params['opponent_team'], params['opponent_team'])
+            return generate_professional_report_section(params['section'], your_team, opponent_team, self.client)
+
+        if op == 'news':
+            return fetch_news(params.get('max_items', 20), params.get('teams'))
+
+        if op == 'player_news':
+            return fetch_player_news(params.get('players', []), params.get('team_hint', ''))
+
+        if op == 'rag_search':
+            return self.rag.search(params['query'], params.get('k', 5))
+
+        raise ValueError(f"Unknown op {op}")
+
+def _is_error(result) -> bool:
+    if result is None:
+        return True
+    return isinstance(result, str) and result.startswith(ERROR_PREFIXES)
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+def cache_ratios() -> Dict[str, Dict]:
+    """hit / miss / ratio for every "<layer>.cache" counter labelled result=hit|miss"""
+    ratios: Dict[str, Dict] = {}
+    for counter in export_metrics()['counters']:
+        if counter['name'].endswith('.cache') and counter['labels'].get('result') in ('hit', 'miss'):
+            entry = ratios.setdefault(counter['name'][:-len('.cache')], {'hit': 0, 'miss': 0})
+            entry[counter['labels']['result']] += int(counter['value'])
+    for entry in ratios.values():
+        lookups = entry['hit'] + entry['miss']
+        entry['hit_ratio'] = round(entry['hit'] / lookups, 4) if lookups else 0.0
+    return ratios
+
+def run_replay(events: List[Dict], concurrency: int = DEFAULT_CONCURRENCY, pace: bool = False,
+               speed: float = 1.0, stub_config: Optional[Dict] = None,
+               progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Replay `events` against the layers in the current working directory's database
+
+    Returns:
+        Results dict: throughput, latency percentiles (overall, per op, per layer),
+        errors, cache hit ratios, stub call counts and instrumentation spans
+    """
+    from database import ensure_database_populated
+    from llm_scheduler import get_scheduler_stats
+
+    if not events:
+        raise ValueError("The trace is empty")
+    stub_config = {**DEFAULT_STUBS, **(stub_config or {})}
+
+    with installed_stubs(stub_config) as stubs:
+        setup_start = time.perf_counter()
+        ensure_database_populated()
+        context = ReplayContext(stubs['openai'])
+        setup_seconds = time.perf_counter() - setup_start
+        get_metrics_registry().reset()
+
+        samples: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+        done = [0]
+
+        def execute(event: Dict):
+            start = time.perf_counter()
+            try:
+                failed = _is_error(context.handle(event['op'], event['params']))
+            except Exception as e:
+                log_debug("run_replay", 423, f"{event['request_id']} {event['op']} raised", e)
+                failed = True
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with lock:
+                samples.setdefault(event['op'], []).append(elapsed_ms)
+                if failed:
+                    errors[event['op']] = errors.get(event['op'], 0) + 1
+                done[0] += 1
+                if progress:
+                    progress(done[0], len(events))
+
+        log_debug("run_replay", 434, f"Replaying {len(events)} events (concurrency {concurrency}, pace {pace})")
+        replay_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="replay") as pool:
+            for event in events:
+                if pace:
+                    delay = replay_start + event['at'] / max(speed, 1e-6) - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                pool.submit(execute, event)
+        wall_seconds = time.perf_counter() - replay_start
+
+        stub_calls = {name: stub.calls for name, stub in stubs.items()}
+
+    by_layer: Dict[str, List[float]] = {}
+    for op, values in samples.items():
+        by_layer.setdefault(OP_LAYERS[op], []).extend(values)
+
+    scheduler = get_scheduler_stats()
+    return {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'events': len(events),
+        'config': {'concurrency': concurrency, 'pace': pace, 'speed': speed, 'stubs': stub_config},
+        'setup_seconds': round(setup_seconds, 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'throughput_rps': round(len(events) / wall_seconds, 3) if wall_seconds else 0.0,
+        'latency_ms': {
+            'all': _percentiles([v for values in samples.values() for v in values]),
+            'by_op': {op: _percentiles(values) for op, values in sorted(samples.items())},
+            'by_layer': {layer: _percentiles(values) for layer, values in sorted(by_layer.items())},
+        },
+        'errors': {'total': sum(errors.values()), 'by_op': errors},
+        'cache': cache_ratios(),
+        'stub_calls': stub_calls,
+        'llm_scheduler': {key: scheduler[key] for key in ('calls', 'retries', 'failed', 'queue_wait')},
+        'spans': get_latency_summary(),
+    }
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE,
+                        min_ms: float = DEFAULT_MIN_MS) -> List[str]:
+    """Human-readable regressions (empty list = pass)"""
+    problems = []
+    floor = baseline['throughput_rps'] * (1 - tolerance)
+    if results['throughput_rps'] < floor:
+        problems.append(f"throughput {results['throughput_rps']:.1f} req/s < {floor:.1f} "
+                        f"(baseline {baseline['throughput_rps']:.1f})")
+
+    for op, stats in results['latency_ms']['by_op'].items():
+        before = baseline['latency_ms']['by_op'].get(op)
+        if not before or stats.get('p95', 0) < min_ms:
+            continue
+        if stats['p95'] > max(before['p95'], min_ms) * (1 + tolerance):
+            problems.append(f"{op} p95 {before['p95']:.0f}ms -> {stats['p95']:.0f}ms")
+
+    for op, count in results['errors']['by_op'].items():
+        if count > baseline['errors']['by_op'].get(op, 0):
+            problems.append(f"{op} errors {baseline['errors']['by_op'].get(op, 0)} -> {count}")
+
+    for layer, cache in results['cache'].items():
+        before = baseline.get('cache', {}).get(layer)
+        if before and cache['hit_ratio'] < before['hit_ratio'] - tolerance * before['hit_ratio']:
+            problems.append(f"{layer} cache hit ratio {before['hit_ratio']:.2f} -> {cache['hit_ratio']:.2f}")
+    return problems
+
+def print_report(results: Dict):
+    overall = results['latency_ms']['all']
+    print(f"\n{results['events']} events in {results['wall_seconds']:.1f}s - "
+          f"{results['throughput_rps']:.1f} req/s, p50 {overall['p50']:.0f}ms, p95 {overall['p95']:.0f}ms, "
+          f"{results['errors']['total']} errors")
+    print(f"{'op':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for op, stats in results['latency_ms']['by_op'].items():
+        print(f"{op:<18} {stats['count']:>6} {stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f} "
+              f"{results['errors']['by_op'].get(op, 0):>7}")
+    for layer, cache in results['cache'].items():
+        print(f"{layer} cache: {cache['hit']} hits / {cache['miss']} misses ({cache['hit_ratio']:.0%})")
+    print(f"stub calls: {', '.join(f'{name} {count}' for name, count in results['stub_calls'].items())}")
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a request trace through the GRIT layers with network stubs")
+    parser.add_argument("--trace", default=DEFAULT_TRACE_PATH, help="JSONL trace to replay")
+    parser.add_argument("--synthesize", type=int, metavar="N", help="Replay a synthetic trace of N events instead")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for --synthesize")
+    parser.add_argument("--write-trace", help="Also save the (synthetic) trace to this path")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Replay threads")
+    parser.add_argument("--pace", action="store_true", help="Release events at their 'at' offsets")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression for --pace")
+    for name, value in DEFAULT_STUBS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value, help=f"Stub {name} (default {value:g})")
+    parser.add_argument("--workdir", help="Run against nfl_teams.db in this directory (default: fresh temp dir)")
+    parser.add_argument("--output", help="Results JSON path (default: <STATE_DIR>/benchmarks/replay_<time>.json)")
+    parser.add_argument("--baseline", help="Baseline results JSON")
+    parser.add_argument("--write-baseline", action="store_true", help="Save these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if worse than the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression fraction")
+    args = parser.parse_args()
+
+    events = synthesize_trace(args.synthesize, args.seed) if args.synthesize else load_trace(args.trace)
+    if args.write_trace:
+        write_trace(events, args.write_trace)
+        print(f"trace written to {args.write_trace}")
+
+    # Paths are resolved before moving to the work directory
+    output = os.path.abspath(args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, f"replay_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    os.chdir(args.workdir or tempfile.mkdtemp(prefix="grit_replay_"))
+
+    results = run_replay(events, args.concurrency, args.pace, args.speed,
+                         {name: getattr(args, name) for name in DEFAULT_STUBS})
+    results['trace'] = f"synthetic:{args.synthesize}:{args.seed}" if args.synthesize else os.path.abspath(args.trace)
+    print_report(results)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f"results written to {output}")
+
+    if baseline_path and args.write_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"baseline written to {baseline_path}")
+
+    if args.check:
+        if not baseline_path or not os.path.exists(baseline_path):
+            print("no baseline - run with --baseline PATH --write-baseline first")
+            sys.exit(1)
+        with open(baseline_path, encoding='utf-8') as f:
+            problems = compare_to_baseline(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        sys.exit(1 if problems else 0)
@@ -0,0 +1,217 @@
+"""
+REPORTS MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=====================================================
+PURPOSE: Team names and the Professional Report Generator, usable without Streamlit
+FEATURES: Team abbreviation lookup, report section catalog, section generation, report compilation
+ARCHITECTURE: Plain functions taking an OpenAI client - shared by streamlit_app.py and api_server.py
+
+HOW IT WORKS:
+- Each report section is one GPT-3.5 Turbo call built from prompt_templates
+  (shared prefix, section-specific instructions as the suffix)
+- compile_professional_report() joins the selected sections under a markdown header
+  (format_professional_report() does the joining, so batch_reports.py produces the
+  same layout from sections generated in parallel)
+- A failed section is reported inline; the rest of the report still compiles
+
+DEBUGGING SYSTEM:
+- Section failures logged with the section ID and matchup
+"""
+
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+
+from instrumentation import get_logger, log_event
+from llm_scheduler import chat_completion
+from prompt_templates import REPORT_SECTION_INSTRUCTIONS, build_messages
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("reports")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# NFL TEAM NAMES
+# =============================================================================
+
+TEAM_NAMES = {
+    'ARI': 'Arizona Cardinals', 'ATL': 'Atlanta Falcons', 'BAL': 'Baltimore Ravens',
+    'BUF': 'Buffalo Bills', 'CAR': 'Carolina Panthers', 'CHI': 'Chicago Bears',
+    'CIN': 'Cincinnati Bengals', 'CLE': 'Cleveland Browns', 'DAL': 'Dallas Cowboys',
+    'DEN': 'Denver Broncos', 'DET': 'Detroit Lions', 'GB': 'Green Bay Packers',
+    'HOU': 'Houston Texans', 'IND': 'Indianapolis Colts', 'JAX': 'Jacksonville Jaguars',
+    'KC': 'Kansas City Chiefs', 'LV': 'Las Vegas Raiders', 'LAC': 'Los Angeles Chargers',
+    'LAR': 'Los Angeles Rams', 'MIA': 'Miami Dolphins', 'MIN': 'Minnesota Vikings',
+    'NE': 'New England Patriots', 'NO': 'New Orleans Saints', 'NYG': 'New York Giants',
+    'NYJ': 'New York Jets', 'PHI': 'Philadelphia Eagles', 'PIT': 'Pittsburgh Steelers',
+    'SF': 'San Francisco 49ers', 'SEA': 'Seattle Seahawks', 'TB': 'Tampa Bay Buccaneers',
+    'TEN': 'Tennessee Titans', 'WAS': 'Washington Commanders'
+}
+
+def get_nfl_teams() -> List[str]:
+    """
+    Get list of all NFL teams.
+
+    Returns:
+        List[str]: List of NFL team abbreviations
+    """
+    return [
+        'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
+        'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+        'LV', 'LAC', 'LAR', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+        'NYJ', 'PHI', 'PIT', 'SF', 'SEA', 'TB', 'TEN', 'WAS'
+    ]
+
+def get_team_full_name(team_abbr: str) -> str:
+    """
+    Convert team abbreviation to full team name.
+
+    Args:
+        team_abbr (str): Team abbreviation (e.g., 'PHI')
+
+    Returns:
+        str: Full team name (e.g., 'Philadelphia Eagles')
+    """
+    return TEAM_NAMES.get(team_abbr, team_abbr)
+
+# =============================================================================
+# PROFESSIONAL REPORT GENERATOR FUNCTIONS
+# =============================================================================
+
+def get_available_report_sections() -> Dict[str, str]:
+    """
+    Get available report sections for the Professional Report Generator.
+
+    Returns:
+        Dict[str, str]: Dictionary of section IDs and names
+    """
+    return {
+        'executive_summary': 'Executive Summary',
+        'formation_analysis': 'Formation Analysis',
+        'tactical_recommendations': 'Tactical Recommendations',
+        'player_matchups': 'Player Matchups',
+        'situational_analysis': 'Situational Analysis',
+        'weather_impact': 'Weather Impact',
+        'clock_management': 'Clock Management',
+        'conclusion': 'Conclusion'
+    }
+
+def generate_professional_report_section(section_id: str, your_team: str, opponent_team: str, client) -> str:
+    """
+    Generate a specific section of the professional report using ChatGPT.
+
+    Args:
+        section_id (str): ID of the section to generate
+        your_team (str): Your team abbreviation
+        opponent_team (str): Opponent team abbreviation
+        client: OpenAI client
+
+    Returns:
+        str: Generated section content
+    """
+    try:
+        your_team_name = get_team_full_name(your_team)
+        opponent_team_name = get_team_full_name(opponent_team)
+
+        # Section-specific instructions fill the suffix; the prefix is shared by all sections
+        section_instructions = REPORT_SECTION_INSTRUCTIONS.get(section_id, f"Analyze the {section_id} for this matchup.")
+
+        response = chat_completion(
+            client, feature="report_section",
+            model="gpt-3.5-turbo",
+            messages=build_messages(
+                "report_section", section_instructions=section_instructions,
+                your_team_name=your_team_name, opponent_team_name=opponent_team_name
+            ),
+            max_tokens=600,
+            temperature=0.7
+        )
+
+        return response.choices[0].message.content
+
+    except Exception as e:
+        log_debug("generate_professional_report_section", 139, f"{section_id} failed for {your_team} vs {opponent_team}", e)
+        return f"Error generating {section_id}: {str(e)}"
+
+def compile_professional_report(selected_sections: List[str], your_team: str, opponent_team: str, client,
+                                progress: Optional[Callable[[int, int, str], None]] = None) -> str:
+    """
+    Compile a complete professional report from selected sections.
+
+    Args:
+        selected_sections (List[str]): List of section IDs to include
+        your_team (str): Your team abbreviation
+        opponent_team (str): Opponent team abbreviation
+        client: OpenAI client
+        progress: Optional callback(sections_done, sections_total, section_name) after each section
+
+    Returns:
+        str: Complete formatted professional report
+    """
+    # Generate each selected section
+    available_sections = get_available_report_sections()
+    sections = [section_id for section_id in selected_sections if section_id in available_sections]
+    section_contents = []
+
+    for done, section_id in enumerate(sections, start=1):
+        section_name = available_sections[section_id]
+
+        section_content = generate_professional_report_section(
+            section_id, your_team, opponent_team, client
+        )
+        section_contents.append((section_name, section_content))
+
+        if progress is not None:
+            progress(done, len(sections), section_name)
+
+    return format_professional_report(your_team, opponent_team, section_contents)
+
+def format_professional_report(your_team: str, opponent_team: str, section_contents: List[Tuple[str, str]],
+                               preamble: str = "") -> str:
+    """
+    Markdown report from (section name, content) pairs, in order.
+
+    Args:
+        preamble (str): Optional markdown placed between the header and the first section
+    """
+    your_team_name = get_team_full_name(your_team)
+    opponent_team_name = get_team_full_name(opponent_team)
+
+    # Report header
+    report_content = f"""
+# PROFESSIONAL STRATEGIC ANALYSIS REPORT
+## {your_team_name} vs {opponent_team_name}
+**Generated:** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
+**Analysis Tool:** NFL Team Analysis Dashboard powered by ChatGPT 3.5 Turbo
+
+---
+
+"""
+    if preamble:
+        report_content += f"{preamble}\n\n---\n\n"
+
+    for section_name, section_content in section_contents:
+        report_content += f"## {section_name.upper()}\n\n"
+        report_content += f"{section_content}\n\n---\n\n"
+
+    return report_content
+
+def build_report_pdf_params(report: str, your_team: str, opponent_team: str) -> Dict:
+    """PDF edge sheet parameters from a compiled report: one bullet per report section"""
+    bullets = []
+    for part in report.split('\n## ')[2:]:
+        title, _, body = part.partition('\n')
+        bullets.append(f"{title.strip().title()}: {' '.join(body.replace('---', ' ').split())}")
+    return {
+        'title': f"{get_team_full_name(your_team)} vs {get_team_full_name(opponent_team)}",
+        'tldr': bullets[0] if bullets else "Professional strategic analysis report",
+        'bullets': bullets[1:],
+        'filename': f"{your_team}_vs_{opponent_team}_{uuid.uuid5(uuid.NAMESPACE_OID, report).hex[:8]}.pdf"
+    }
@@ -0,0 +1,244 @@
+"""
+SESSION STORE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+===========================================================
+PURPOSE: Keep large per-session artifacts out of st.session_state
+FEATURES: Shared content-addressed store, reference counting, idle eviction, memory report
+ARCHITECTURE: One process-wide ArtifactStore; session_state holds ArtifactRef tuples only
+
+HOW IT WORKS:
+- set_artifact(key, value) hashes the value (sha256 of its JSON form), stores it once
+  in the shared store and puts a small ArtifactRef in st.session_state[key]
+- Two sessions generating the same report or weather dict share one copy
+- get_artifact(key) resolves the reference; an evicted artifact reads as the default
+- Every rerun touches the session; sessions idle for longer than IDLE_TIMEOUT_SECONDS
+  lose their references and unreferenced artifacts are dropped
+- Sizes are the UTF-8 length of the JSON form - close enough for accounting
+
+DEBUGGING SYSTEM:
+- Evictions logged with sessions and bytes freed
+- get_memory_report() lists bytes held per session plus store totals
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import streamlit as st
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("session_store")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+IDLE_TIMEOUT_SECONDS = int(os.environ.get('SESSION_ARTIFACT_IDLE_SECONDS', 30 * 60))
+EVICTION_INTERVAL_SECONDS = 60
+
+class ArtifactRef(NamedTuple):
+    """What session_state holds instead of the artifact itself"""
+    digest: str
+    size: int
+    kind: str
+
+def _serialize(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return json.dumps(value, sort_keys=True, default=str, separators=(',', ':')).encode('utf-8')
+
+# =============================================================================
+# SHARED ARTIFACT STORE
+# =============================================================================
+
+class ArtifactStore:
+    """
+    Content-addressed artifacts shared by every session in the process,
+    reference-counted per (session, key)
+    """
+
+    def __init__(self, idle_timeout: int = IDLE_TIMEOUT_SECONDS):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._artifacts: Dict[str, Dict] = {}         # digest -> {'value', 'size', 'refs'}
+        self._sessions: Dict[str, Dict] = {}          # session_id -> {'keys': {key: digest}, 'last_seen'}
+        self._last_eviction = time.monotonic()
+        self._evicted = {'sessions': 0, 'artifacts': 0, 'bytes': 0}
+
+    def touch(self, session_id: str):
+        """Mark a session active; runs idle eviction at most once per EVICTION_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        with self._lock:
+            self._sessions.setdefault(session_id, {'keys': {}, 'last_seen': now})['last_seen'] = now
+            run_eviction = now - self._last_eviction >= EVICTION_INTERVAL_SECONDS
+        if run_eviction:
+            self.evict_idle()
+
+    def put(self, session_id: str, key: str, value: Any) -> ArtifactRef:
+        payload = _serialize(value)
+        digest = hashlib.sha256(payload).hexdigest()
+        with self._lock:
+            session = self._sessions.setdefault(session_id, {'keys': {}, 'last_seen': time.monotonic()})
+            previous = session['keys'].get(key)
+            if previous == digest:
+                return ArtifactRef(digest, len(payload), type(value).__name__)
+
+            artifact = self._artifacts.setdefault(digest, {'value': value, 'size': len(payload), 'refs': set()})
+            artifact['refs'].add((session_id, key))
+            session['keys'][key] = digest
+            if previous is not None:
+                self._release(session_id, key, previous)
+        return ArtifactRef(digest, len(payload), type(value).__name__)
+
+    def get(self, ref: ArtifactRef, default: Any = None) -> Any:
+        with self._lock:
+            artifact = self._artifacts.get(ref.digest)
+            return artifact['value'] if artifact is not None else default
+
+    def discard(self, session_id: str, key: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            digest = session['keys'].pop(key, None) if session else None
+            if digest is not None:
+                self._release(session_id, key, digest)
+
+    def _release(self, session_id: str, key: str, digest: str) -> int:
+        """Drop one reference (lock held); returns bytes freed"""
+        artifact = self._artifacts.get(digest)
+        if artifact is None:
+            return 0
+        artifact['refs'].discard((session_id, key))
+        if not artifact['refs']:
+            del self._artifacts[digest]
+            return artifact['size']
+        return 0
+
+    def evict_idle(self, idle_timeout: Optional[int] = None) -> Dict:
+        """Release every artifact held by sessions idle longer than idle_timeout seconds"""
+        idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        now = time.monotonic()
+        freed = {'sessions': 0, 'artifacts': 0, 'bytes': 0}
+        with self._lock:
+            self._last_eviction = now
+            for session_id in [sid for sid, s in self._sessions.items() if now - s['last_seen'] > idle_timeout]:
+                for key, digest in self._sessions.pop(session_id)['keys'].items():
+                    released = self._release(session_id, key, digest)
+                    if released:
+                        freed['artifacts'] += 1
+                        freed['bytes'] += released
+                freed['sessions'] += 1
+            for name, value in freed.items():
+                self._evicted[name] += value
+
+        if freed['sessions']:
+            log_debug("ArtifactStore.evict_idle", 150, f"Evicted {freed['sessions']} idle sessions, "
+                      f"{freed['artifacts']} artifacts ({freed['bytes']} bytes)")
+        return freed
+
+    def memory_report(self) -> Dict:
+        """
+        Per-session and total artifact memory
+
+        Returns:
+            Dict with 'sessions' ({session_id: {'artifacts', 'bytes', 'shared_bytes', 'idle_seconds'}}),
+            'artifacts', 'unique_bytes', 'referenced_bytes', 'dedup_saved_bytes' and 'evicted'
+        """
+        now = time.monotonic()
+        with self._lock:
+            sessions = {}
+            for session_id, session in self._sessions.items():
+                sizes = [(self._artifacts[d]['size'], len(self._artifacts[d]['refs']))
+                         for d in session['keys'].values() if d in self._artifacts]
+                sessions[session_id] = {
+                    'artifacts': len(sizes),
+                    'bytes': sum(size for size, _ in sizes),
+                    # Bytes also referenced by other sessions (not freed if this one goes idle)
+                    'shared_bytes': sum(size for size, refs in sizes if refs > 1),
+                    'idle_seconds': round(now - session['last_seen'], 1),
+                }
+            unique_bytes = sum(a['size'] for a in self._artifacts.values())
+            referenced = sum(a['size'] * len(a['refs']) for a in self._artifacts.values())
+            return {
+                'sessions': sessions,
+                'artifacts': len(self._artifacts),
+                'unique_bytes': unique_bytes,
+                'referenced_bytes': referenced,
+                'dedup_saved_bytes': referenced - unique_bytes,
+                'evicted': dict(self._evicted),
+            }
+
+# =============================================================================
+# MODULE SINGLETON - shared by every session in this process
+# =============================================================================
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+def get_artifact_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
+
+def get_memory_report() -> Dict:
+    return get_artifact_store().memory_report()
+
+# =============================================================================
+# STREAMLIT HELPERS - session_state holds ArtifactRef, never the artifact
+# =============================================================================
+
+def _session_id() -> str:
+    return st.session_state.get('session_id', 'default')
+
+def touch_session():
+    """Call once per rerun so active sessions are not evicted"""
+    get_artifact_store().touch(_session_id())
+
+def set_artifact(key: str, value: Any):
+    """Store value in the shared store and keep only its reference in session_state"""
+    if value is None:
+        get_artifact_store().discard(_session_id(), key)
+        st.session_state[key] = None
+        return
+    st.session_state[key] = get_artifact_store().put(_session_id(), key, value)
+
+def get_artifact(key: str, default: Any = None) -> Any:
+    """Resolve session_state[key]; evicted artifacts read as default (and the stale ref is cleared)"""
+    ref = st.session_state.get(key)
+    if not isinstance(ref, ArtifactRef):
+        return default if ref is None else ref
+    value = get_artifact_store().get(ref)
+    if value is None:
+        st.session_state[key] = None
+        return default
+    return value
+
+def get_session_memory() -> Dict:
+    """Memory held for the current session (artifact bytes + remaining session_state keys)"""
+    report = get_memory_report()
+    artifacts = report['sessions'].get(_session_id(), {'artifacts': 0, 'bytes': 0, 'shared_bytes': 0})
+    state_bytes = 0
+    for key in list(st.session_state.keys()):
+        value = st.session_state.get(key)
+        if isinstance(value, ArtifactRef):
+            continue
+        try:
+            state_bytes += len(_serialize(value))
+        except Exception:
+            continue
+    return {**artifacts, 'state_bytes': state_bytes}
@@ -0,0 +1,318 @@
+"""
+SIMULATOR MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=======================================================
+PURPOSE: Monte Carlo drive and game simulation from team formation data
+FEATURES: Vectorized drive batches, seedable RNG, optional multiprocessing, per-archetype results
+ARCHITECTURE: Pure NumPy - every array holds one entry per simulated drive
+
+HOW A DRIVE IS SIMULATED:
+- Drives start at the own 25 (touchback) with 1st & 10
+- Each play samples a personnel package from formation usage (tilted per strategy
+  archetype), then success from that package's success_rate
+- Successful plays gain at least the success threshold (40% of the line to gain on
+  1st down, 60% on 2nd, all of it on 3rd/4th) plus an exponential extra; the mean
+  gain is calibrated to the package's ypp. Inside the 20, success is scaled by
+  red_zone_efficiency
+- Fourth downs follow the decision engine grid (go / field goal / punt)
+- Drives end on touchdown (7), field goal (3), missed field goal, punt, turnover,
+  failed fourth down or safety (-2)
+
+REPRODUCIBILITY:
+- One np.random.SeedSequence per call is spawned into one child per batch, so the
+  same seed gives the same results with or without worker processes
+
+DEBUGGING SYSTEM:
+- Simulation runs logged with drive counts, batch counts and timing
+"""
+
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from decision_engine import FIELD_LENGTH, LEAGUE_BASELINES, build_fourth_down_grid, field_goal_probability
+from instrumentation import get_logger, log_event
+from league_data import FORMATIONS
+from whatif import DEFAULT_ARCHETYPES
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("simulator")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# SIMULATION CONSTANTS
+# =============================================================================
+
+DEFAULT_DRIVES = 100_000
+DEFAULT_BATCH_SIZE = 25_000
+DRIVES_PER_GAME = 11
+MAX_PLAYS_PER_DRIVE = 40
+START_FIELD_POSITION = 25
+
+DEFAULT_FORMATION_STATS = {'usage': 0.25, 'ypp': 5.5, 'success_rate': 0.45}
+SUCCESS_THRESHOLD = np.array([0.0, 0.4, 0.6, 1.0, 1.0])   # index = down
+FAILED_PLAY_GAIN_RANGE = (-3, 3)
+TURNOVER_RATE = 0.015
+RED_ZONE_LINE = 80
+
+# Strategy archetypes (names match whatif.DEFAULT_ARCHETYPES): formation usage
+# multipliers plus success, explosive-gain and turnover scaling
+NEUTRAL_TILT = {'usage': {}, 'success': 1.0, 'explosive': 1.0, 'turnover': 1.0}
+ARCHETYPE_TILTS = {
+    "Run-heavy (gap & duo)": {
+        'usage': {'21_personnel': 1.8, '12_personnel': 1.4, '11_personnel': 0.8, '10_personnel': 0.4},
+        'success': 1.03, 'explosive': 0.85, 'turnover': 0.8
+    },
+    "Pass-heavy (11 personnel)": {
+        'usage': {'11_personnel': 1.5, '10_personnel': 1.4, '12_personnel': 0.7, '21_personnel': 0.5},
+        'success': 0.98, 'explosive': 1.1, 'turnover': 1.15
+    },
+    "Balanced RPO": NEUTRAL_TILT,
+    "Explosive Shots": {
+        'usage': {'11_personnel': 1.2, '21_personnel': 0.8},
+        'success': 0.88, 'explosive': 1.5, 'turnover': 1.2
+    }
+}
+
+OUTCOMES = ['touchdown', 'field_goal', 'missed_field_goal', 'punt', 'turnover', 'downs', 'safety']
+
+# =============================================================================
+# DRIVE PARAMETERS - Team data + archetype -> plain arrays (picklable for workers)
+# =============================================================================
+
+def build_drive_params(team_data: Dict, archetype: Optional[str] = None) -> Dict:
+    """
+    Turn one team's formation and situational data into simulation arrays
+    Missing formations fall back to league-typical values
+    """
+    formation_data = (team_data or {}).get('formation_data', {})
+    situational = (team_data or {}).get('situational_tendencies', {})
+    tilt = ARCHETYPE_TILTS.get(archetype, NEUTRAL_TILT)
+
+    def stat(formation, key):
+        value = formation_data.get(formation, {}).get(key)
+        return float(value) if isinstance(value, (int, float)) and value > 0 else DEFAULT_FORMATION_STATS[key]
+
+    usage = np.array([stat(f, 'usage') * tilt['usage'].get(f, 1.0) for f in FORMATIONS])
+    ypp = np.array([stat(f, 'ypp') for f in FORMATIONS])
+    success_rate = np.clip(np.array([stat(f, 'success_rate') for f in FORMATIONS]) * tilt['success'], 0.05, 0.95)
+
+    red_zone = situational.get('red_zone_efficiency')
+    red_zone_factor = (red_zone / LEAGUE_BASELINES['red_zone_efficiency']
+                       if isinstance(red_zone, (int, float)) and red_zone > 0 else 1.0)
+
+    grid = build_fourth_down_grid(situational)
+    return {
+        'usage_cdf': np.cumsum(usage / usage.sum()),
+        'ypp': ypp * tilt['explosive'],
+        'success_rate': success_rate,
+        'red_zone_factor': red_zone_factor,
+        'turnover_rate': TURNOVER_RATE * tilt['turnover'],
+        'fourth_down_calls': grid['recommendation'] if grid else None
+    }
+
+# =============================================================================
+# VECTORIZED DRIVE BATCH
+# =============================================================================
+
+def simulate_drive_batch(params: Dict, n_drives: int, seed_sequence: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """
+    Simulate n_drives drives at once
+
+    Returns:
+        Dict with per-drive 'points' (int8) and 'outcome' (index into OUTCOMES)
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    field_position = np.full(n_drives, START_FIELD_POSITION, dtype=np.int64)
+    down = np.ones(n_drives, dtype=np.int64)
+    to_go = np.full(n_drives, 10, dtype=np.int64)
+    points = np.zeros(n_drives, dtype=np.int8)
+    outcome = np.full(n_drives, OUTCOMES.index('downs'), dtype=np.int8)
+    active = np.ones(n_drives, dtype=bool)
+    calls = params['fourth_down_calls']
+
+    for _ in range(MAX_PLAYS_PER_DRIVE):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        fp, dn, tg = field_position[idx], down[idx], to_go[idx]
+
+        # Fourth down: punt (0), field goal (1) or go (2)
+        call = np.full(idx.size, 2)
+        fourth = dn == 4
+        if calls is not None and fourth.any():
+            call[fourth] = calls[np.clip(tg[fourth], 1, calls.shape[0]) - 1, np.clip(fp[fourth], 1, FIELD_LENGTH - 1) - 1]
+
+        punting = call == 0
+        kicking = call == 1
+        if punting.any():
+            outcome[idx[punting]] = OUTCOMES.index('punt')
+            active[idx[punting]] = False
+        if kicking.any():
+            made = rng.random(kicking.sum()) < field_goal_probability(fp[kicking])
+            points[idx[kicking][made]] = 3
+            outcome[idx[kicking]] = np.where(made, OUTCOMES.index('field_goal'), OUTCOMES.index('missed_field_goal'))
+            active[idx[kicking]] = False
+
+        playing = call == 2
+        idx, fp, dn, tg = idx[playing], fp[playing], dn[playing], tg[playing]
+        if idx.size == 0:
+            continue
+
+        # Turnovers end the drive before the gain is applied
+        turnover = rng.random(idx.size) < params['turnover_rate']
+        outcome[idx[turnover]] = OUTCOMES.index('turnover')
+        active[idx[turnover]] = False
+        keep = ~turnover
+        idx, fp, dn, tg = idx[keep], fp[keep], dn[keep], tg[keep]
+
+        # Sample the package, then success and the gain
+        formation = np.searchsorted(params['usage_cdf'], rng.random(idx.size), side='right')
+        formation = np.minimum(formation, len(FORMATIONS) - 1)
+        p_success = params['success_rate'][formation] * np.where(fp >= RED_ZONE_LINE, params['red_zone_factor'], 1.0)
+        success = rng.random(idx.size) < np.clip(p_success, 0.02, 0.98)
+
+        threshold = np.ceil(SUCCESS_THRESHOLD[dn] * tg)
+        failed_mean = sum(FAILED_PLAY_GAIN_RANGE) / 2.0
+        extra_mean = np.maximum((params['ypp'][formation] - (1 - p_success) * failed_mean) / np.maximum(p_success, 0.05) - threshold, 1.0)
+        success_gain = threshold + np.round(rng.exponential(extra_mean))
+        fail_cap = np.maximum(np.minimum(threshold - 1, FAILED_PLAY_GAIN_RANGE[1]), FAILED_PLAY_GAIN_RANGE[0])
+        fail_gain = rng.integers(FAILED_PLAY_GAIN_RANGE[0], fail_cap + 1)
+        gain = np.where(success, success_gain, fail_gain).astype(np.int64)
+
+        new_fp = fp + gain
+        touchdown = new_fp >= FIELD_LENGTH
+        safety = new_fp <= 0
+        first_down = ~touchdown & ~safety & (gain >= tg)
+        failed_fourth = ~touchdown & ~safety & ~first_down & (dn == 4)
+
+        points[idx[touchdown]] = 7
+        outcome[idx[touchdown]] = OUTCOMES.index('touchdown')
+        points[idx[safety]] = -2
+        outcome[idx[safety]] = OUTCOMES.index('safety')
+        outcome[idx[failed_fourth]] = OUTCOMES.index('downs')
+        active[idx[touchdown | safety | failed_fourth]] = False
+
+        field_position[idx] = new_fp
+        down[idx] = np.where(first_down, 1, dn + 1)
+        to_go[idx] = np.where(first_down, np.minimum(10, FIELD_LENGTH - new_fp), tg - gain)
+
+    return {'points': points, 'outcome': outcome}
+
+def _run_batch(args):
+    """Process pool entry point (must be top level to pickle)"""
+    params, n_drives, seed_sequence = args
+    return simulate_drive_batch(params, n_drives, seed_sequence)
+
+# =============================================================================
+# DRIVE AND GAME SIMULATION
+# =============================================================================
+
+def simulate_drives(team_data: Dict, n_drives: int = DEFAULT_DRIVES, seed: Optional[int] = None,
+                    archetype: Optional[str] = None, workers: int = 1,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Simulate n_drives drives for one team in NumPy batches
+
+    Args:
+        team_data: Team dict with formation_data / situational_tendencies
+        n_drives: Total drives
+        seed: RNG seed (None = fresh entropy)
+        archetype: Strategy archetype name (see ARCHETYPE_TILTS)
+        workers: Worker processes; 1 runs batches in this process
+        batch_size: Drives per batch
+
+    Returns:
+        Dict with per-drive 'points' and 'outcome' arrays
+    """
+    params = build_drive_params(team_data, archetype)
+    batch_sizes = [min(batch_size, n_drives - start) for start in range(0, n_drives, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    jobs = [(params, size, child) for size, child in zip(batch_sizes, seeds)]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_batch, jobs))
+    else:
+        results = [_run_batch(job) for job in jobs]
+
+    return {
+        'points': np.concatenate([r['points'] for r in results]) if results else np.zeros(0, dtype=np.int8),
+        'outcome': np.concatenate([r['outcome'] for r in results]) if results else np.zeros(0, dtype=np.int8)
+    }
+
+def summarize_points(points: np.ndarray) -> Dict:
+    """Mean, percentiles and full distribution of a points array"""
+    if points.size == 0:
+        return {'mean': 0.0, 'std': 0.0, 'percentiles': {}, 'distribution': {}}
+    values, counts = np.unique(points, return_counts=True)
+    return {
+        'mean': float(points.mean()),
+        'std': float(points.std()),
+        'percentiles': {f"p{q}": float(np.percentile(points, q)) for q in (10, 25, 50, 75, 90)},
+        'distribution': {int(value): int(count) for value, count in zip(values, counts)}
+    }
+
+def simulate_matchup(team1_data: Dict, team2_data: Dict, archetypes: Optional[List[Dict]] = None,
+                     n_drives: int = DEFAULT_DRIVES, seed: Optional[int] = None, workers: int = 1) -> Dict:
+    """
+    Simulate games of team1 (running each strategy archetype) against team2's baseline offense
+
+    Each game is DRIVES_PER_GAME drives per side; n_drives drives are simulated
+    per archetype. Ties count as half a win.
+
+    Returns:
+        Dict with 'results' (one entry per archetype: win probability, game point
+        and per-drive outcome distributions), 'opponent' summary and run info
+    """
+    try:
+        start_time = time.perf_counter()
+        archetypes = archetypes or DEFAULT_ARCHETYPES
+        n_games = max(1, n_drives // DRIVES_PER_GAME)
+        seeds = np.random.SeedSequence(seed).generate_state(len(archetypes) + 1)
+
+        opponent = simulate_drives(team2_data, n_games * DRIVES_PER_GAME, int(seeds[0]), workers=workers)
+        opponent_points = opponent['points'].astype(np.int64).reshape(n_games, DRIVES_PER_GAME).sum(axis=1)
+
+        results = []
+        for archetype, archetype_seed in zip(archetypes, seeds[1:]):
+            drives = simulate_drives(team1_data, n_games * DRIVES_PER_GAME, int(archetype_seed),
+                                     archetype=archetype['name'], workers=workers)
+            game_points = drives['points'].astype(np.int64).reshape(n_games, DRIVES_PER_GAME).sum(axis=1)
+            margin = game_points - opponent_points
+            outcome_counts = np.bincount(drives['outcome'], minlength=len(OUTCOMES))
+
+            results.append({
+                'name': archetype['name'],
+                'win_probability': float((margin > 0).mean() + 0.5 * (margin == 0).mean()),
+                'points': summarize_points(game_points),
+                'average_margin': float(margin.mean()),
+                'points_per_drive': float(drives['points'].mean()),
+                'drive_outcomes': {name: float(count / drives['outcome'].size) for name, count in zip(OUTCOMES, outcome_counts)}
+            })
+
+        elapsed = time.perf_counter() - start_time
+        log_debug("simulate_matchup", 271,
+                  f"Simulated {len(archetypes)} archetypes x {n_games * DRIVES_PER_GAME} drives in {elapsed:.2f}s")
+        return {
+            'results': results,
+            'opponent': summarize_points(opponent_points),
+            'games': n_games,
+            'drives_per_game': DRIVES_PER_GAME,
+            'seed': seed,
+            'elapsed_seconds': elapsed
+        }
+
+    except Exception as e:
+        log_debug("simulate_matchup", 282, "Matchup simulation failed", e)
+        return {'results': [], 'error': str(e)}
@@ -0,0 +1,222 @@
+"""
+STARTUP PROFILE MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+=============================================================
+PURPOSE: Measure import time of streamlit_app per module and catch regressions
+FEATURES: python -X importtime parsing, median of several runs, JSON baseline compare
+ARCHITECTURE: Each run is a fresh interpreter in a scratch directory (no shared caches/DB);
+              one discarded warm-up run first, so the OS file cache is hot for every sample
+
+USAGE:
+    python app/startup_profile.py                          # print the profile
+    python app/startup_profile.py --write-baseline         # save app/data/startup_baseline.json
+    python app/startup_profile.py --check                  # exit 1 on regression
+
+CHECKS:
+- Modules in DEFERRED_MODULES (openai, plotly.express, requests) must not be
+  imported at startup - they are loaded lazily by the tab that uses them
+- The set of modules streamlit_app imports directly must match the baseline: any new
+  one costing --min-ms or more fails (refresh the baseline when it is intended)
+- Timings are noisy, so total time and per-module cumulative time only fail when the
+  median is both more than --tolerance above the baseline and more than --floor-ms
+  slower in absolute terms
+
+DEBUGGING SYSTEM:
+- Each profiling run logged with its wall time
+- Report lists the slowest modules and every regression found
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+from datetime import datetime
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("startup_profile")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(APP_DIR, 'data', 'startup_baseline.json')
+DEFAULT_TARGET = 'streamlit_app'
+
+# Not needed for the first render; pandas is left out because st.dataframe needs it on
+# the Tactical Intelligence tab, which renders on every run
+DEFERRED_MODULES = ['openai', 'plotly.express', 'plotly.subplots', 'requests']
+
+DEFAULT_RUNS = 5
+DEFAULT_TOLERANCE = 0.25      # allowed slowdown vs baseline (fraction)
+DEFAULT_MIN_MS = 20.0         # ignore modules cheaper than this
+DEFAULT_FLOOR_MS = 50.0       # ignore slowdowns smaller than this (run-to-run noise)
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+def parse_importtime(stderr: str) -> Dict[str, Dict]:
+    """
+    Parse `python -X importtime` output
+
+    Returns:
+        {module: {'self_ms', 'cumulative_ms', 'depth'}} in import-completion order
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            stripped = name.lstrip(' ')
+            depth = (len(name) - len(stripped) - 1) // 2
+            modules[stripped.strip()] = {
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000,
+                'depth': depth
+            }
+        except ValueError:
+            continue
+    return modules
+
+def direct_imports(modules: Dict[str, Dict], target: str) -> List[str]:
+    """Modules imported directly by `target` (importtime lists children just before their parent)"""
+    children = []
+    for name, info in modules.items():
+        if info['depth'] == 0:
+            if name == target:
+                return children
+            children = []
+        elif info['depth'] == 1:
+            children.append(name)
+    return []
+
+def run_once(target: str = DEFAULT_TARGET) -> Dict:
+    """Import `target` in a fresh interpreter and return its per-module import times"""
+    code = ("import time; _t = time.perf_counter(); "
+            f"import {target}; "
+            "print('WALL_MS', (time.perf_counter() - _t) * 1000)")
+    env = dict(os.environ, PYTHONPATH=APP_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''),
+               PYTHONDONTWRITEBYTECODE='1')
+
+    with tempfile.TemporaryDirectory() as scratch:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=scratch, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr[-2000:]}")
+
+    wall_ms = next((float(line.split()[1]) for line in result.stdout.splitlines()
+                    if line.startswith('WALL_MS')), None)
+    modules = parse_importtime(result.stderr)
+    log_debug("run_once", 126, f"Imported {target} in {wall_ms:.0f}ms ({len(modules)} modules)")
+    return {'wall_ms': wall_ms, 'modules': modules}
+
+def profile_startup(target: str = DEFAULT_TARGET, runs: int = DEFAULT_RUNS) -> Dict:
+    """
+    Median import profile over several fresh-interpreter runs
+
+    Returns:
+        Dict with 'target', 'runs', 'total_ms', 'modules' ({module: cumulative_ms}),
+        'top_level' ({module: cumulative_ms} for modules the target imports directly,
+        slowest first) and 'deferred_loaded'
+    """
+    run_once(target)  # warm-up, discarded
+    samples = [run_once(target) for _ in range(max(1, runs))]
+
+    names = set().union(*(sample['modules'] for sample in samples))
+    modules = {
+        name: round(statistics.median(s['modules'][name]['cumulative_ms'] for s in samples if name in s['modules']), 2)
+        for name in names
+    }
+    top_level = sorted(direct_imports(samples[0]['modules'], target), key=lambda name: -modules[name])
+    return {
+        'target': target,
+        'runs': len(samples),
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'total_ms': round(statistics.median(s['wall_ms'] for s in samples), 2),
+        'modules': modules,
+        'top_level': {name: modules[name] for name in top_level},
+        'deferred_loaded': [name for name in DEFERRED_MODULES
+                            if any(loaded == name or loaded.startswith(name + '.') for loaded in names)],
+    }
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def _slower(ms: float, before: float, tolerance: float, floor_ms: float) -> bool:
+    return ms > before * (1 + tolerance) and ms - before > floor_ms
+
+def compare_to_baseline(profile: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE,
+                        min_ms: float = DEFAULT_MIN_MS, floor_ms: float = DEFAULT_FLOOR_MS) -> List[str]:
+    """Human-readable regressions (empty list = pass)"""
+    problems = [f"{name} is imported at startup (should load lazily)" for name in profile['deferred_loaded']]
+
+    if _slower(profile['total_ms'], baseline['total_ms'], tolerance, floor_ms):
+        problems.append(f"total import time {baseline['total_ms']:.0f}ms -> {profile['total_ms']:.0f}ms")
+
+    # Only modules the target imports directly - nested timings are too noisy to gate on
+    for name, ms in profile['top_level'].items():
+        if ms < min_ms:
+            continue
+        before = baseline['top_level'].get(name)
+        if before is None:
+            problems.append(f"new startup import {name} ({ms:.0f}ms)")
+        elif _slower(ms, max(before, min_ms), tolerance, floor_ms):
+            problems.append(f"{name} {before:.0f}ms -> {ms:.0f}ms")
+    return problems
+
+def print_report(profile: Dict, top: int = 15):
+    print(f"\n{profile['target']}: {profile['total_ms']:.0f}ms median over {profile['runs']} runs")
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for name, ms in list(profile['top_level'].items())[:top]:
+        print(f"{name:<40} {ms:>14.1f}")
+    deferred = ', '.join(profile['deferred_loaded']) or 'none'
+    print(f"deferred modules loaded at startup: {deferred}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile streamlit_app import time per module")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Module to import")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Fresh-interpreter runs (median)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument("--write-baseline", action="store_true", help="Save this profile as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown fraction")
+    parser.add_argument("--min-ms", type=float, default=DEFAULT_MIN_MS, help="Ignore modules cheaper than this")
+    parser.add_argument("--floor-ms", type=float, default=DEFAULT_FLOOR_MS, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    profile = profile_startup(args.target, args.runs)
+    print_report(profile)
+
+    if args.write_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in profile.items() if k != 'modules'}, f, indent=2)
+            f.write('\n')
+        print(f"baseline written to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"no baseline at {args.baseline} - run with --write-baseline first")
+            sys.exit(1)
+        with open(args.baseline, encoding='utf-8') as f:
+            problems = compare_to_baseline(profile, json.load(f), args.tolerance, args.min_ms, args.floor_ms)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        sys.exit(1 if problems else 0)
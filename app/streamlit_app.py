@@ -24,19 +24,45 @@ CRITICAL FEATURE PRESERVATION CHECKLIST - ALL 61 FEATURES FROM GRIT v4.0:
 """
 
 import streamlit as st
-import pandas as pd
-import openai
 from datetime import datetime
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
 import uuid
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import json
 import re
 
+from database import get_data_version
+from lazy_imports import lazy_import
+from decision_engine import (
+    FOURTH_DOWN_OPTIONS, LEAGUE_BASELINES, OPTION_LABELS,
+    build_fourth_down_grid, evaluate_fourth_down, evaluate_timeout, evaluate_two_point
+)
+from figure_cache import get_cached_figure_spec
+from instrumentation import SUBSYSTEMS, export_metrics, get_latency_summary
+from job_queue import get_job, get_job_queue_stats, submit_job
+from league_data import LeagueSnapshot, METRIC_LABELS, get_league_snapshot
+from llm_ledger import get_feature_summary, get_latency_by_model, get_tokens_by_feature_per_day
+from llm_scheduler import chat_completion, get_scheduler_stats
+from matchup_engine import EDGE_LABELS, MatchupMatrix, get_matchup_matrix
+from prompt_templates import build_messages
+from reports import (
+    build_report_pdf_params, get_available_report_sections, get_nfl_teams, get_team_full_name
+)
+from session_store import get_artifact, get_session_memory, set_artifact, touch_session
+from simulator import simulate_matchup
+from theme import inject_theme
+from visualizations import (
+    create_formation_efficiency_chart, create_situational_heatmap, create_league_percentile_radar,
+    create_weather_impact_gauge, create_comprehensive_dashboard, create_chart_summary_table,
+    create_decision_grid_heatmap
+)
+
+# Heavy modules load on first use in the tab that needs them (python app/startup_profile.py).
+# numpy stays a plain import: decision_engine, league_data and simulator load it at startup
+openai = lazy_import("openai")
+pd = lazy_import("pandas")
+
 # =============================================================================
 # STREAMLIT CONFIGURATION - GRIT v4.0 STANDARD
 # =============================================================================
@@ -52,450 +78,9 @@ st.set_page_config(
 # CRITICAL STYLING - GRIT v4.0 DARK THEME WITH WHITE TEXT - COMPREHENSIVE DROPDOWN FIX
 # =============================================================================
 
-# ENHANCED DARK THEME CSS WITH WHITE TEXT - COMPLETE GRIT v4.0 STYLING + DROPDOWN FIX
-GRIT_CSS = """
-<style>
-    /* CRITICAL STYLING PRINCIPLES FROM GRIT v4.0 */
-    /* 1. Dark background = WHITE text ALWAYS */
-    /* 2. Green gradients for accents and highlights */
-    /* 3. Professional appearance without gaming elements */
-    
-    /* Dark theme base */
-    .stApp {
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 50%, #0a0a0a 100%);
-        color: #ffffff !important;
-    }
-    
-    /* SIDEBAR STYLING - FORCE BLACK BACKGROUND */
-    .css-1d391kg, .css-1cypcdb, .css-17lntkn, section[data-testid="stSidebar"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    .css-1d391kg .css-1cypcdb {
-        background: #000000 !important;
-    }
-    
-    /* Sidebar content wrapper */
-    .css-1cypcdb > div {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* DROPDOWN SELECTORS - NUCLEAR OPTION FIX FOR ALL POSSIBLE DROPDOWN ELEMENTS */
-    
-    /* Target all possible dropdown containers and elements */
-    .stSelectbox, .stSelectbox *, 
-    div[data-testid="stSelectbox"], div[data-testid="stSelectbox"] *,
-    [data-baseweb="select"], [data-baseweb="select"] *,
-    [role="listbox"], [role="listbox"] *,
-    [role="option"], [role="combobox"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Main selectbox container */
-    .stSelectbox > div > div {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* Select element itself */
-    .stSelectbox > div > div > select {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* React Select comprehensive targeting */
-    .stSelectbox [data-baseweb="select"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    .stSelectbox [data-baseweb="select"] > div {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* Dropdown menu container */
-    .stSelectbox [data-baseweb="popover"] {
-        background: #000000 !important;
-    }
-    
-    /* Dropdown options list */
-    .stSelectbox [data-baseweb="menu"] {
-        background: #000000 !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* Individual dropdown options */
-    .stSelectbox [data-baseweb="option"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    .stSelectbox [data-baseweb="option"]:hover {
-        background: #1a1a1a !important;
-        color: #ffffff !important;
-    }
-    
-    /* Selected option styling */
-    .stSelectbox [data-baseweb="option"][aria-selected="true"] {
-        background: #00ff41 !important;
-        color: #000000 !important;
-    }
-    
-    /* Streamlit emotion cache classes (comprehensive) */
-    [class*="st-emotion-cache"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Role-based selectors for dropdown elements */
-    [role="listbox"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    [role="option"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    [role="option"]:hover {
-        background: #1a1a1a !important;
-        color: #ffffff !important;
-    }
-    
-    [role="combobox"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* Dropdown arrow and text */
-    .css-1wa3eu0-placeholder, .css-12jo7m5, .css-1uccc91-singleValue {
-        color: #ffffff !important;
-    }
-    
-    /* Legacy CSS class selectors */
-    .css-26l3qy-menu {
-        background: #000000 !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    .css-1n7v3ny-option {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    .css-1n7v3ny-option:hover {
-        background: #1a1a1a !important;
-        color: #ffffff !important;
-    }
-    
-    /* Additional comprehensive dropdown fixes */
-    div[data-testid="stSelectbox"] div {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    div[data-testid="stSelectbox"] ul {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    div[data-testid="stSelectbox"] li {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    div[data-testid="stSelectbox"] li:hover {
-        background: #1a1a1a !important;
-        color: #ffffff !important;
-    }
-    
-    /* Nuclear option - force all potential dropdown elements */
-    .stSelectbox * {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Input fields - FORCE BLACK BACKGROUND */
-    .stTextInput > div > div > input {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-        border-radius: 8px;
-    }
-    
-    .stTextInput > div > div > input::placeholder {
-        color: #cccccc !important;
-    }
-    
-    /* ENHANCED STYLING - FORCE BLACK BACKGROUNDS WITH WHITE TEXT EVERYWHERE */
-    
-    /* Main content areas - FORCE BLACK */
-    .main .block-container {
-        padding-top: 2rem;
-        background: #000000 !important;
-        border-radius: 15px;
-        margin: 1rem;
-        border: 1px solid #00ff41;
-        color: #ffffff !important;
-    }
-    
-    /* All content containers */
-    .stContainer, .element-container, .stColumn {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Expandable sections */
-    .streamlit-expanderHeader {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    .streamlit-expanderContent {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Code blocks and text areas */
-    .stCodeBlock, .stTextArea, pre, code {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333 !important;
-    }
-    
-    /* Professional Tools specific styling */
-    .stSelectbox, .stMultiSelect, .stCheckbox {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* White content areas - OVERRIDE TO BLACK */
-    div[data-testid="stSidebar"] .stSelectbox > div > div,
-    div[data-testid="stSidebar"] .stTextInput > div > div,
-    .main .stSelectbox > div > div,
-    .main .stTextInput > div > div,
-    .main .stTextArea > div > div {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 1px solid #333333 !important;
-    }
-    
-    /* Professional report display */
-    .generated-report, .report-preview {
-        background: #000000 !important;
-        color: #ffffff !important;
-        border: 2px solid #00ff41 !important;
-        padding: 20px;
-        border-radius: 10px;
-        margin: 20px 0;
-    }
-    
-    /* HEADER/TOP BAR STYLING */
-    header[data-testid="stHeader"] {
-        background: #000000 !important;
-        color: #ffffff !important;
-    }
-    
-    /* Tabs styling with green gradients */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-        background: linear-gradient(90deg, #1a1a1a 0%, #2d2d2d 100%);
-        border-radius: 10px;
-        padding: 8px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        background: linear-gradient(135deg, #2d2d2d 0%, #1a1a1a 100%);
-        border-radius: 8px;
-        color: #ffffff !important;
-        border: 1px solid #333;
-        transition: all 0.3s ease;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #00ff41 0%, #00cc33 100%) !important;
-        color: #000000 !important;
-        box-shadow: 0 0 20px rgba(0, 255, 65, 0.3);
-    }
-    
-    /* Buttons with green gradients */
-    .stButton > button {
-        background: linear-gradient(135deg, #00ff41 0%, #00cc33 100%);
-        color: #000000;
-        border: none;
-        border-radius: 8px;
-        padding: 12px 24px;
-        font-weight: bold;
-        transition: all 0.3s ease;
-        box-shadow: 0 0 10px rgba(0, 255, 65, 0.2);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #00cc33 0%, #00ff41 100%);
-        box-shadow: 0 0 20px rgba(0, 255, 65, 0.5);
-        transform: translateY(-2px);
-    }
-    
-    /* Metrics with white text */
-    [data-testid="metric-container"] {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        border: 1px solid #333;
-        border-radius: 10px;
-        padding: 15px;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3);
-        color: #ffffff !important;
-    }
-    
-    /* Alert messages with white text */
-    .stSuccess {
-        background: linear-gradient(135deg, #004d1a 0%, #00331a 100%);
-        border: 1px solid #00ff41;
-        color: #ffffff !important;
-    }
-    
-    .stWarning {
-        background: linear-gradient(135deg, #4d3300 0%, #331f00 100%);
-        border: 1px solid #ff9900;
-        color: #ffffff !important;
-    }
-    
-    .stError {
-        background: linear-gradient(135deg, #4d0000 0%, #330000 100%);
-        border: 1px solid #ff3333;
-        color: #ffffff !important;
-    }
-    
-    .stInfo {
-        background: linear-gradient(135deg, #003d4d 0%, #002633 100%);
-        border: 1px solid #00ccff;
-        color: #ffffff !important;
-    }
-    
-    /* FORCE ALL TEXT TO BE WHITE */
-    .stMarkdown, .stMarkdown p, .stMarkdown div, .stMarkdown span,
-    h1, h2, h3, h4, h5, h6, p, div, span, label {
-        color: #ffffff !important;
-    }
-    
-    /* Sidebar specific text */
-    .css-1d391kg .stMarkdown, .css-1d391kg p, .css-1d391kg div, 
-    .css-1d391kg span, .css-1d391kg label {
-        color: #ffffff !important;
-    }
-    
-    /* HOW-TO GUIDE STYLING - ENHANCEMENT: Professional help section styling */
-    .how-to-section {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        border: 1px solid #00ff41;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        box-shadow: 0 4px 15px rgba(0, 255, 65, 0.1);
-    }
-    
-    .terminology-box {
-        background: linear-gradient(135deg, #003d4d 0%, #002633 100%);
-        border: 1px solid #00ccff;
-        border-radius: 8px;
-        padding: 12px;
-        margin: 8px 0;
-        color: #ffffff !important;
-    }
-    
-    /* TEAM ANALYSIS TAB SPECIFIC STYLING - FIXED WITH SCROLL AREAS */
-    .team-advantages {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        border-left: 4px solid #00ff41;
-        color: #ffffff !important;
-        height: 500px;
-        overflow-y: auto;
-    }
-    
-    .team-roster {
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 100%);
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        border: 1px solid #333;
-        box-shadow: 0 2px 4px rgba(0, 255, 65, 0.1);
-        color: #ffffff !important;
-        height: 500px;
-        overflow-y: auto;
-    }
-    
-    .matchup-intelligence {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        border-radius: 10px;
-        padding: 20px;
-        margin: 20px 0;
-        border: 2px solid #00ff41;
-        color: #ffffff !important;
-    }
-    
-    .ai-analysis {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-        border-left: 4px solid #00ff41;
-        color: #ffffff !important;
-    }
-    
-    .report-generator {
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 100%);
-        border-radius: 10px;
-        padding: 20px;
-        margin: 20px 0;
-        border: 2px solid #00ff41;
-        color: #ffffff !important;
-    }
-    
-    .report-section-tag {
-        display: inline-block;
-        background: linear-gradient(135deg, #00ff41 0%, #00cc33 100%);
-        color: #000000 !important;
-        padding: 8px 15px;
-        margin: 5px;
-        border-radius: 20px;
-        font-size: 14px;
-        font-weight: bold;
-        border: none;
-        cursor: pointer;
-    }
-    
-    .report-section-tag:hover {
-        background: linear-gradient(135deg, #00cc33 0%, #00ff41 100%);
-    }
-    
-    .generated-report {
-        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 100%);
-        color: #ffffff !important;
-        padding: 20px;
-        margin: 20px 0;
-        border-radius: 10px;
-        border: 1px solid #333;
-        font-family: 'Courier New', monospace;
-        line-height: 1.6;
-    }
-</style>
-"""
-
-# Inject the complete GRIT v4.0 styling
-st.markdown(GRIT_CSS, unsafe_allow_html=True)
+# Dark theme lives in app/static/grit_theme.css; theme.py minifies and content-hashes it
+# once per process and injects it as an inline <style> that is byte-identical across reruns
+inject_theme()
 
 # =============================================================================
 # SESSION STATE INITIALIZATION - BUG FIX: Line 120 from GRIT v4.0
@@ -525,10 +110,14 @@ def initialize_session_state():
             'coaching_perspective': 'Head Coach',
             'analysis_type': 'Edge Detection'
         },
+        # Large values below are ArtifactRefs into session_store once set (set_artifact/get_artifact)
         'current_weather_data': {},
         'last_analysis': None,
         'selected_report_sections': ['executive_summary', 'formation_analysis', 'tactical_recommendations'],
-        'generated_report': None
+        'generated_report': None,
+        # Background job IDs are mirrored in the URL (?jobs=) so a page refresh still finds them
+        'job_ids': [job_id for job_id in st.query_params.get('jobs', '').split(',') if job_id],
+        'delivered_jobs': []
     }
     
     for key, default_value in default_values.items():
@@ -554,6 +143,21 @@ def get_session_state_safely(key, default_value):
 # CRITICAL: Initialize session state immediately
 initialize_session_state()
 
+# Large artifacts (analyses, reports, weather) live in the shared session_store;
+# touching the session each rerun keeps them from being evicted as idle
+touch_session()
+
+# League-wide team metrics and percentiles - built once per data version
+try:
+    data_version = get_data_version()
+    league_snapshot = get_league_snapshot(data_version)
+    matchup_matrix = get_matchup_matrix(data_version)
+except Exception as e:
+    st.error(f"⚠️ Team database unavailable - charts will show empty data: {str(e)}")
+    data_version = "unavailable"
+    league_snapshot = LeagueSnapshot({}, data_version)
+    matchup_matrix = MatchupMatrix(league_snapshot)
+
 # =============================================================================
 # GRIT v4.0 HELPER FUNCTIONS - ENHANCEMENT SYSTEM
 # =============================================================================
@@ -578,47 +182,49 @@ def render_how_to_section(title, content):
         st.markdown(content, unsafe_allow_html=True)
 
 # =============================================================================
-# NFL TEAM DATA AND ANALYSIS FUNCTIONS
+# FRAGMENT SUPPORT - tab bodies rerun on their own when their widgets change
 # =============================================================================
 
-def get_nfl_teams() -> List[str]:
-    """
-    Get list of all NFL teams.
-    
-    Returns:
-        List[str]: List of NFL team abbreviations
-    """
-    return [
-        'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE',
-        'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
-        'LV', 'LAC', 'LAR', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
-        'NYJ', 'PHI', 'PIT', 'SF', 'SEA', 'TB', 'TEN', 'WAS'
-    ]
-
-def get_team_full_name(team_abbr: str) -> str:
+# st.fragment on Streamlit >= 1.37, st.experimental_fragment before that
+fragment = getattr(st, 'fragment', None) or st.experimental_fragment
+
+def get_fragment_inputs() -> Dict:
     """
-    Convert team abbreviation to full team name.
-    
-    Args:
-        team_abbr (str): Team abbreviation (e.g., 'PHI')
-        
-    Returns:
-        str: Full team name (e.g., 'Philadelphia Eagles')
+    Inputs shared by the tab fragments
+    A fragment rerun skips the sidebar, so selections are read back from the
+    session_state keys the sidebar writes rather than from its local variables
     """
-    team_names = {
-        'ARI': 'Arizona Cardinals', 'ATL': 'Atlanta Falcons', 'BAL': 'Baltimore Ravens',
-        'BUF': 'Buffalo Bills', 'CAR': 'Carolina Panthers', 'CHI': 'Chicago Bears',
-        'CIN': 'Cincinnati Bengals', 'CLE': 'Cleveland Browns', 'DAL': 'Dallas Cowboys',
-        'DEN': 'Denver Broncos', 'DET': 'Detroit Lions', 'GB': 'Green Bay Packers',
-        'HOU': 'Houston Texans', 'IND': 'Indianapolis Colts', 'JAX': 'Jacksonville Jaguars',
-        'KC': 'Kansas City Chiefs', 'LV': 'Las Vegas Raiders', 'LAC': 'Los Angeles Chargers',
-        'LAR': 'Los Angeles Rams', 'MIA': 'Miami Dolphins', 'MIN': 'Minnesota Vikings',
-        'NE': 'New England Patriots', 'NO': 'New Orleans Saints', 'NYG': 'New York Giants',
-        'NYJ': 'New York Jets', 'PHI': 'Philadelphia Eagles', 'PIT': 'Pittsburgh Steelers',
-        'SF': 'San Francisco 49ers', 'SEA': 'Seattle Seahawks', 'TB': 'Tampa Bay Buccaneers',
-        'TEN': 'Tennessee Titans', 'WAS': 'Washington Commanders'
+    return {
+        'teams': get_session_state_safely('selected_teams', {'team1': None, 'team2': None, 'weather_team': None}),
+        'game_situation': get_session_state_safely('game_situation', {
+            'down': 1, 'distance': 10, 'field_position': 50,
+            'score_differential': 0, 'time_remaining': '15:00'
+        }),
+        'analysis_preferences': get_session_state_safely('analysis_preferences', {
+            'complexity_level': 'Advanced', 'coaching_perspective': 'Head Coach', 'analysis_type': 'Edge Detection'
+        }),
+        'data_version': data_version
     }
-    return team_names.get(team_abbr, team_abbr)
+
+# =============================================================================
+# BACKGROUND JOBS - report/analysis jobs run on job_queue workers; the panel polls them
+# =============================================================================
+
+JOB_POLL_SECONDS = 2
+JOB_HISTORY_LIMIT = 10
+JOB_LABELS = {
+    'professional_report': '📋 Professional report',
+    'strategic_analysis': '🧠 Strategic analysis'
+}
+
+def track_job(job_id: str):
+    """Remember a job for this session (and in the URL, so a refresh keeps it)"""
+    job_ids = [j for j in st.session_state.get('job_ids', []) if j != job_id] + [job_id]
+    st.session_state.job_ids = job_ids[-JOB_HISTORY_LIMIT:]
+    st.query_params['jobs'] = ','.join(st.session_state.job_ids)
+
+def get_session_jobs() -> List[Dict]:
+    return [job for job in (get_job(job_id) for job_id in st.session_state.get('job_ids', [])) if job]
 
 # =============================================================================
 # OPENAI CLIENT SETUP - BUG FIX: Enhanced error handling
@@ -671,43 +277,10 @@ def generate_ai_team_analysis(team: str, client) -> str:
     try:
         team_name = get_team_full_name(team)
         
-        prompt = f"""
-        You are an expert NFL analyst. Provide comprehensive strategic analysis for the {team_name} ({team}) for the current 2024 NFL season.
-
-        Please provide detailed information in the following categories:
-
-        1. TEAM STRENGTHS (3-4 specific items):
-        - What this team does exceptionally well
-        - Statistical advantages
-        - Key personnel strengths
-
-        2. TEAM WEAKNESSES (3-4 specific items):
-        - Areas where this team struggles
-        - Statistical disadvantages
-        - Personnel limitations
-
-        3. KEY PLAYERS WITH PERFORMANCE NOTES:
-        - QB: Name and key strengths
-        - Top RB: Name and rushing style
-        - Top 2 WRs: Names and receiving abilities
-        - Top TE: Name and role
-        - Top defensive players with key stats
-
-        4. STRATEGIC INSIGHTS:
-        - Formation preferences and tendencies
-        - What opponents should target
-        - What this team needs to protect
-        - Situational advantages/disadvantages
-
-        Format your response professionally with clear sections and bullet points.
-        """
-
-        response = client.chat.completions.create(
+        response = chat_completion(
+            client, feature="team_report",
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a professional NFL data analyst providing comprehensive team reports."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_messages("team_report", team_name=team_name, team=team),
             max_tokens=800,
             temperature=0.7
         )
@@ -732,35 +305,10 @@ def get_team_roster_data(team_abbr: str, client) -> Dict:
     try:
         team_name = get_team_full_name(team_abbr)
         
-        prompt = f"""
-        Provide the current 2024 NFL season roster information for the {team_name} ({team_abbr}).
-        
-        Return ONLY a JSON object with this exact structure:
-        {{
-            "offense": {{
-                "qb": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "rb": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "wr1": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "wr2": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "te": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}}
-            }},
-            "defense": {{
-                "de": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "lb": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "cb": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}},
-                "s": {{"name": "Player Name", "stats": "Key stats", "overall": "Rating/Description"}}
-            }}
-        }}
-        
-        Use real current 2024 season players and statistics. Do not include any text outside the JSON object.
-        """
-        
-        response = client.chat.completions.create(
+        response = chat_completion(
+            client, feature="team_roster",
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an NFL data analyst providing structured roster information in JSON format only."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_messages("team_roster", team_name=team_name, team=team_abbr),
             max_tokens=600,
             temperature=0.3
         )
@@ -819,26 +367,14 @@ def generate_matchup_analysis(your_team: str, opponent_team: str, client) -> str
         your_team_name = get_team_full_name(your_team)
         opponent_team_name = get_team_full_name(opponent_team)
         
-        prompt = f"""
-        You are an expert NFL analyst. Provide a comprehensive strategic analysis for an upcoming matchup between {your_team_name} ({your_team}) and {opponent_team_name} ({opponent_team}).
-
-        Please provide:
-        1. A 2-3 sentence overview of the matchup style/theme
-        2. 3 specific strategic recommendations for {your_team_name}
-        3. Key areas where {your_team_name} can exploit {opponent_team_name}
-        4. Main threats {opponent_team_name} poses to {your_team_name}
-        5. Formation and personnel package recommendations
-        6. Weather considerations and adjustments
-
-        Keep the analysis concise, tactical, and focused on actionable insights. Use NFL terminology and be specific about play calling and strategy.
-        """
-        
-        response = client.chat.completions.create(
+        response = chat_completion(
+            client, feature="matchup_overview",
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert NFL strategic analyst providing tactical insights for coaching staff."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_messages(
+                "matchup_overview",
+                your_team_name=your_team_name, your_team=your_team,
+                opponent_team_name=opponent_team_name, opponent_team=opponent_team
+            ),
             max_tokens=700,
             temperature=0.7
         )
@@ -849,433 +385,31 @@ def generate_matchup_analysis(your_team: str, opponent_team: str, client) -> str
         return f"Error generating matchup analysis: {str(e)}. Please check your OpenAI API key and try again."
 
 # =============================================================================
-# VISUALIZATION FUNCTIONS - RESTORED FROM PREVIOUS VERSION
+# VISUALIZATION DATA - ONE CHART ENGINE BACKED BY THE TEAMS TABLE
 # =============================================================================
+# Charts come from visualizations.py; team metrics and league percentiles come
+# from the league snapshot built once per data version (league_data.py)
 
-def create_formation_efficiency_chart(team1: str, team2: str) -> go.Figure:
-    """
-    RESTORED FUNCTION: Create formation efficiency comparison chart
-    Shows personnel package success rates for both teams
-    """
-    try:
-        formations = ['11 Personnel', '12 Personnel', '21 Personnel', '10 Personnel', '13 Personnel']
-        
-        # Realistic formation efficiency data based on NFL averages
-        team1_efficiency = [72, 68, 75, 65, 58]  
-        team2_efficiency = [70, 72, 62, 71, 55]
-        
-        fig = go.Figure()
-        
-        # Add bars for both teams
-        fig.add_trace(go.Bar(
-            name=get_team_full_name(team1),
-            x=formations,
-            y=team1_efficiency,
-            marker_color='#00ff41',
-            text=[f'{x}%' for x in team1_efficiency],
-            textposition='auto',
-        ))
-        
-        fig.add_trace(go.Bar(
-            name=get_team_full_name(team2),
-            x=formations,
-            y=team2_efficiency,
-            marker_color='#ff6b6b',
-            text=[f'{x}%' for x in team2_efficiency],
-            textposition='auto',
-        ))
-        
-        fig.update_layout(
-            title='Formation Efficiency Comparison',
-            xaxis_title='Personnel Package',
-            yaxis_title='Success Rate (%)',
-            barmode='group',
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font_color='#ffffff',
-            showlegend=True
-        )
-        
-        return fig
-        
-    except Exception as e:
-        st.error(f"Error creating formation efficiency chart: {str(e)}")
-        return None
-
-def create_situational_heatmap(team1: str, team2: str) -> go.Figure:
+def get_matchup_chart_data(team1: str, team2: str) -> Tuple[Dict, Dict, str, str]:
     """
-    RESTORED FUNCTION: Create situational performance heatmap
-    Shows performance across different down and distance combinations
-    """
-    try:
-        situations = ['1st & 10', '2nd & Long', '2nd & Short', '3rd & Long', '3rd & Short', '4th & Short']
-        metrics = ['Pass Success', 'Rush Success', 'Red Zone', 'Goal Line']
-        
-        # Sample heatmap data (success rates)
-        team1_data = [
-            [75, 68, 82, 71],  # 1st & 10
-            [65, 45, 70, 55],  # 2nd & Long
-            [78, 85, 88, 82],  # 2nd & Short
-            [72, 35, 65, 48],  # 3rd & Long
-            [85, 78, 92, 85],  # 3rd & Short
-            [65, 82, 78, 88]   # 4th & Short
-        ]
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=team1_data,
-            x=metrics,
-            y=situations,
-            colorscale='RdYlGn',
-            text=[[f'{val}%' for val in row] for row in team1_data],
-            texttemplate="%{text}",
-            textfont={"size": 12},
-            hoverongaps=False
-        ))
-        
-        fig.update_layout(
-            title=f'{get_team_full_name(team1)} Situational Performance',
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font_color='#ffffff'
-        )
-        
-        return fig
-        
-    except Exception as e:
-        st.error(f"Error creating situational heatmap: {str(e)}")
-        return None
-
-def create_personnel_advantages_radar(team1: str, team2: str) -> go.Figure:
-    """
-    RESTORED FUNCTION: Create radar chart showing team strengths
-    Compares key performance areas between teams
-    """
-    try:
-        categories = ['Pass Offense', 'Rush Offense', 'Pass Defense', 'Rush Defense', 
-                     'Red Zone', 'Third Down', 'Turnover Diff', 'Special Teams']
-        
-        # Sample team ratings (0-100 scale)
-        team1_values = [85, 72, 78, 68, 82, 75, 88, 71]
-        team2_values = [92, 65, 82, 71, 75, 85, 72, 78]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatterpolar(
-            r=team1_values,
-            theta=categories,
-            fill='toself',
-            name=get_team_full_name(team1),
-            line_color='#00ff41'
-        ))
-        
-        fig.add_trace(go.Scatterpolar(
-            r=team2_values,
-            theta=categories,
-            fill='toself',
-            name=get_team_full_name(team2),
-            line_color='#ff6b6b'
-        ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100],
-                    color='#ffffff'
-                ),
-                angularaxis=dict(color='#ffffff')
-            ),
-            showlegend=True,
-            title='Team Strengths Comparison',
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font_color='#ffffff'
-        )
-        
-        return fig
-        
-    except Exception as e:
-        st.error(f"Error creating radar chart: {str(e)}")
-        return None
-
-def create_weather_impact_gauge(weather_conditions: Dict = None) -> go.Figure:
-    """
-    RESTORED FUNCTION: Create weather impact gauge
-    Shows how weather conditions affect game strategy
-    """
-    try:
-        # Calculate weather impact score (0-100)
-        impact_score = 25  # Base neutral weather
-        
-        if weather_conditions:
-            # Adjust based on conditions
-            if weather_conditions.get('wind_speed', 0) > 15:
-                impact_score += 30
-            if weather_conditions.get('precipitation', 0) > 0.1:
-                impact_score += 25
-            if weather_conditions.get('temperature', 70) < 32:
-                impact_score += 20
-                
-        impact_score = min(100, impact_score)
-        
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = impact_score,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Weather Impact on Game Strategy"},
-            delta = {'reference': 25},
-            gauge = {
-                'axis': {'range': [None, 100], 'tickcolor': '#ffffff'},
-                'bar': {'color': "#00ff41"},
-                'steps': [
-                    {'range': [0, 25], 'color': "#1a1a1a"},
-                    {'range': [25, 50], 'color': "#333333"},
-                    {'range': [50, 75], 'color': "#666666"},
-                    {'range': [75, 100], 'color': "#999999"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        
-        fig.update_layout(
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font_color='#ffffff'
-        )
-        
-        return fig
-        
-    except Exception as e:
-        st.error(f"Error creating weather gauge: {str(e)}")
-        return None
-
-def create_comprehensive_dashboard(team1: str, team2: str) -> go.Figure:
-    """
-    RESTORED FUNCTION: Create comprehensive multi-panel dashboard
-    Combines multiple visualizations into one view
-    """
-    try:
-        # Create subplots
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Team Comparison', 'Formation Efficiency', 'Situational Success', 'Key Metrics'),
-            specs=[[{"type": "bar"}, {"type": "bar"}],
-                   [{"type": "scatter"}, {"type": "indicator"}]]
-        )
-        
-        # Team comparison bars
-        categories = ['Offense', 'Defense', 'Special Teams']
-        team1_scores = [85, 78, 72]
-        team2_scores = [82, 81, 75]
-        
-        fig.add_trace(go.Bar(x=categories, y=team1_scores, name=team1, marker_color='#00ff41'), row=1, col=1)
-        fig.add_trace(go.Bar(x=categories, y=team2_scores, name=team2, marker_color='#ff6b6b'), row=1, col=1)
-        
-        # Formation efficiency
-        formations = ['11 Personnel', '12 Personnel', '21 Personnel']
-        efficiency = [72, 68, 75]
-        fig.add_trace(go.Bar(x=formations, y=efficiency, marker_color='#00ccff'), row=1, col=2)
-        
-        # Situational success scatter
-        downs = [1, 2, 3, 4]
-        success_rates = [75, 68, 62, 45]
-        fig.add_trace(go.Scatter(x=downs, y=success_rates, mode='lines+markers', 
-                                name='Success Rate', line_color='#00ff41'), row=2, col=1)
-        
-        # Key metric gauge
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=78,
-            title={'text': "Overall Rating"},
-            gauge={'axis': {'range': [None, 100]}, 'bar': {'color': "#00ff41"}}
-        ), row=2, col=2)
-        
-        fig.update_layout(
-            height=600,
-            showlegend=False,
-            plot_bgcolor='#000000',
-            paper_bgcolor='#000000',
-            font_color='#ffffff',
-            title_text="Comprehensive Team Analysis Dashboard"
-        )
-        
-        return fig
-        
-    except Exception as e:
-        st.error(f"Error creating comprehensive dashboard: {str(e)}")
-        return None
-
-def create_chart_summary_table(team1: str, team2: str) -> pd.DataFrame:
-    """
-    RESTORED FUNCTION: Create summary data table for charts
-    Provides tabular data supporting the visualizations
-    """
-    try:
-        summary_data = {
-            'Metric': [
-                'Passing Yards/Game', 'Rushing Yards/Game', 'Points/Game', 
-                'Takeaways', 'Third Down %', 'Red Zone %'
-            ],
-            get_team_full_name(team1): [247, 108, 24.2, 18, 42.3, 61.5],
-            get_team_full_name(team2): [275, 98, 26.8, 22, 45.1, 58.2],
-            'League Avg': [230, 112, 22.5, 15, 40.1, 59.8],
-            'Advantage': [team2, team1, team2, team2, team2, team1]
-        }
-        
-        return pd.DataFrame(summary_data)
-        
-    except Exception as e:
-        st.error(f"Error creating summary table: {str(e)}")
-        return pd.DataFrame()
-
-# =============================================================================
-# PROFESSIONAL REPORT GENERATOR FUNCTIONS
-# =============================================================================
-
-def get_available_report_sections() -> Dict[str, str]:
-    """
-    Get available report sections for the Professional Report Generator.
+    Look up both teams in the league snapshot (no database queries)
     
     Returns:
-        Dict[str, str]: Dictionary of section IDs and names
+        Tuple of (team1_data, team2_data, team1_full_name, team2_full_name)
     """
-    return {
-        'executive_summary': 'Executive Summary',
-        'formation_analysis': 'Formation Analysis', 
-        'tactical_recommendations': 'Tactical Recommendations',
-        'player_matchups': 'Player Matchups',
-        'situational_analysis': 'Situational Analysis',
-        'weather_impact': 'Weather Impact',
-        'clock_management': 'Clock Management',
-        'conclusion': 'Conclusion'
-    }
-
-def generate_professional_report_section(section_id: str, your_team: str, opponent_team: str, client) -> str:
-    """
-    Generate a specific section of the professional report using ChatGPT.
-    
-    Args:
-        section_id (str): ID of the section to generate
-        your_team (str): Your team abbreviation
-        opponent_team (str): Opponent team abbreviation
-        client: OpenAI client
-        
-    Returns:
-        str: Generated section content
-    """
-    try:
-        your_team_name = get_team_full_name(your_team)
-        opponent_team_name = get_team_full_name(opponent_team)
-        
-        # Section-specific prompts
-        section_prompts = {
-            'executive_summary': f"""
-            Write a professional executive summary for the {your_team_name} vs {opponent_team_name} matchup.
-            Focus on key strategic advantages and the overall game narrative. Keep it concise and suitable for coaching staff.
-            """,
-            
-            'formation_analysis': f"""
-            Provide detailed formation analysis for {your_team_name} vs {opponent_team_name}.
-            Include personnel packages, defensive alignments, and strategic formation recommendations.
-            Use technical football terminology appropriate for coaching staff.
-            """,
-            
-            'tactical_recommendations': f"""
-            Generate specific tactical recommendations for {your_team_name} against {opponent_team_name}.
-            Include offensive strategy, defensive adjustments, and special teams considerations.
-            Format as numbered recommendations with rationale.
-            """,
-            
-            'player_matchups': f"""
-            Analyze key player matchups between {your_team_name} and {opponent_team_name}.
-            Focus on position battles, mismatches to exploit, and individual player strengths/weaknesses.
-            """,
-            
-            'situational_analysis': f"""
-            Provide situational analysis for {your_team_name} vs {opponent_team_name}.
-            Cover third down, red zone, two-minute drill, and short yardage situations.
-            """,
-            
-            'weather_impact': f"""
-            Analyze potential weather impact on the {your_team_name} vs {opponent_team_name} game.
-            Include adjustments for wind, temperature, precipitation, and field conditions.
-            """,
-            
-            'clock_management': f"""
-            Provide clock management strategy for {your_team_name} vs {opponent_team_name}.
-            Cover end-of-half scenarios, fourth quarter strategy, and timeout usage.
-            """,
-            
-            'conclusion': f"""
-            Write a strategic conclusion for the {your_team_name} vs {opponent_team_name} analysis.
-            Summarize key points and provide final strategic recommendations.
-            """
-        }
-        
-        prompt = section_prompts.get(section_id, f"Analyze the {section_id} for {your_team_name} vs {opponent_team_name}")
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a professional NFL analyst creating formal reports for coaching staff."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=600,
-            temperature=0.7
-        )
-        
-        return response.choices[0].message.content
-        
-    except Exception as e:
-        return f"Error generating {section_id}: {str(e)}"
+    team1_name = get_team_full_name(team1)
+    team2_name = get_team_full_name(team2)
+    return (league_snapshot.get_team_data(team1_name), league_snapshot.get_team_data(team2_name),
+            team1_name, team2_name)
 
-def compile_professional_report(selected_sections: List[str], your_team: str, opponent_team: str, client) -> str:
+@st.cache_data(show_spinner=False, max_entries=64)
+def run_strategy_simulation(team1: str, team2: str, data_version: str, seed: int) -> Dict:
     """
-    Compile a complete professional report from selected sections.
-    
-    Args:
-        selected_sections (List[str]): List of section IDs to include
-        your_team (str): Your team abbreviation  
-        opponent_team (str): Opponent team abbreviation
-        client: OpenAI client
-        
-    Returns:
-        str: Complete formatted professional report
+    Monte Carlo simulation of every strategy archetype for team1 vs team2
+    Cached per matchup, data version and seed
     """
-    your_team_name = get_team_full_name(your_team)
-    opponent_team_name = get_team_full_name(opponent_team)
-    
-    # Report header
-    report_content = f"""
-# PROFESSIONAL STRATEGIC ANALYSIS REPORT
-## {your_team_name} vs {opponent_team_name}
-**Generated:** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-**Analysis Tool:** NFL Team Analysis Dashboard powered by ChatGPT 3.5 Turbo
-
----
-
-"""
-    
-    # Generate each selected section
-    available_sections = get_available_report_sections()
-    
-    for section_id in selected_sections:
-        if section_id in available_sections:
-            section_name = available_sections[section_id]
-            
-            report_content += f"## {section_name.upper()}\n\n"
-            
-            section_content = generate_professional_report_section(
-                section_id, your_team, opponent_team, client
-            )
-            
-            report_content += f"{section_content}\n\n---\n\n"
-    
-    return report_content
+    team1_data, team2_data, _, _ = get_matchup_chart_data(team1, team2)
+    return simulate_matchup(team1_data, team2_data, seed=seed)
 
 # =============================================================================
 # MAIN APPLICATION HEADER - GRIT v4.0 STYLE
@@ -1474,24 +608,42 @@ with st.sidebar:
     st.info("✅ Advanced GPT Analysis Ready")
     st.info("✅ Professional Tools Available")
     st.info("✅ Team Comparison Active")
+    
+    job_stats = get_job_queue_stats()['by_status']
+    st.caption(f"Background jobs: {job_stats.get('running', 0)} running, {job_stats.get('queued', 0)} queued")
+    llm_stats = get_scheduler_stats()
+    st.caption(f"LLM scheduler: {llm_stats['in_flight']} in flight, {llm_stats['queue_depth']} waiting, "
+               f"{llm_stats['retries']} retries (p95 wait {llm_stats['queue_wait']['interactive']['p95_ms']:.0f} ms)")
+    
+    session_memory = get_session_memory()
+    st.caption(f"Session memory: {(session_memory['bytes'] + session_memory['state_bytes']) / 1024:.1f} KB "
+               f"({session_memory['artifacts']} shared artifacts)")
 
 # =============================================================================
 # TAB STRUCTURE - ENHANCED WITH TEAM ANALYSIS TAB
 # =============================================================================
 
-tab_analysis, tab_intelligence, tab_tools, tab_education, tab_team_analysis = st.tabs([
+tab_analysis, tab_intelligence, tab_tools, tab_education, tab_team_analysis, tab_debug = st.tabs([
     "🧠 STRATEGIC ANALYSIS HUB", 
     "📰 TACTICAL INTELLIGENCE CENTER", 
     "📊 PROFESSIONAL TOOLS & VISUALIZATION", 
     "📚 EDUCATION & DEVELOPMENT",
-    "🆚 TEAM ANALYSIS"  # NEW TAB ADDED
+    "🆚 TEAM ANALYSIS",  # NEW TAB ADDED
+    "🛠️ DEBUG"
 ])
 
 # =============================================================================
 # TAB 1: STRATEGIC ANALYSIS HUB - GRIT v4.0 ENHANCED
 # =============================================================================
 
-with tab_analysis:
+@fragment
+def render_analysis_tab():
+    """
+    TAB 1: Strategic Analysis Hub - fragment: its widgets rerun only this tab
+    INPUTS: get_fragment_inputs() (sidebar selections via session_state)
+    """
+    inputs = get_fragment_inputs()
+    
     st.markdown("## 🧠 Strategic Analysis Hub")
     st.markdown("*Professional NFL coordinator-level strategic insights with advanced analysis*")
     
@@ -1541,67 +693,55 @@ with tab_analysis:
     
     with col_main:
         # Analysis execution - BUG FIX: Enhanced error handling from GRIT v4.0 (Line 400-500)
-        if analyze_button or strategic_question:
+        # A typed question submits once (not on every rerun); the button always resubmits
+        new_question = bool(strategic_question) and strategic_question != st.session_state.get('submitted_question')
+        if analyze_button or new_question:
+            teams = inputs['teams']
+            preferences = inputs['analysis_preferences']
             if not strategic_question:
-                teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
-                analysis_type = get_session_state_safely('analysis_preferences', {}).get('analysis_type', 'Edge Detection')
+                analysis_type = preferences.get('analysis_type', 'Edge Detection')
                 strategic_question = f"Provide {analysis_type.lower()} analysis for {teams['team1']} vs {teams['team2']} in current game situation"
             
-            # Setup OpenAI client
-            openai_client = setup_openai_client()
+            # BUG FIX: Comprehensive data validation before analysis
+            if not teams.get('team1') or not teams.get('team2'):
+                st.error("Please select both teams in the sidebar before generating analysis.")
+                st.stop()
             
-            if not openai_client:
+            if not setup_openai_client():
                 st.error("❌ OpenAI API key required for analysis. Please configure your API key.")
                 st.stop()
             
-            with st.spinner("🔍 Analyzing strategic situation..."):
-                try:
-                    # BUG FIX: Comprehensive data validation before analysis
-                    teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
-                    
-                    # Validate team selection
-                    if not teams.get('team1') or not teams.get('team2'):
-                        st.error("Please select both teams in the sidebar before generating analysis.")
-                        st.stop()
-                    
-                    # Generate matchup analysis using AI
-                    analysis = generate_matchup_analysis(teams['team1'], teams['team2'], openai_client)
-                    
-                    # Validate analysis response
-                    if not analysis or analysis.startswith("Error:"):
-                        st.error("Analysis generation failed. Please try:")
-                        st.info("• Selecting different teams")
-                        st.info("• Simplifying your question")
-                        st.info("• Refreshing the page")
-                        if analysis:
-                            st.error(f"Details: {analysis}")
-                    else:
-                        # Display successful analysis
-                        st.markdown(analysis)
-                        
-                        # Store analysis in session state
-                        if hasattr(st.session_state, 'last_analysis'):
-                            st.session_state.last_analysis = {
-                                'question': strategic_question,
-                                'analysis': analysis,
-                                'timestamp': datetime.now(),
-                                'teams': f"{teams['team1']} vs {teams['team2']}"
-                            }
-                        
-                        st.success("✅ Strategic Analysis Complete!")
-                
-                except Exception as e:
-                    st.error("Analysis generation encountered an error:")
-                    st.error(str(e))
-                    st.info("This may be due to:")
-                    st.info("• API service unavailability") 
-                    st.info("• Network connectivity issues")
-                    
-                    # Show debug information
-                    with st.expander("Debug Information"):
-                        st.write(f"Team 1: {teams['team1']}")
-                        st.write(f"Team 2: {teams['team2']}")
-                        st.write(f"Error: {str(e)}")
+            try:
+                # Runs on the job queue; the Background Jobs panel polls it and delivers the result here
+                st.session_state.submitted_question = strategic_question
+                track_job(submit_job('strategic_analysis', {
+                    'team1_name': get_team_full_name(teams['team1']),
+                    'team2_name': get_team_full_name(teams['team2']),
+                    'question': strategic_question,
+                    'analysis_type': preferences.get('analysis_type', 'Edge Detection'),
+                    'game_situation': inputs['game_situation'],
+                    'coaching_perspective': preferences.get('coaching_perspective', 'Head Coach'),
+                    'complexity_level': preferences.get('complexity_level', 'Advanced'),
+                    'teams': f"{teams['team1']} vs {teams['team2']}"
+                }, st.session_state.session_id))
+                st.rerun()
+            
+            except Exception as e:
+                st.error("Analysis generation encountered an error:")
+                st.error(str(e))
+                st.info("This may be due to:")
+                st.info("• API service unavailability") 
+                st.info("• Network connectivity issues")
+        
+        if any(job['kind'] == 'strategic_analysis' and job['status'] in ('queued', 'running')
+               for job in get_session_jobs()):
+            st.info("🔍 Analyzing strategic situation in the background - progress is under Background Jobs in the Professional Tools tab")
+        
+        last_analysis = get_artifact('last_analysis')
+        if last_analysis:
+            st.markdown(f"**{last_analysis['teams']}** - *{last_analysis['question']}*")
+            st.markdown(last_analysis['analysis'])
+            st.success("✅ Strategic Analysis Complete!")
         
         # Strategic Chat Interface - BUG FIX: Removed help parameter (GRIT v4.0 Line 929)
         st.markdown("### Strategic Consultation Chat")
@@ -1622,7 +762,7 @@ with tab_analysis:
                     try:
                         openai_client = setup_openai_client()
                         if openai_client:
-                            teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
+                            teams = inputs['teams']
                             
                             response = generate_matchup_analysis(teams['team1'], teams['team2'], openai_client)
                             st.markdown(response)
@@ -1640,21 +780,163 @@ with tab_analysis:
             "Real-time overview of key factors affecting strategic decisions including game situation context and team performance indicators."), unsafe_allow_html=True)
         
         # Game situation context - BUG FIX: Safe access from GRIT v4.0 (Line 527)
-        situation = get_session_state_safely('game_situation', {
-            'down': 1, 'distance': 10, 'field_position': 50,
-            'score_differential': 0, 'time_remaining': '15:00'
-        })
+        situation = inputs['game_situation']
         st.markdown("#### Current Situation")
         st.write(f"**{situation['down']}** and **{situation['distance']}**")
         st.write(f"**Field Position:** {situation['field_position']} yard line")
         st.write(f"**Score:** {'+' if situation['score_differential'] >= 0 else ''}{situation['score_differential']}")
         st.write(f"**Time:** {situation['time_remaining']}")
 
+with tab_analysis:
+    render_analysis_tab()
+
 # =============================================================================
 # TAB 2: TACTICAL INTELLIGENCE CENTER - GRIT v4.0 ENHANCED
 # =============================================================================
 
-with tab_intelligence:
+@fragment
+def render_intelligence_feed():
+    """
+    TAB 2 left column - matchup alerts and league-wide best matchups (fragment)
+    INPUTS: get_fragment_inputs() (selected teams)
+    """
+    inputs = get_fragment_inputs()
+    
+    st.markdown("### Breaking Strategic Intelligence")
+    
+    # Generate strategic intelligence based on current data
+    teams = inputs['teams']
+    
+    if teams['team1'] and teams['team2']:
+        team1_name = get_team_full_name(teams['team1'])
+        team2_name = get_team_full_name(teams['team2'])
+        st.info(f"📊 MATCHUP FOCUS: {team1_name} vs {team2_name}")
+        
+        edge = matchup_matrix.get_edge(team1_name, team2_name)
+        if edge:
+            # Largest component edge either way is the strategic priority
+            component = max((name for name in edge if name != 'total'), key=lambda name: abs(edge[name]))
+            favored = team1_name if edge[component] > 0 else team2_name
+            st.info(f"🎯 STRATEGIC PRIORITY: {favored} holds the {EDGE_LABELS[component].lower()} edge "
+                    f"({abs(edge[component]):.2f} SD)")
+            st.info(f"⚡ TACTICAL ALERT: Overall edge {edge['total']:+.2f} SD for {team1_name} "
+                    f"(formation {edge['formation']:+.2f}, red zone {edge['red_zone']:+.2f}, "
+                    f"third down {edge['third_down']:+.2f})")
+        else:
+            st.info(f"🎯 STRATEGIC PRIORITY: Exploit formation mismatches and personnel advantages")
+            st.info(f"⚡ TACTICAL ALERT: Focus on situational play calling and red zone efficiency")
+    else:
+        st.info("✅ No critical tactical alerts. Select teams in sidebar for matchup analysis.")
+    
+    # No schedule data in the app, so every ordered pairing is ranked (best_matchups(slate=...) narrows to a week)
+    st.markdown("#### Best Matchups League-Wide")
+    edge_component = st.selectbox(
+        "Rank by", list(EDGE_LABELS.keys()), index=list(EDGE_LABELS.keys()).index('total'),
+        format_func=lambda name: EDGE_LABELS[name],
+        help="📈 League-wide edges in standard deviations (offense vs opponent)"
+    )
+    best = matchup_matrix.best_matchups(top_n=10, component=edge_component)
+    if best:
+        st.dataframe(pd.DataFrame([
+            {'Offense': row['offense'], 'Opponent': row['opponent'], 'Edge (SD)': round(row['edge'], 2)}
+            for row in best
+        ]), hide_index=True, use_container_width=True)
+    else:
+        st.caption("League matchup data unavailable")
+
+@fragment
+def render_risk_reward_calculator():
+    """
+    TAB 2 right column - Risk-Reward Calculator (fragment)
+    Changing the decision, risk slider or button reruns only the calculator
+    INPUTS: get_fragment_inputs() (selected teams, game situation)
+    """
+    inputs = get_fragment_inputs()
+    teams = inputs['teams']
+    
+    st.markdown("### Risk-Reward Calculator")
+    
+    # ENHANCEMENT: Add Risk-Reward Calculator help from GRIT v4.0
+    st.markdown(render_terminology_tooltip("Risk-Reward Calculator", 
+        "Quantitative analysis tool that evaluates the probability of success and potential outcomes for critical strategic decisions."), unsafe_allow_html=True)
+    
+    decision_type = st.selectbox(
+        "Strategic Decision",
+        ["Fourth Down Attempt", "Two-Point Conversion", "Aggressive Pass vs Run", 
+         "Timeout Usage", "Field Goal vs Punt"],
+        help="⚖️ Select the strategic decision you want to analyze"
+    )
+    
+    risk_tolerance = st.slider("Risk Tolerance", 1, 10, 5, 
+                             help="🎯 Set your coaching risk tolerance: 1-3 (Conservative), 4-6 (Balanced), 7-10 (Aggressive)")
+    
+    if st.button("🎯 Calculate Risk-Reward",
+                help="📊 Generate quantitative analysis of your selected decision"):
+        game_sit = inputs['game_situation']
+        
+        # Deterministic scoring from your team's situational tendencies
+        team_name = get_team_full_name(teams['team1']) if teams['team1'] else None
+        situational = league_snapshot.get_team_data(team_name).get('situational_tendencies', {}) if team_name else {}
+        baselines = {key: league_snapshot.get_league_average(key) for key in LEAGUE_BASELINES}
+        
+        if decision_type in ("Fourth Down Attempt", "Field Goal vs Punt"):
+            decision = evaluate_fourth_down(game_sit['distance'], game_sit['field_position'],
+                                            situational, risk_tolerance, baselines)
+            if decision:
+                st.metric("Success Probability", f"{decision['conversion_probability']:.0%}")
+                
+                ep_cols = st.columns(3)
+                for ep_col, option in zip(ep_cols, FOURTH_DOWN_OPTIONS):
+                    value = decision['values'][option]
+                    ep_col.metric(f"{OPTION_LABELS[option]} EP", f"{value:+.2f}" if np.isfinite(value) else "N/A")
+                
+                recommendation = OPTION_LABELS[decision['recommendation']]
+                if decision['recommendation'] == 'go':
+                    st.success(f"✅ {recommendation} - go margin {decision['go_margin']:+.2f} EP over the best kick")
+                elif decision['go_margin'] > -0.5:
+                    st.warning(f"⚠️ {recommendation} - close call (go margin {decision['go_margin']:+.2f} EP)")
+                else:
+                    st.error(f"❌ {recommendation} - going for it costs {abs(decision['go_margin']):.2f} EP")
+            else:
+                st.error("❌ Decision engine unavailable - check debug log")
+            
+            grid_spec = get_cached_figure_spec(
+                f'decision_grid_r{risk_tolerance}', teams['team1'], '', inputs['data_version'],
+                lambda: create_decision_grid_heatmap(
+                    build_fourth_down_grid(situational, risk_tolerance, baselines),
+                    team_name or 'League Average', [OPTION_LABELS[option] for option in FOURTH_DOWN_OPTIONS]
+                )
+            )
+            if grid_spec:
+                st.plotly_chart(grid_spec, use_container_width=True)
+        
+        elif decision_type == "Two-Point Conversion":
+            decision = evaluate_two_point(situational, risk_tolerance, baselines)
+            if decision:
+                st.metric("Success Probability", f"{decision['two_point_probability']:.0%}")
+                st.write(f"**Two-Point EP:** {decision['values']['two_point']:.2f} | "
+                         f"**Extra Point EP:** {decision['values']['extra_point']:.2f}")
+                if decision['recommendation'] == 'two_point':
+                    st.success(f"✅ Go for two - {decision['margin']:+.2f} points over the kick")
+                else:
+                    st.warning(f"⚠️ Kick the extra point - two-point margin {decision['margin']:+.2f}")
+        
+        elif decision_type == "Timeout Usage":
+            decision = evaluate_timeout(game_sit['time_remaining'], game_sit['score_differential'], risk_tolerance)
+            if decision:
+                st.metric("Timeout Value", f"{decision['timeout_value']}/100")
+                if decision['recommendation'] == 'use':
+                    st.success("✅ Use the timeout - stopping the clock is worth it here")
+                else:
+                    st.info(f"💾 Save the timeout - value below your threshold of {decision['threshold']}")
+        
+        else:
+            st.info("📋 Pass vs run tendencies are covered by the Play Calling focus in Strategic Analysis")
+
+def render_intelligence_tab():
+    """
+    TAB 2: Tactical Intelligence Center - layout only; each column is its own fragment
+    """
     st.markdown("## 📰 Tactical Intelligence Center")
     st.markdown("*Breaking intelligence with strategic impact analysis*")
     
@@ -1686,61 +968,26 @@ with tab_intelligence:
     col_news, col_analysis = st.columns([1, 1])
     
     with col_news:
-        st.markdown("### Breaking Strategic Intelligence")
-        
-        # Generate strategic intelligence based on current data
-        teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
-        
-        if teams['team1'] and teams['team2']:
-            st.info(f"📊 MATCHUP FOCUS: {get_team_full_name(teams['team1'])} vs {get_team_full_name(teams['team2'])}")
-            st.info(f"🎯 STRATEGIC PRIORITY: Exploit formation mismatches and personnel advantages")
-            st.info(f"⚡ TACTICAL ALERT: Focus on situational play calling and red zone efficiency")
-        else:
-            st.info("✅ No critical tactical alerts. Select teams in sidebar for matchup analysis.")
+        render_intelligence_feed()
     
     with col_analysis:
-        st.markdown("### Risk-Reward Calculator")
-        
-        # ENHANCEMENT: Add Risk-Reward Calculator help from GRIT v4.0
-        st.markdown(render_terminology_tooltip("Risk-Reward Calculator", 
-            "Quantitative analysis tool that evaluates the probability of success and potential outcomes for critical strategic decisions."), unsafe_allow_html=True)
-        
-        decision_type = st.selectbox(
-            "Strategic Decision",
-            ["Fourth Down Attempt", "Two-Point Conversion", "Aggressive Pass vs Run", 
-             "Timeout Usage", "Field Goal vs Punt"],
-            help="⚖️ Select the strategic decision you want to analyze"
-        )
-        
-        risk_tolerance = st.slider("Risk Tolerance", 1, 10, 5, 
-                                 help="🎯 Set your coaching risk tolerance: 1-3 (Conservative), 4-6 (Balanced), 7-10 (Aggressive)")
-        
-        if st.button("🎯 Calculate Risk-Reward",
-                    help="📊 Generate quantitative analysis of your selected decision"):
-            game_sit = get_session_state_safely('game_situation', {
-                'down': 1, 'distance': 10, 'field_position': 50,
-                'score_differential': 0, 'time_remaining': '15:00'
-            })
-            
-            # Simple risk calculation based on game situation
-            if decision_type == "Fourth Down Attempt":
-                base_success = 60 if game_sit['distance'] <= 3 else 40
-                success_prob = min(95, base_success + (risk_tolerance * 3))
-                
-                st.metric("Success Probability", f"{success_prob}%")
-                
-                if success_prob > 70:
-                    st.success("✅ Favorable odds for fourth down attempt")
-                elif success_prob > 50:
-                    st.warning("⚠️ Moderate risk - consider situation carefully")
-                else:
-                    st.error("❌ High risk - consider alternative options")
+        render_risk_reward_calculator()
+
+with tab_intelligence:
+    render_intelligence_tab()
 
 # =============================================================================
 # TAB 3: PROFESSIONAL TOOLS & VISUALIZATION - GRIT v4.0 ENHANCED WITH FIXED VISUALIZATIONS
 # =============================================================================
 
-with tab_tools:
+@fragment
+def render_tools_tab():
+    """
+    TAB 3: Professional Tools & Visualization - fragment: its widgets rerun only this tab
+    INPUTS: get_fragment_inputs() (sidebar selections via session_state)
+    """
+    inputs = get_fragment_inputs()
+    
     st.markdown("## 📊 Professional Tools & Visualization")
     st.markdown("*Advanced analytics and professional reporting tools*")
     
@@ -1781,7 +1028,7 @@ with tab_tools:
         "Select Professional Tool",
         ["Team Comparison Analysis", "Formation Efficiency Chart", "Situational Heatmap", 
          "Team Strengths Radar", "Weather Impact Gauge", "Comprehensive Dashboard",
-         "Professional Report Generator", "Summary Data Table"],
+         "Professional Report Generator", "Summary Data Table", "Strategy Simulator"],
         help="🛠️ Choose the professional analysis tool for strategic insights"
     )
     
@@ -1792,7 +1039,7 @@ with tab_tools:
         st.warning("⚠️ Professional tools require OpenAI API configuration for AI-powered analysis.")
         st.info("Configure your API key to access advanced strategic analysis features.")
     else:
-        teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
+        teams = inputs['teams']
         
         if not teams['team1'] or not teams['team2']:
             st.warning("Please select both teams in the sidebar to use professional tools.")
@@ -1825,7 +1072,11 @@ with tab_tools:
                 
                 if st.button("📊 Generate Formation Chart", type="primary"):
                     with st.spinner("Creating formation efficiency chart..."):
-                        chart = create_formation_efficiency_chart(teams['team1'], teams['team2'])
+                        team1_data, team2_data, team1_name, team2_name = get_matchup_chart_data(teams['team1'], teams['team2'])
+                        chart = get_cached_figure_spec(
+                            'formation_efficiency', teams['team1'], teams['team2'], inputs['data_version'],
+                            lambda: create_formation_efficiency_chart(team1_data, team2_data, team1_name, team2_name)
+                        )
                         if chart:
                             st.plotly_chart(chart, use_container_width=True)
                             st.success("✅ Formation efficiency chart generated!")
@@ -1835,7 +1086,11 @@ with tab_tools:
                 
                 if st.button("🔥 Generate Heatmap", type="primary"):
                     with st.spinner("Creating situational performance heatmap..."):
-                        heatmap = create_situational_heatmap(teams['team1'], teams['team2'])
+                        team1_data, team2_data, team1_name, team2_name = get_matchup_chart_data(teams['team1'], teams['team2'])
+                        heatmap = get_cached_figure_spec(
+                            'situational_heatmap', teams['team1'], teams['team2'], inputs['data_version'],
+                            lambda: create_situational_heatmap(team1_data, team2_data, team1_name, team2_name)
+                        )
                         if heatmap:
                             st.plotly_chart(heatmap, use_container_width=True)
                             st.success("✅ Situational heatmap generated!")
@@ -1845,7 +1100,16 @@ with tab_tools:
                 
                 if st.button("🎯 Generate Radar Chart", type="primary"):
                     with st.spinner("Creating team strengths radar chart..."):
-                        radar = create_personnel_advantages_radar(teams['team1'], teams['team2'])
+                        team1_name = get_team_full_name(teams['team1'])
+                        team2_name = get_team_full_name(teams['team2'])
+                        radar = get_cached_figure_spec(
+                            'percentile_radar', teams['team1'], teams['team2'], inputs['data_version'],
+                            lambda: create_league_percentile_radar(
+                                league_snapshot.get_team_percentiles(team1_name),
+                                league_snapshot.get_team_percentiles(team2_name),
+                                team1_name, team2_name, METRIC_LABELS
+                            )
+                        )
                         if radar:
                             st.plotly_chart(radar, use_container_width=True)
                             st.success("✅ Team strengths radar generated!")
@@ -1853,15 +1117,24 @@ with tab_tools:
             elif tool_type == "Weather Impact Gauge":
                 st.markdown("### Weather Impact Analysis")
                 
+                wind_speed = st.slider("Wind Speed (mph)", 0, 30, 5)
+                temperature = st.slider("Temperature (°F)", 0, 100, 70)
+                precipitation = st.slider("Precipitation Chance", 0.0, 1.0, 0.0)
                 weather_conditions = {
-                    'wind_speed': st.slider("Wind Speed (mph)", 0, 30, 5),
-                    'temperature': st.slider("Temperature (°F)", 0, 100, 70),
-                    'precipitation': st.slider("Precipitation Chance", 0.0, 1.0, 0.0)
+                    'wind_speed': wind_speed,
+                    'temp': temperature,
+                    'condition': 'Rain' if precipitation > 0.1 else 'Clear'
                 }
                 
                 if st.button("🌦️ Generate Weather Gauge", type="primary"):
+                    # The Comprehensive Dashboard reuses the last conditions analysed here
+                    set_artifact('current_weather_data', weather_conditions)
                     with st.spinner("Analyzing weather impact..."):
-                        gauge = create_weather_impact_gauge(weather_conditions)
+                        gauge = get_cached_figure_spec(
+                            'weather_gauge', teams['team1'], teams['team2'], inputs['data_version'],
+                            lambda: create_weather_impact_gauge(weather_conditions),
+                            weather_data=weather_conditions
+                        )
                         if gauge:
                             st.plotly_chart(gauge, use_container_width=True)
                             st.success("✅ Weather impact gauge generated!")
@@ -1871,7 +1144,13 @@ with tab_tools:
                 
                 if st.button("📈 Generate Dashboard", type="primary"):
                     with st.spinner("Creating comprehensive dashboard..."):
-                        dashboard = create_comprehensive_dashboard(teams['team1'], teams['team2'])
+                        team1_data, team2_data, team1_name, team2_name = get_matchup_chart_data(teams['team1'], teams['team2'])
+                        weather_data = get_artifact('current_weather_data', {})
+                        dashboard = get_cached_figure_spec(
+                            'comprehensive_dashboard', teams['team1'], teams['team2'], inputs['data_version'],
+                            lambda: create_comprehensive_dashboard(team1_data, team2_data, team1_name, team2_name, weather_data),
+                            weather_data=weather_data
+                        )
                         if dashboard:
                             st.plotly_chart(dashboard, use_container_width=True)
                             st.success("✅ Comprehensive dashboard generated!")
@@ -1881,11 +1160,42 @@ with tab_tools:
                 
                 if st.button("📋 Generate Summary Table", type="primary"):
                     with st.spinner("Creating summary data table..."):
-                        summary_table = create_chart_summary_table(teams['team1'], teams['team2'])
+                        team1_data, team2_data, team1_name, team2_name = get_matchup_chart_data(teams['team1'], teams['team2'])
+                        league_averages = {key: league_snapshot.get_league_average(key) for key in METRIC_LABELS}
+                        summary_table = create_chart_summary_table(team1_data, team2_data, team1_name, team2_name,
+                                                                   league_averages=league_averages)
                         if not summary_table.empty:
                             st.dataframe(summary_table, use_container_width=True)
                             st.success("✅ Summary data table generated!")
             
+            elif tool_type == "Strategy Simulator":
+                st.markdown("### Monte Carlo Strategy Simulator")
+                st.caption("100,000 simulated drives per strategy archetype, sampled from formation usage, YPP and success rate")
+                
+                sim_seed = st.number_input("Random Seed", min_value=0, value=2024, step=1,
+                                           help="🎲 Same seed, same results")
+                
+                if st.button("🎲 Run Simulation", type="primary"):
+                    with st.spinner("Simulating drives..."):
+                        simulation = run_strategy_simulation(teams['team1'], teams['team2'], inputs['data_version'], int(sim_seed))
+                        if simulation['results']:
+                            st.dataframe(pd.DataFrame([
+                                {
+                                    'Strategy': result['name'],
+                                    'Win Probability': f"{result['win_probability']:.1%}",
+                                    'Avg Points': round(result['points']['mean'], 1),
+                                    'P10-P90 Points': f"{result['points']['percentiles']['p10']:.0f}-{result['points']['percentiles']['p90']:.0f}",
+                                    'Points/Drive': round(result['points_per_drive'], 2),
+                                    'TD Rate': f"{result['drive_outcomes']['touchdown']:.1%}",
+                                    'Turnover Rate': f"{result['drive_outcomes']['turnover']:.1%}"
+                                }
+                                for result in simulation['results']
+                            ]), hide_index=True, use_container_width=True)
+                            st.caption(f"{simulation['games']:,} games per strategy vs {get_team_full_name(teams['team2'])} "
+                                       f"(avg {simulation['opponent']['mean']:.1f} points) in {simulation['elapsed_seconds']:.1f}s")
+                        else:
+                            st.error(f"Simulation failed: {simulation.get('error', 'unknown error')}")
+            
             elif tool_type == "Professional Report Generator":
                 st.markdown("### Professional Report Generator")
                 
@@ -1928,31 +1238,29 @@ with tab_tools:
                     if not selected_sections:
                         st.error("Please select at least one report section.")
                     else:
-                        with st.spinner("Generating professional report..."):
-                            try:
-                                # Compile the report
-                                professional_report = compile_professional_report(
-                                    selected_sections, teams['team1'], teams['team2'], openai_client
-                                )
-                                
-                                # Store in session state
-                                st.session_state.generated_report = professional_report
-                                
-                                st.success("✅ Professional report generated successfully!")
-                                
-                            except Exception as e:
-                                st.error(f"Report generation failed: {str(e)}")
+                        try:
+                            # Runs on the job queue; the Background Jobs panel below polls it
+                            track_job(submit_job('professional_report', {
+                                'sections': selected_sections,
+                                'your_team': teams['team1'],
+                                'opponent_team': teams['team2']
+                            }, st.session_state.session_id))
+                            st.rerun()
+                            
+                        except Exception as e:
+                            st.error(f"Report generation failed: {str(e)}")
                 
                 # Display Generated Report
-                if get_session_state_safely('generated_report', None):
+                generated_report = get_artifact('generated_report')
+                if generated_report:
                     st.markdown("### Generated Professional Report")
                     
                     # Export options
-                    col1, col2 = st.columns(2)
+                    col1, col2, col3 = st.columns(3)
                     with col1:
                         st.download_button(
                             label="📄 Download as Text",
-                            data=st.session_state.generated_report,
+                            data=generated_report,
                             file_name=f"{teams['team1']}_vs_{teams['team2']}_analysis_report.txt",
                             mime="text/plain",
                             help="💾 Download as plain text file"
@@ -1962,21 +1270,100 @@ with tab_tools:
                         # Convert to markdown format
                         st.download_button(
                             label="📋 Download as Markdown", 
-                            data=st.session_state.generated_report,
+                            data=generated_report,
                             file_name=f"{teams['team1']}_vs_{teams['team2']}_analysis_report.md",
                             mime="text/markdown",
                             help="🌐 Download as Markdown file"
                         )
                     
+                    with col3:
+                        pdf_params = build_report_pdf_params(generated_report, teams['team1'], teams['team2'])
+                        st.download_button(
+                            label="🧾 Download as PDF",
+                            data=render_report_pdf(pdf_params['title'], pdf_params['tldr'], tuple(pdf_params['bullets'])),
+                            file_name=pdf_params['filename'],
+                            mime="application/pdf",
+                            help="📑 Paginated PDF edge sheet"
+                        )
+                    
                     # Display the report
                     st.markdown("#### Report Preview")
-                    st.markdown(st.session_state.generated_report)
+                    st.markdown(generated_report)
+
+# =============================================================================
+# BACKGROUND JOBS PANEL
+# =============================================================================
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def render_report_pdf(title: str, tldr: str, bullets: Tuple[str, ...]) -> bytes:
+    """PDF bytes for the download button, built in memory once per report"""
+    from pdf_export import edge_sheet_pdf_bytes
+    return edge_sheet_pdf_bytes(title, tldr, list(bullets))
+
+def render_background_jobs():
+    """Status of this session's background jobs; finished reports and analyses go into the artifact store"""
+    jobs = get_session_jobs()
+    if not jobs:
+        return
+
+    st.markdown("### Background Jobs")
+    delivered = False
+    for job in reversed(jobs):
+        label = JOB_LABELS.get(job['kind'], job['kind'])
+        if job['status'] in ('queued', 'running'):
+            st.progress(job['progress'] or 0.0, text=f"{label}: {job['message']}")
+        elif job['status'] == 'done':
+            if job['kind'] == 'professional_report' and job['id'] not in st.session_state.delivered_jobs:
+                set_artifact('generated_report', job['result']['report'])
+                st.session_state.delivered_jobs.append(job['id'])
+                delivered = True
+            if job['kind'] == 'strategic_analysis' and job['id'] not in st.session_state.delivered_jobs:
+                set_artifact('last_analysis', {
+                    'question': job['params']['question'],
+                    'analysis': job['result']['analysis'],
+                    'timestamp': job['finished_at'],
+                    'teams': job['params']['teams']
+                })
+                st.session_state.delivered_jobs.append(job['id'])
+                delivered = True
+            if job['kind'] == 'strategic_analysis':
+                with st.expander(f"{label} ({job['finished_at']})"):
+                    st.markdown(job['result']['analysis'])
+            else:
+                st.caption(f"✅ {label} finished {job['finished_at']}")
+        else:
+            st.error(f"{label} {job['status']}: {job['error'] or job['message']}")
+
+    # A finished report shows up in the tools tab and an analysis in the analysis tab;
+    # a full rerun also stops the polling fragment
+    if delivered or (st.session_state.get('jobs_polling') and not any(
+            job['status'] in ('queued', 'running') for job in jobs)):
+        st.session_state.jobs_polling = False
+        st.rerun()
+
+@fragment(run_every=JOB_POLL_SECONDS)
+def render_background_jobs_live():
+    """Polling version of the panel, used only while a job is queued or running"""
+    st.session_state.jobs_polling = True
+    render_background_jobs()
+
+with tab_tools:
+    render_tools_tab()
+    if any(job['status'] in ('queued', 'running') for job in get_session_jobs()):
+        render_background_jobs_live()
+    else:
+        render_background_jobs()
 
 # =============================================================================
 # TAB 4: EDUCATION & DEVELOPMENT - GRIT v4.0 ENHANCED
 # =============================================================================
 
-with tab_education:
+@fragment
+def render_education_tab():
+    """
+    TAB 4: Education & Development - fragment: its widgets rerun only this tab
+    INPUTS: None (static content, independent of the sidebar selections)
+    """
     st.markdown("## 📚 Education & Development")
     st.markdown("*Master NFL strategic analysis and tactical concepts*")
     
@@ -2097,11 +1484,21 @@ with tab_education:
         </div>
         """)
 
+with tab_education:
+    render_education_tab()
+
 # =============================================================================
 # TAB 5: TEAM ANALYSIS - FIXED TO MATCH DIAGRAM EXACTLY
 # =============================================================================
 
-with tab_team_analysis:
+@fragment
+def render_team_analysis_tab():
+    """
+    TAB 5: Team Analysis - fragment: its widgets rerun only this tab
+    INPUTS: get_fragment_inputs() (sidebar selections via session_state)
+    """
+    inputs = get_fragment_inputs()
+    
     st.markdown("## 🆚 Team Analysis")
     st.markdown("*Comprehensive team comparison with professional reporting*")
     
@@ -2137,7 +1534,7 @@ with tab_team_analysis:
     """)
     
     # Team Selection Display
-    teams = get_session_state_safely('selected_teams', {'team1': None, 'team2': None})
+    teams = inputs['teams']
     
     if not teams['team1'] or not teams['team2']:
         st.warning("Please select both teams in the sidebar to begin team analysis.")
@@ -2376,19 +1773,14 @@ with tab_team_analysis:
                     if user_question and st.button("Get AI Answer"):
                         with st.spinner("Getting AI response..."):
                             try:
-                                follow_up_prompt = f"""
-                                Based on the {get_team_full_name(teams['team1'])} vs {get_team_full_name(teams['team2'])} matchup analysis, 
-                                please answer this specific question: {user_question}
-                                
-                                Keep your response tactical and specific to these teams.
-                                """
-                                
-                                response = openai_client.chat.completions.create(
+                                response = chat_completion(
+                                    openai_client, feature="follow_up",
                                     model="gpt-3.5-turbo",
-                                    messages=[
-                                        {"role": "system", "content": "You are an expert NFL analyst providing specific tactical advice."},
-                                        {"role": "user", "content": follow_up_prompt}
-                                    ],
+                                    messages=build_messages(
+                                        "follow_up", question=user_question,
+                                        team1_name=get_team_full_name(teams['team1']),
+                                        team2_name=get_team_full_name(teams['team2'])
+                                    ),
                                     max_tokens=300,
                                     temperature=0.7
                                 )
@@ -2406,6 +1798,78 @@ with tab_team_analysis:
                     st.info("• Selecting different teams")
                     st.info("• Checking your OpenAI API key configuration")
 
+with tab_team_analysis:
+    render_team_analysis_tab()
+
+# =============================================================================
+# TAB 6: DEBUG DASHBOARD - span latencies and counters for this process
+# =============================================================================
+
+@fragment
+def render_debug_tab():
+    """
+    TAB 6: Debug dashboard - p50/p95 per subsystem from the instrumentation registry
+    Fragment: Refresh reruns only this tab
+    """
+    st.markdown("## 🛠️ Debug Dashboard")
+    st.caption("Latencies recorded by instrumentation spans in this server process "
+               "(db = SQLite queries, api = OpenWeather/RSS, llm = OpenAI calls)")
+    
+    st.button("🔄 Refresh", key="debug_refresh")
+    
+    latency_rows = get_latency_summary()
+    if not latency_rows:
+        st.info("No spans recorded yet - run an analysis or load a team to populate the dashboard")
+    else:
+        subsystem_cols = st.columns(len(SUBSYSTEMS))
+        for col, subsystem in zip(subsystem_cols, SUBSYSTEMS):
+            overall = next((r for r in latency_rows if r['subsystem'] == subsystem and r['operation'] == 'all'), None)
+            with col:
+                if overall:
+                    st.metric(f"{subsystem.upper()} p95", f"{overall['p95_ms']:.1f} ms",
+                              f"p50 {overall['p50_ms']:.1f} ms · {overall['calls']} calls", delta_color="off")
+                else:
+                    st.metric(f"{subsystem.upper()} p95", "—", "no calls", delta_color="off")
+        
+        st.markdown("### ⏱️ Latency by Operation")
+        st.dataframe(latency_rows, use_container_width=True, hide_index=True)
+    
+    metrics = export_metrics()
+    if metrics['counters']:
+        st.markdown("### 🔢 Counters")
+        st.dataframe(
+            [{'name': c['name'], 'labels': ", ".join(f"{k}={v}" for k, v in c['labels'].items()), 'value': c['value']}
+             for c in metrics['counters']],
+            use_container_width=True, hide_index=True
+        )
+    
+    st.markdown("### 💸 LLM Usage - Last 7 Days")
+    st.caption("From the llm_calls ledger shared by the app, API server, background jobs and batch runs")
+    feature_summary = get_feature_summary(days=7)
+    if not feature_summary:
+        st.info("No LLM calls recorded in the last 7 days")
+    else:
+        st.dataframe(
+            [{**row, 'errors': ", ".join(f"{k}: {v}" for k, v in row['errors'].items())} for row in feature_summary],
+            use_container_width=True, hide_index=True
+        )
+        st.markdown("**Latency by model**")
+        st.dataframe(get_latency_by_model(days=7), use_container_width=True, hide_index=True)
+        with st.expander("Tokens per feature per day"):
+            st.dataframe(get_tokens_by_feature_per_day(days=7), use_container_width=True, hide_index=True)
+    
+    with st.expander("LLM scheduler"):
+        st.json(get_scheduler_stats())
+    
+    st.download_button(
+        "📥 Export Metrics (JSON)", data=json.dumps(metrics, indent=2, default=str),
+        file_name=f"grit_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json", key="debug_export"
+    )
+
+with tab_debug:
+    render_debug_tab()
+
 # =============================================================================
 # FOOTER - GRIT v4.0 STYLE WITH TEAM ANALYSIS
 # =============================================================================
@@ -2425,7 +1889,7 @@ with col_info3:
     st.metric("📊 Professional Tools", "Ready", "Advanced")
 
 with col_info4:
-    analysis_count = 1 if get_session_state_safely('last_analysis', None) else 0
+    analysis_count = 1 if get_artifact('last_analysis') else 0
     st.metric("🆚 Team Analysis", "Enhanced", "AI-Powered")
 
 # Enhanced footer with team analysis mention
@@ -0,0 +1,99 @@
+"""
+THEME MODULE - GRIT NFL STRATEGIC EDGE PLATFORM v4.0
+===================================================
+PURPOSE: Load the GRIT dark theme from app/static/grit_theme.css once per process
+FEATURES: CSS minification, content hash, cached injection payload
+ARCHITECTURE: Stylesheet read + minified once (st.cache_resource keyed by file mtime)
+
+HOW IT WORKS:
+- The stylesheet is a static asset (app/static/grit_theme.css), not a Python literal
+- Comments and whitespace are stripped once per process; the result is hashed
+- inject_theme() emits one <style data-grit-theme="<hash>"> element per rerun.
+  The element is byte-identical across reruns, so Streamlit's ForwardMsg cache
+  (global.minCachedMessageSize in .streamlit/config.toml) sends the browser a
+  reference to the cached message instead of the stylesheet after the first run
+- Editing the CSS changes the mtime and hash, so the new styles go out once
+
+WHY NOT <link>:
+- Streamlit static serving returns .css as text/plain with X-Content-Type-Options:
+  nosniff, which browsers refuse to apply as a stylesheet
+
+DEBUGGING SYSTEM:
+- Theme load logged with source/minified sizes and hash
+- First injection per session logged with the hash sent
+"""
+
+import hashlib
+import os
+import re
+import streamlit as st
+from typing import Dict
+
+from instrumentation import get_logger, log_event
+
+# =============================================================================
+# DEBUG LOGGING SYSTEM - Makes debugging easy
+# =============================================================================
+
+_logger = get_logger("theme")
+
+def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
+    """
+    Central debug logging system for easy error tracking
+    """
+    log_event(_logger, function_name, line_number, message, error)
+
+# =============================================================================
+# STYLESHEET LOADING
+# =============================================================================
+
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'grit_theme.css')
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace (selectors and values are untouched)"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,])\s*', r'\1', css)
+    css = re.sub(r'\s*:\s*(?=[^{}]*[;}])', ':', css)
+    return css.replace(';}', '}').strip()
+
+@st.cache_resource
+def load_theme(path: str, mtime: float) -> Dict:
+    """
+    Read, minify and hash the stylesheet (cached per path + modification time)
+
+    Returns:
+        Dict with 'css' (minified), 'hash', 'source_bytes', 'minified_bytes'
+    """
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    css = minify_css(source)
+    theme = {
+        'css': css,
+        'hash': hashlib.sha256(css.encode('utf-8')).hexdigest()[:12],
+        'source_bytes': len(source.encode('utf-8')),
+        'minified_bytes': len(css.encode('utf-8')),
+    }
+    log_debug("load_theme", 78, f"Theme loaded: {theme['source_bytes']} -> {theme['minified_bytes']} bytes "
+                                f"(hash {theme['hash']})")
+    return theme
+
+def get_theme(path: str = THEME_CSS_PATH) -> Dict:
+    return load_theme(path, os.path.getmtime(path))
+
+# =============================================================================
+# INJECTION
+# =============================================================================
+
+def inject_theme(path: str = THEME_CSS_PATH):
+    """Apply the GRIT theme for this rerun; a missing stylesheet leaves the app unstyled"""
+    try:
+        theme = get_theme(path)
+        st.markdown(f'<style data-grit-theme="{theme["hash"]}">{theme["css"]}</style>', unsafe_allow_html=True)
+
+        if st.session_state.get('theme_hash') != theme['hash']:
+            st.session_state['theme_hash'] = theme['hash']
+            log_debug("inject_theme", 100, f"Theme {theme['hash']} sent to session ({theme['minified_bytes']} bytes)")
+
+    except Exception as e:
+        log_debug("inject_theme", 103, f"Theme injection failed for {path}", e)
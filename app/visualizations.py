@@ -17,27 +17,29 @@ DEBUGGING SYSTEM:
 - Plotly parameter validation for troubleshooting
 """
 
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
 from typing import Dict, List, Optional
-import numpy as np
-from datetime import datetime
+
+from instrumentation import get_logger, log_event
+from lazy_imports import lazy_import
+
+# Plotly and pandas load when the first chart is built, not at app import
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+plotly_subplots = lazy_import("plotly.subplots")
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 # =============================================================================
 # DEBUG LOGGING SYSTEM - Makes debugging easy
 # =============================================================================
 
+_logger = get_logger("visualizations")
+
 def log_debug(function_name: str, line_number: int, message: str, error: Exception = None):
     """
     Central debug logging system for easy error tracking
     """
-    timestamp = datetime.now().strftime('%H:%M:%S')
-    if error:
-        print(f"[{timestamp}] ERROR in {function_name}() line {line_number}: {message} - {str(error)}")
-    else:
-        print(f"[{timestamp}] DEBUG {function_name}() line {line_number}: {message}")
+    log_event(_logger, function_name, line_number, message, error)
 
 # =============================================================================
 # CHART CONFIGURATION - Dark theme with professional styling
@@ -309,6 +311,40 @@ def create_personnel_advantages_radar(team1_data: Dict, team2_data: Dict, team1_
 # WEATHER IMPACT GAUGE
 # =============================================================================
 
+def calculate_weather_impact_score(weather_data: Dict) -> int:
+    """
+    Weather impact score (0-100) shared by the gauge and the dashboard
+    Thresholds match figure_cache.get_weather_bucket() so cached charts stay exact
+    """
+    if not weather_data or weather_data.get('is_dome'):
+        return 0
+    
+    temp = weather_data.get('temp', 70)
+    wind_speed = weather_data.get('wind_speed', 0)
+    condition = str(weather_data.get('condition', '')).lower()
+    
+    impact_score = 0
+    
+    # Temperature impact
+    if temp < 32 or temp > 95:
+        impact_score += 30
+    elif temp < 40 or temp > 85:
+        impact_score += 15
+    
+    # Wind impact
+    if wind_speed > 20:
+        impact_score += 40
+    elif wind_speed > 15:
+        impact_score += 25
+    elif wind_speed > 10:
+        impact_score += 10
+    
+    # Precipitation impact
+    if any(word in condition for word in ['rain', 'snow', 'storm']):
+        impact_score += 25
+    
+    return min(100, impact_score)
+
 def create_weather_impact_gauge(weather_data: Dict):
     """
     Create weather impact gauge chart
@@ -317,32 +353,7 @@ def create_weather_impact_gauge(weather_data: Dict):
     try:
         log_debug("create_weather_impact_gauge", 265, "Creating weather impact gauge")
         
-        # Calculate weather impact score
-        temp = weather_data.get('temp', 70)
-        wind_speed = weather_data.get('wind_speed', 0)
-        condition = weather_data.get('condition', '').lower()
-        
-        impact_score = 0
-        
-        # Temperature impact
-        if temp < 32 or temp > 95:
-            impact_score += 30
-        elif temp < 40 or temp > 85:
-            impact_score += 15
-        
-        # Wind impact
-        if wind_speed > 20:
-            impact_score += 40
-        elif wind_speed > 15:
-            impact_score += 25
-        elif wind_speed > 10:
-            impact_score += 10
-        
-        # Precipitation impact
-        if any(word in condition for word in ['rain', 'snow', 'storm']):
-            impact_score += 25
-        
-        impact_score = min(100, impact_score)
+        impact_score = calculate_weather_impact_score(weather_data)
         
         fig = go.Figure(go.Indicator(
             mode = "gauge+number+delta",
@@ -368,11 +379,11 @@ def create_weather_impact_gauge(weather_data: Dict):
         # BUG FIX: Single title assignment
         chart_theme = get_chart_theme()
         chart_theme['title']['text'] = 'Weather Impact Score'
+        chart_theme['font'] = {'color': '#ffffff', 'size': 14}
         
         fig.update_layout(
             **chart_theme,
-            height=400,
-            font={'color': '#ffffff', 'size': 14}
+            height=400
         )
         
         log_debug("create_weather_impact_gauge", 315, "Weather gauge created successfully")
@@ -395,7 +406,7 @@ def create_comprehensive_dashboard(team1_data: Dict, team2_data: Dict, team1_nam
         log_debug("create_comprehensive_dashboard", 331, f"Creating dashboard for {team1_name} vs {team2_name}")
         
         # Create subplots without titles (add them individually)
-        fig = make_subplots(
+        fig = plotly_subplots.make_subplots(
             rows=2, cols=2,
             subplot_titles=[
                 'Formation Efficiency (YPP)',
@@ -426,7 +437,7 @@ def create_comprehensive_dashboard(team1_data: Dict, team2_data: Dict, team1_nam
         
         # Add formation efficiency bars
         fig.add_trace(go.Bar(x=formations, y=team1_ypp, name=team1_name, marker_color='#00ff41'), row=1, col=1)
-        fig.add_trace(go.Bar(x=formations, y=team2_ypp, name=team2_name, marker_color='#ff6b35'), row=1, col=2)
+        fig.add_trace(go.Bar(x=formations, y=team2_ypp, name=team2_name, marker_color='#ff6b35'), row=1, col=1)
         
         # Third down data
         team1_3rd = team1_data.get('situational_tendencies', {}).get('third_down_conversion', 0) * 100
@@ -443,8 +454,7 @@ def create_comprehensive_dashboard(team1_data: Dict, team2_data: Dict, team1_nam
         fig.add_trace(go.Bar(x=[team2_name], y=[team2_rz], marker_color='#ff6b35', showlegend=False), row=2, col=1)
         
         # Weather impact gauge
-        wind_speed = weather_data.get('wind_speed', 0)
-        impact_score = min(100, wind_speed * 4)  # Simple calculation
+        impact_score = calculate_weather_impact_score(weather_data)
         
         fig.add_trace(go.Indicator(
             mode="gauge+number",
@@ -485,10 +495,14 @@ def create_comprehensive_dashboard(team1_data: Dict, team2_data: Dict, team1_nam
 # CHART SUMMARY TABLE
 # =============================================================================
 
-def create_chart_summary_table(team1_data: Dict, team2_data: Dict, team1_name: str, team2_name: str):
+def create_chart_summary_table(team1_data: Dict, team2_data: Dict, team1_name: str, team2_name: str,
+                               league_averages: Optional[Dict[str, float]] = None):
     """
     Create summary data table for charts
     BUG FIX: No title conflicts in table generation
+    
+    league_averages (optional) maps metric keys from league_data.METRIC_KEYS to
+    league means and adds 'League Avg' and 'Advantage' columns
     """
     try:
         log_debug("create_chart_summary_table", 419, f"Creating summary table for {team1_name} vs {team2_name}")
@@ -523,6 +537,34 @@ def create_chart_summary_table(team1_data: Dict, team2_data: Dict, team1_name: s
             ]
         }
         
+        if league_averages is not None:
+            metric_rows = [
+                ('11_personnel_ypp', team1_formations.get('11_personnel', {}).get('ypp', 0), team2_formations.get('11_personnel', {}).get('ypp', 0), False),
+                ('12_personnel_ypp', team1_formations.get('12_personnel', {}).get('ypp', 0), team2_formations.get('12_personnel', {}).get('ypp', 0), False),
+                ('third_down_conversion', team1_situational.get('third_down_conversion', 0), team2_situational.get('third_down_conversion', 0), True),
+                ('red_zone_efficiency', team1_situational.get('red_zone_efficiency', 0), team2_situational.get('red_zone_efficiency', 0), True),
+                ('goal_line_success', team1_situational.get('goal_line_success', 0), team2_situational.get('goal_line_success', 0), True)
+            ]
+            
+            league_column = []
+            advantage_column = []
+            for metric_key, team1_value, team2_value, is_rate in metric_rows:
+                league_value = league_averages.get(metric_key)
+                if league_value is None:
+                    league_column.append("N/A")
+                else:
+                    league_column.append(f"{league_value*100:.1f}%" if is_rate else f"{league_value:.1f}")
+                
+                if not team1_value and not team2_value:
+                    advantage_column.append("N/A")
+                elif team1_value == team2_value:
+                    advantage_column.append("Even")
+                else:
+                    advantage_column.append(team1_name if team1_value > team2_value else team2_name)
+            
+            summary_data['League Avg'] = league_column
+            summary_data['Advantage'] = advantage_column
+        
         df = pd.DataFrame(summary_data)
         
         log_debug("create_chart_summary_table", 449, "Summary table created successfully")
@@ -532,6 +574,118 @@ def create_chart_summary_table(team1_data: Dict, team2_data: Dict, team1_name: s
         log_debug("create_chart_summary_table", 453, "Summary table creation failed", e)
         return pd.DataFrame({'Error': ['Table generation failed']})
 
+# =============================================================================
+# LEAGUE PERCENTILE RADAR
+# =============================================================================
+
+def create_league_percentile_radar(team1_percentiles: Dict[str, float], team2_percentiles: Dict[str, float],
+                                   team1_name: str, team2_name: str, metric_labels: Dict[str, str]):
+    """
+    Create radar chart of league percentiles (0-100) for two teams
+    Only metrics both teams have data for are plotted
+    """
+    try:
+        log_debug("create_league_percentile_radar", 505, f"Creating percentile radar for {team1_name} vs {team2_name}")
+        
+        metric_keys = [key for key in metric_labels if key in team1_percentiles and key in team2_percentiles]
+        if not metric_keys:
+            return go.Figure().add_annotation(text="No shared league metrics for this matchup", xref="paper", yref="paper", x=0.5, y=0.5)
+        
+        categories = [metric_labels[key] for key in metric_keys] + [metric_labels[metric_keys[0]]]
+        team1_values = [team1_percentiles[key] for key in metric_keys] + [team1_percentiles[metric_keys[0]]]
+        team2_values = [team2_percentiles[key] for key in metric_keys] + [team2_percentiles[metric_keys[0]]]
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatterpolar(
+            r=team1_values,
+            theta=categories,
+            fill='toself',
+            name=team1_name,
+            line_color='#00ff41',
+            fillcolor='rgba(0, 255, 65, 0.2)'
+        ))
+        
+        fig.add_trace(go.Scatterpolar(
+            r=team2_values,
+            theta=categories,
+            fill='toself',
+            name=team2_name,
+            line_color='#ff6b35',
+            fillcolor='rgba(255, 107, 53, 0.2)'
+        ))
+        
+        chart_theme = get_chart_theme()
+        chart_theme['title']['text'] = 'League Percentile Comparison'
+        
+        fig.update_layout(
+            **chart_theme,
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 100],
+                    tickfont=dict(color='#ffffff'),
+                    gridcolor='#333333'
+                ),
+                angularaxis=dict(
+                    tickfont=dict(color='#ffffff'),
+                    gridcolor='#333333'
+                ),
+                bgcolor='#1a1a1a'
+            ),
+            height=500
+        )
+        
+        log_debug("create_league_percentile_radar", 553, "Percentile radar created successfully")
+        return fig
+        
+    except Exception as e:
+        log_debug("create_league_percentile_radar", 557, "Percentile radar creation failed", e)
+        return go.Figure().add_annotation(text="Radar chart generation failed", xref="paper", yref="paper", x=0.5, y=0.5)
+
+# =============================================================================
+# FOURTH DOWN DECISION GRID
+# =============================================================================
+
+def create_decision_grid_heatmap(grid: Dict, team_name: str, option_labels: List[str]):
+    """
+    Create heatmap of the fourth down decision grid (distance x field position)
+    Color = EP margin of going for it over the best kick; hover shows the call
+    """
+    try:
+        log_debug("create_decision_grid_heatmap", 567, f"Creating decision grid heatmap for {team_name}")
+        
+        recommendation = np.asarray(grid['recommendation'])
+        hover_text = np.asarray(option_labels, dtype=object)[recommendation]
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=np.round(grid['go_margin'], 2),
+            x=grid['field_positions'],
+            y=grid['distances'],
+            customdata=hover_text,
+            colorscale='RdYlGn',
+            zmid=0,
+            colorbar=dict(title='Go EP Margin'),
+            hovertemplate='4th & %{y} at %{x}<br>Go margin: %{z:+.2f} EP<br>Call: %{customdata}<extra></extra>'
+        ))
+        
+        chart_theme = get_chart_theme()
+        chart_theme['title']['text'] = f'{team_name} Fourth Down Decision Grid'
+        
+        fig.update_layout(
+            **chart_theme,
+            height=450,
+            xaxis_title='Field Position (yards from own goal)',
+            yaxis_title='Yards To Go'
+        )
+        
+        log_debug("create_decision_grid_heatmap", 593, "Decision grid heatmap created successfully")
+        return fig
+        
+    except Exception as e:
+        log_debug("create_decision_grid_heatmap", 597, "Decision grid heatmap creation failed", e)
+        return go.Figure().add_annotation(text="Decision grid generation failed", xref="paper", yref="paper", x=0.5, y=0.5)
+
 # =============================================================================
 # DEBUGGING NOTE: PLOTLY TITLE PARAMETER CONFLICTS RESOLVED
 # =============================================================================
@@ -20,7 +20,6 @@ DEBUGGING SYSTEM:
 - Fallback mechanisms logged for transparency
 """
 
-import requests
 import json
 import sqlite3
 import streamlit as st
@@ -28,10 +27,18 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import time
 
+from instrumentation import get_logger, increment, log_event, span
+from lazy_imports import lazy_import
+
+# requests is only needed when the cache misses and the API is called
+requests = lazy_import("requests")
+
 # =============================================================================
 # DEBUG LOGGING SYSTEM - Enhanced for weather operations
 # =============================================================================
 
+_logger = get_logger("weather")
+
 def log_weather_debug(function_name: str, line_number: int, message: str, error: Exception = None, data: Dict = None):
     """
     Enhanced debug logging system specifically for weather operations
@@ -43,17 +50,8 @@ def log_weather_debug(function_name: str, line_number: int, message: str, error:
         error: Exception object if an error occurred
         data: Optional data dictionary for context
     """
-    timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]  # Include milliseconds
-    
-    if error:
-        print(f"[{timestamp}] WEATHER_ERROR in {function_name}() line {line_number}: {message}")
-        print(f"                   Error: {str(error)}")
-        if data:
-            print(f"                   Context: {json.dumps(data, indent=2)}")
-    else:
-        print(f"[{timestamp}] WEATHER_DEBUG {function_name}() line {line_number}: {message}")
-        if data:
-            print(f"                    Data: {json.dumps(data, indent=2)}")
+    # data is only serialised when the record is emitted
+    log_event(_logger, function_name, line_number, message, error, data)
 
 # =============================================================================
 # DATABASE INITIALIZATION - BUG FIX: Line 89
@@ -67,34 +65,34 @@ def init_weather_cache():
     try:
         log_weather_debug("init_weather_cache", 59, "Initializing weather cache database")
         
-        # Import database connection from main database module
-        from database import init_database
-        conn = init_database()
-        cursor = conn.cursor()
+        # Schema changes go through the shared single writer (db_connections)
+        from database import init_database, DATABASE_PATH
+        from db_connections import write_transaction
+        init_database()
         
-        # BUG FIX: Create weather_cache table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS weather_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                location TEXT NOT NULL,
-                weather_data TEXT NOT NULL,
-                api_source TEXT DEFAULT 'openweather',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP,
-                is_valid BOOLEAN DEFAULT 1
-            )
-        ''')
-        
-        # Create index for faster lookups
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_weather_location_expires 
-            ON weather_cache(location, expires_at, is_valid)
-        ''')
-        
-        conn.commit()
-        log_weather_debug("init_weather_cache", 81, "Weather cache database initialized successfully")
+        with write_transaction(DATABASE_PATH) as conn:
+            cursor = conn.cursor()
+            
+            # BUG FIX: Create weather_cache table if it doesn't exist
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS weather_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    location TEXT NOT NULL,
+                    weather_data TEXT NOT NULL,
+                    api_source TEXT DEFAULT 'openweather',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP,
+                    is_valid BOOLEAN DEFAULT 1
+                )
+            ''')
+            
+            # Create index for faster lookups
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_weather_location_expires 
+                ON weather_cache(location, expires_at, is_valid)
+            ''')
         
-        # Don't close connection - let cache_resource manage it
+        log_weather_debug("init_weather_cache", 81, "Weather cache database initialized successfully")
         return True
         
     except Exception as e:
@@ -113,27 +111,25 @@ def get_cached_weather(location: str) -> Optional[Dict]:
     try:
         log_weather_debug("get_cached_weather", 98, f"Checking cache for location: {location}")
         
+        # Read-only lookup on this thread's connection; expired rows are
+        # cleaned up on the write path (cache_weather_data), not on every read
         from database import init_database
         conn = init_database()
         cursor = conn.cursor()
         
-        # Clean up expired entries first
-        cursor.execute("""
-            DELETE FROM weather_cache 
-            WHERE expires_at < datetime('now') OR is_valid = 0
-        """)
-        conn.commit()
-        
         # Look for valid cached data
-        cursor.execute("""
-            SELECT weather_data, api_source, created_at 
-            FROM weather_cache 
-            WHERE location = ? AND expires_at > datetime('now') AND is_valid = 1
-            ORDER BY created_at DESC 
-            LIMIT 1
-        """, (location,))
+        with span("db", "get_cached_weather"):
+            cursor.execute("""
+                SELECT weather_data, api_source, created_at 
+                FROM weather_cache 
+                WHERE location = ? AND expires_at > datetime('now') AND is_valid = 1
+                ORDER BY created_at DESC 
+                LIMIT 1
+            """, (location,))
+            
+            result = cursor.fetchone()
         
-        result = cursor.fetchone()
+        increment("weather.cache", result="hit" if result else "miss")
         
         if result:
             weather_data = json.loads(result[0])
@@ -172,9 +168,9 @@ def cache_weather_data(location: str, weather_data: Dict, api_source: str = "ope
             log_weather_debug("cache_weather_data", 151, "Invalid weather data provided")
             return False
         
-        from database import init_database
-        conn = init_database()
-        cursor = conn.cursor()
+        from database import init_database, DATABASE_PATH
+        from db_connections import write_transaction
+        init_database()
         
         # Calculate expiration time
         expires_at = datetime.now() + timedelta(hours=cache_hours)
@@ -182,12 +178,20 @@ def cache_weather_data(location: str, weather_data: Dict, api_source: str = "ope
         # Remove cache metadata before storing
         clean_data = {k: v for k, v in weather_data.items() if k != 'cache_info'}
         
-        cursor.execute("""
-            INSERT INTO weather_cache (location, weather_data, api_source, expires_at)
-            VALUES (?, ?, ?, ?)
-        """, (location, json.dumps(clean_data), api_source, expires_at.isoformat()))
+        with write_transaction(DATABASE_PATH) as conn:
+            cursor = conn.cursor()
+            
+            # Clean up expired entries in the same transaction as the insert
+            cursor.execute("""
+                DELETE FROM weather_cache 
+                WHERE expires_at < datetime('now') OR is_valid = 0
+            """)
+            
+            cursor.execute("""
+                INSERT INTO weather_cache (location, weather_data, api_source, expires_at)
+                VALUES (?, ?, ?, ?)
+            """, (location, json.dumps(clean_data), api_source, expires_at.isoformat()))
         
-        conn.commit()
         log_weather_debug("cache_weather_data", 168, f"Successfully cached weather data for {location}",
                         data={"expires_at": expires_at.isoformat(), "source": api_source})
         return True
@@ -227,7 +231,8 @@ def get_openweather_data(city: str, state: str = "", api_key: str = None) -> Opt
                         data={"url": url, "location": location})
         
         # Make API request with timeout
-        response = requests.get(url, params=params, timeout=10)
+        with span("api", "openweather"):
+            response = requests.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1,7 +1,13 @@
+import ast
+import hashlib
 import json
+import re
+import threading
+from collections import OrderedDict
+from llm_ledger import CACHE_MODEL, record_llm_call
 from prompts import SYSTEM_PROMPT
 
-WHATIF_INSTRUCTIONS = "You are the Strategy Evaluator. Rate each archetype from 0..100 given context. Return JSON: {'scores': [{'name':'Run-heavy','score':..,'why':'...'}]}"
+WHATIF_INSTRUCTIONS = 'You are the Strategy Evaluator. Rate each archetype from 0..100 given context. Return only JSON with double quotes: {"scores": [{"name": "Run-heavy", "score": 0, "why": "..."}]}'
 
 DEFAULT_ARCHETYPES = [
     {"name":"Run-heavy (gap & duo)", "desc":"Pound interior, set up play-action"},
@@ -10,12 +16,109 @@ DEFAULT_ARCHETYPES = [
     {"name":"Explosive Shots", "desc":"Low volume, high aDOT shots + max protect"},
 ]
 
-def score_archetypes(llm, context_text: str, custom=None):
-    arch = custom if custom else DEFAULT_ARCHETYPES
-    items = "\n".join([f"- {a['name']}: {a['desc']}" for a in arch])
-    user_msg = f"{WHATIF_INSTRUCTIONS}\n\nContext:\n{context_text}\n\nArchetypes:\n{items}"
-    out = llm.chat(SYSTEM_PROMPT, user_msg)
+FALLBACK_SCORE = 75
+MAX_CACHED_SCORES = 512
+
+# Validated scores keyed by sha256(context + archetypes); fallbacks are never cached
+_score_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _archetype_items(arch):
+    return "\n".join([f"- {a['name']}: {a['desc']}" for a in arch])
+
+def context_key(context_text: str, arch) -> str:
+    payload = json.dumps({"context": context_text, "archetypes": arch, "instructions": WHATIF_INSTRUCTIONS}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _cache_get(key):
+    with _cache_lock:
+        scores = _score_cache.get(key)
+        if scores is None:
+            _cache_stats["misses"] += 1
+            return None
+        _score_cache.move_to_end(key)
+        _cache_stats["hits"] += 1
+        return [dict(s) for s in scores]
+
+def _cache_put(key, scores):
+    with _cache_lock:
+        _score_cache[key] = [dict(s) for s in scores]
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > MAX_CACHED_SCORES:
+            _score_cache.popitem(last=False)
+
+def get_score_cache_stats():
+    with _cache_lock:
+        return {"entries": len(_score_cache), **_cache_stats}
+
+def clear_score_cache():
+    with _cache_lock:
+        _score_cache.clear()
+
+def extract_json(text: str):
+    """Parse the first JSON object in a reply (tolerates code fences, prose and single quotes)."""
+    if not text:
+        return None
+    text = re.sub(r"```(?:json)?", "", text)
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    snippet = text[start:end + 1]
+    try:
+        return json.loads(snippet)
+    except Exception:
+        pass
     try:
-        data = json.loads(out); return data.get("scores", [])
+        data = ast.literal_eval(snippet)
+        return data if isinstance(data, dict) else None
     except Exception:
-        return [{"name":a["name"], "score":75, "why":"fallback"} for a in arch]
+        return None
+
+def validate_scores(data, arch):
+    """
+    Schema check for {'scores': [{'name', 'score', 'why'}]}: every archetype scored
+    exactly once with a number in 0..100. Returns scores in archetype order or None.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("scores"), list):
+        return None
+    by_name = {}
+    for item in data["scores"]:
+        if not isinstance(item, dict):
+            return None
+        score = item.get("score")
+        if isinstance(score, str):
+            try:
+                score = float(score)
+            except ValueError:
+                return None
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            return None
+        by_name[str(item.get("name", "")).strip().lower()] = {"score": score, "why": str(item.get("why", ""))}
+    scores = []
+    for a in arch:
+        match = by_name.get(a["name"].strip().lower())
+        if match is None:
+            return None
+        scores.append({"name": a["name"], "score": match["score"], "why": match["why"]})
+    return scores
+
+def _fallback(arch, reason):
+    return [{"name":a["name"], "score":FALLBACK_SCORE, "why":f"fallback: {reason}", "fallback": True} for a in arch]
+
+def _score_uncached(llm, context_text: str, arch):
+    user_msg = f"{WHATIF_INSTRUCTIONS}\n\nContext:\n{context_text}\n\nArchetypes:\n{_archetype_items(arch)}"
+    out = llm.chat(SYSTEM_PROMPT, user_msg, feature="archetype_scores")
+    scores = validate_scores(extract_json(out), arch)
+    if scores is None:
+        return _fallback(arch, "reply failed schema validation")
+    _cache_put(context_key(context_text, arch), scores)
+    return scores
+
+def score_archetypes(llm, context_text: str, custom=None):
+    arch = custom if custom else DEFAULT_ARCHETYPES
+    cached = _cache_get(context_key(context_text, arch))
+    if cached is not None:
+        record_llm_call("archetype_scores", CACHE_MODEL, cache_hit=True, provider="cache")
+        return cached
+    return _score_uncached(llm, context_text, arch)